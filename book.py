@@ -0,0 +1,35 @@
+import sys
+import os
+import argparse
+import time
+
+# Add src to path
+src_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+sys.path.append(src_path)
+
+from utils.book import BookBuilder, ingest_file
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build an opening book from saved games and SGF archives.")
+    parser.add_argument('output', help="book file to write, e.g. go19.book")
+    parser.add_argument('files', nargs='+', help=".sav or .sgf files; games must share one type and size")
+    parser.add_argument('--max-moves', type=int, default=None,
+                        help="only index the first N moves of each game (default: all)")
+    parser.add_argument('--run-size', type=int, default=1_000_000,
+                        help="entries kept in memory before spilling a sorted run to disk")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    builder = BookBuilder(args.output, args.max_moves, args.run_size)
+    added = rejected = 0
+    for filename in args.files:
+        a, r = ingest_file(builder, filename)
+        added += a
+        rejected += r
+        print(f"{filename}: {a} games added, {r} rejected", flush=True)
+    count = builder.close()
+    print(f"Wrote {count} positions/moves from {added} games to {args.output} "
+          f"in {time.perf_counter() - start:.1f}s ({rejected} games rejected).")
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import sys
 import os
+import argparse
 
 # Add src to path
 src_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
@@ -7,6 +8,65 @@ sys.path.append(src_path)
 
 from ui.cli import CLI
 
+def run_scripts(names, board='end', quiet=False, summary_file=None):
+    """Runs each command file in a fresh CLI; writes one JSON summary line per file."""
+    import json
+    failed = False
+    for name in names:
+        cli = CLI()
+        try:
+            if name == '-':
+                summary = cli.run_script(sys.stdin, board=board, quiet=quiet)
+            else:
+                with open(name, encoding='utf-8') as f:
+                    summary = cli.run_script(f, board=board, quiet=quiet)
+        except OSError as e:
+            cli.errors.append((None, f"Cannot read script: {e}"))
+            summary = cli.summary()
+        finally:
+            cli.reset_engine()
+            cli.stop_journal()
+        summary['script'] = name
+        failed = failed or bool(summary['errors'])
+        print(json.dumps(summary), file=summary_file or sys.stdout, flush=True)
+    return failed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Board game platform, command line interface.")
+    parser.add_argument('--script', nargs='+', metavar='FILE',
+                        help="run command files ('-' for stdin) without prompting; "
+                             "also the default when stdin is a pipe")
+    parser.add_argument('--board', choices=['none', 'end', 'always'], default='end',
+                        help="in script mode, when to print the board (default: end)")
+    parser.add_argument('--quiet', action='store_true', help="in script mode, print only the summaries")
+    parser.add_argument('--summary', metavar='FILE', help="write the JSON summaries to FILE instead of stdout")
+    parser.add_argument('--profile', metavar='FILE',
+                        help="in script mode, write profiling counters and a Chrome trace to FILE")
+    parser.add_argument('--journal', metavar='FILE',
+                        help="interactively, autosave every move to FILE; after a crash 'load FILE' recovers the game")
+    args = parser.parse_args(argv)
+
+    scripts = args.script
+    if scripts is None and not sys.stdin.isatty():
+        scripts = ['-']
+    if scripts is None:
+        cli = CLI()
+        if args.journal:
+            cli.set_journal(args.journal)
+        cli.start()
+        return 0
+    if args.profile:
+        from game import profiling
+        profiling.enable(trace=True)
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            failed = run_scripts(scripts, args.board, args.quiet, f)
+    else:
+        failed = run_scripts(scripts, args.board, args.quiet)
+    if args.profile:
+        profiling.dump(args.profile)
+    # A non-zero status flags scripts with failed commands
+    return 1 if failed else 0
+
 if __name__ == "__main__":
-    cli = CLI()
-    cli.start()
+    sys.exit(main())
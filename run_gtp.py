@@ -0,0 +1,22 @@
+import sys
+import os
+import argparse
+
+# Add src to path
+src_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+sys.path.append(src_path)
+
+from ui.gtp import GTP
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Go Text Protocol engine on stdin/stdout.")
+    parser.add_argument('--engine', default='mcts:1',
+                        help="player for genmove: random | mcts[:sec] | script:<file> (default: mcts:1)")
+    parser.add_argument('--size', type=int, default=19)
+    parser.add_argument('--komi', type=float, default=7.5)
+    parser.add_argument('--ko-rule', choices=['simple', 'positional', 'situational'], default='simple')
+    args = parser.parse_args(argv)
+    GTP(args.engine, args.size, args.komi, args.ko_rule).run()
+
+if __name__ == "__main__":
+    main()
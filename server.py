@@ -0,0 +1,60 @@
+import sys
+import os
+import argparse
+import asyncio
+import json
+
+# Add src to path
+src_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+sys.path.append(src_path)
+
+from utils.server import GameServer, run_load
+
+async def serve(host, port):
+    server = GameServer()
+    port = await server.start(host, port)
+    print(f"Serving on {host}:{port}", flush=True)
+    await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-game JSON-lines server and its load generator.")
+    sub = parser.add_subparsers(dest='mode', required=True)
+    s = sub.add_parser('serve', help="host games")
+    s.add_argument('--host', default='127.0.0.1')
+    s.add_argument('--port', type=int, default=8765)
+    load = sub.add_parser('load', help="play random games against a server and report throughput")
+    load.add_argument('--host', default='127.0.0.1')
+    load.add_argument('--port', type=int, default=8765,
+                      help="server port; 0 starts a server in this process")
+    load.add_argument('--players', type=int, default=8, help="connections playing games")
+    load.add_argument('--watchers', type=int, default=2, help="subscribers per game")
+    load.add_argument('--idle', type=int, default=0, help="extra connections that stay idle")
+    load.add_argument('--game', choices=['go', 'gomoku'], default='go')
+    load.add_argument('--size', type=int, default=9)
+    load.add_argument('--seconds', type=float, default=5.0)
+    load.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.mode == 'serve':
+        try:
+            asyncio.run(serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    async def load_test():
+        server = None
+        port = args.port
+        if port == 0:
+            server = GameServer()
+            port = await server.start(args.host, 0)
+        try:
+            return await run_load(args.host, port, args.players, args.watchers, args.idle,
+                                  args.game, args.size, args.seconds, args.seed)
+        finally:
+            if server is not None:
+                await server.stop()
+    print(json.dumps(asyncio.run(load_test())))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import threading
+
+class BackgroundSearch:
+    """Runs an engine's select_move in a worker thread so a UI stays responsive.
+
+    The search works on a private copy of the game, so the caller may keep changing
+    its own game meanwhile. Nothing here blocks except cancel(): callers poll
+    done(), info and move, e.g. from Tk's root.after.
+
+    ponder() searches the position after a predicted opponent move while the
+    opponent is still thinking. If that move is then played, adopt() turns the
+    running search into the real one, so the reply comes sooner by however long
+    the opponent took.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.info = None # Latest SearchInfo reported by the engine
+        self.move = None
+        self.error = None # Exception the search raised, if any
+        self.pondering = False
+        self.predicted = None
+        self._hash = None
+        self._moves = 0
+        self._thread = None
+        self._done = False
+
+    def start(self, game):
+        """Starts searching the game's current position."""
+        self.cancel()
+        self._launch(game.copy())
+
+    def ponder(self, game, move):
+        """Starts searching the position after move ((row, col) or None for a pass).
+
+        Returns False, without starting, if the move is not legal.
+        """
+        self.cancel()
+        copy = game.copy()
+        if copy.play(move) is None:
+            return False
+        self.pondering = True
+        self.predicted = move
+        self._launch(copy)
+        return True
+
+    def adopt(self, game):
+        """Whether the running ponder search is for game's current position.
+
+        If it is, it becomes the real search and keeps running; otherwise it is
+        cancelled and the caller should start() a new one.
+        """
+        if not self.pondering:
+            return False
+        if self.is_for(game) and game.last_move().point == self.predicted:
+            self.pondering = False
+            return True
+        self.cancel()
+        return False
+
+    def is_for(self, game):
+        """Whether the latest search was started on game's current position."""
+        return game.position_hash() == self._hash and game.move_number() == self._moves
+
+    def _launch(self, game):
+        self.info = None
+        self.move = None
+        self.error = None
+        self._done = False
+        self._hash = game.position_hash()
+        self._moves = game.move_number()
+        self._thread = threading.Thread(target=self._run, args=(game,), daemon=True)
+        self._thread.start()
+
+    def _run(self, game):
+        try:
+            self.move = self.engine.select_move(game, progress=self._progress)
+            if self.engine.info is not None:
+                self.info = self.engine.info
+        except Exception as e:
+            self.error = e
+        finally:
+            self._done = True
+
+    def _progress(self, info):
+        self.info = info
+
+    def running(self):
+        return self._thread is not None and not self._done
+
+    def done(self):
+        """Whether a real (not pondering) search has finished; its answer is in move
+        (None for a pass), or error if it failed."""
+        return self._thread is not None and self._done and not self.pondering
+
+    def cancel(self):
+        """Stops any search and waits for the worker to exit; its result is dropped."""
+        thread = self._thread
+        if thread is not None:
+            # select_move clears the stop flag when it starts, so keep asking
+            while thread.is_alive():
+                self.engine.stop()
+                thread.join(0.05)
+        self._thread = None
+        self.pondering = False
+        self.predicted = None
+        self.info = None
+        self.move = None
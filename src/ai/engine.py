@@ -0,0 +1,49 @@
+from abc import ABC, abstractmethod
+from collections import namedtuple
+
+# Progress report of a search. best_move is (row, col) or None for a pass; pv is the
+# expected continuation as a list of (row, col), starting with best_move.
+SearchInfo = namedtuple('SearchInfo', ['depth', 'nodes', 'nps', 'best_move', 'score', 'elapsed', 'pv'])
+
+class Engine(ABC):
+    """Base class for computer players. An engine picks a move for the side to move."""
+    name = "engine"
+
+    def __init__(self):
+        self.info = None # SearchInfo of the last search
+        self._stop = False
+        self.book = None # OpeningBook to play from before searching
+        self.book_min_games = 2
+
+    def book_move(self, game):
+        """The most played legal book move for the position, or None to search."""
+        if self.book is None:
+            return None
+        for entry in self.book.moves(game):
+            if entry.games < self.book_min_games:
+                break
+            if entry.move is None:
+                continue
+            # A hash collision or a different ko state could make the move illegal
+            if not game.is_legal(*entry.move):
+                continue
+            self.info = SearchInfo(0, 0, 0, entry.move, entry.score, 0.0, [entry.move])
+            return entry.move
+        return None
+
+    @abstractmethod
+    def select_move(self, game, progress=None):
+        """Returns (row, col) to play, or None to pass.
+
+        Must not modify game. progress, if given, is called with a SearchInfo
+        whenever the search has something new to report.
+        """
+        pass
+
+    def stop(self):
+        """Asks a running select_move to return its best move so far."""
+        self._stop = True
+
+    def close(self):
+        """Releases resources such as worker processes."""
+        pass
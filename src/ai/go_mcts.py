@@ -0,0 +1,220 @@
+import math
+import multiprocessing
+import os
+import random
+import time
+from game.board import BLACK, WHITE
+from .engine import Engine, SearchInfo
+from .playout import PlayoutBoard, PASS
+
+class Node:
+    __slots__ = ('move', 'parent', 'player', 'children', 'untried', 'visits', 'wins')
+
+    def __init__(self, move, parent, player):
+        self.move = move
+        self.parent = parent
+        self.player = player # Player.value of the side that played move
+        self.children = []
+        self.untried = None # moves not expanded yet; filled on first visit
+        self.visits = 0
+        self.wins = 0.0 # from player's point of view; a draw counts half
+
+def uct_search(board, deadline, rng, exploration=1.4, komi=0.0, stop=None, root_moves=None,
+               max_playouts=None):
+    """Runs UCT from board until deadline, max_playouts or stop() returns True.
+
+    Returns (playouts, max_depth, stats) where stats maps each root move to
+    (visits, wins, {reply: visits}).
+    """
+    root = Node(None, None, 3 - board.to_move)
+    root.untried = list(root_moves) if root_moves is not None else _node_moves(board)
+    playouts = 0
+    max_depth = 0
+    while True:
+        if not playouts & 15 and (time.perf_counter() > deadline or (stop and stop())):
+            break
+        if playouts == max_playouts:
+            break
+        b = board.copy()
+        node = root
+        depth = 0
+        # Selection
+        while not node.untried and node.children:
+            log_n = math.log(node.visits)
+            best = None
+            best_value = -1.0
+            for child in node.children:
+                value = child.wins / child.visits + exploration * math.sqrt(log_n / child.visits)
+                if value > best_value:
+                    best = child
+                    best_value = value
+            node = best
+            b.play(node.move)
+            depth += 1
+        # Expansion
+        if node.untried is None:
+            node.untried = _node_moves(b)
+        if node.untried:
+            move = node.untried.pop(rng.randrange(len(node.untried)))
+            child = Node(move, node, b.to_move)
+            b.play(move)
+            node.children.append(child)
+            node = child
+            depth += 1
+        max_depth = max(max_depth, depth)
+        # Simulation
+        b.random_playout(rng)
+        score = b.area_score(komi)
+        winner = BLACK if score > 0 else WHITE if score < 0 else 0
+        # Backpropagation
+        while node is not None:
+            node.visits += 1
+            if winner == node.player:
+                node.wins += 1.0
+            elif winner == 0:
+                node.wins += 0.5
+            node = node.parent
+        playouts += 1
+
+    stats = {}
+    for child in root.children:
+        replies = {c.move: c.visits for c in child.children}
+        stats[child.move] = (child.visits, child.wins, replies)
+    return playouts, max_depth, stats
+
+def _node_moves(board):
+    if board.passes >= 2:
+        return [] # Game over: nothing to expand
+    moves = board.candidate_moves()
+    return moves if moves else [PASS]
+
+# Set in each pool process so GoMCTS.stop() reaches searches running there
+_worker_stop_event = None
+
+def _init_worker(stop_event):
+    global _worker_stop_event
+    _worker_stop_event = stop_event
+
+def _worker_search(args):
+    size, cells, to_move, ko, passes, root_moves, seconds, seed, exploration, komi, playouts = args
+    board = PlayoutBoard(size)
+    for i, v in enumerate(cells):
+        if v == BLACK or v == WHITE:
+            board.place_index(i, v)
+    board.to_move, board.ko, board.passes = to_move, ko, passes
+    stop = _worker_stop_event.is_set if _worker_stop_event is not None else None
+    return uct_search(board, time.perf_counter() + seconds, random.Random(seed),
+                      exploration, komi, stop, root_moves, playouts)
+
+class GoMCTS(Engine):
+    """Monte Carlo Tree Search (UCT with random playouts) for GoGame.
+
+    Playouts run on a PlayoutBoard rather than through GoGame.place_stone. With
+    workers > 1 the search is root-parallel: every process of a multiprocessing pool
+    grows its own tree from the current position for the whole time budget, and root
+    visit counts are summed before picking the most visited move.
+    """
+    name = "mcts"
+
+    def __init__(self, time_limit: float = 1.0, workers: int = None, exploration: float = 1.4,
+                 komi: float = 0.0, seed: int = None, playouts: int = None):
+        super().__init__()
+        # With playouts set, every search runs exactly that many and time_limit is
+        # ignored, so a seeded engine plays the same moves on any machine
+        self.time_limit = time_limit if playouts is None else math.inf
+        self.playouts = playouts
+        self.workers = workers if workers else (os.cpu_count() or 1)
+        self.exploration = exploration
+        self.komi = komi
+        self.rng = random.Random(seed)
+        self._pool = None
+        self._stop_event = None
+
+    def select_move(self, game, progress=None):
+        self._stop = False
+        move = self.book_move(game)
+        if move is not None:
+            return move
+        start = time.perf_counter()
+        board = PlayoutBoard.from_game(game)
+        root_moves = self._root_moves(board, game)
+        if root_moves == [PASS]:
+            self.info = SearchInfo(0, 0, 0, None, 0.0, 0.0, [None])
+            return None
+
+        if self.workers > 1:
+            results = self._parallel_search(board, root_moves)
+        else:
+            results = [uct_search(board, start + self.time_limit, self.rng, self.exploration,
+                                  self.komi, lambda: self._stop, root_moves, self.playouts)]
+
+        totals = {}
+        playouts = 0
+        max_depth = 0
+        for n, depth, stats in results:
+            playouts += n
+            max_depth = max(max_depth, depth)
+            for move, (visits, wins, replies) in stats.items():
+                t = totals.setdefault(move, [0, 0.0, {}])
+                t[0] += visits
+                t[1] += wins
+                for reply, v in replies.items():
+                    t[2][reply] = t[2].get(reply, 0) + v
+        elapsed = time.perf_counter() - start
+        if totals:
+            move = max(totals, key=lambda m: totals[m][0])
+            visits, wins, replies = totals[move]
+            winrate = wins / visits
+        else:
+            # Not even one playout finished: fall back to any candidate
+            move, winrate, replies = root_moves[0], 0.5, {}
+        pv = [self._point(board, move)]
+        if replies:
+            pv.append(self._point(board, max(replies, key=replies.get)))
+        self.info = SearchInfo(max_depth, playouts, int(playouts / max(elapsed, 1e-9)),
+                               pv[0], winrate, elapsed, pv)
+        if progress:
+            progress(self.info)
+        return pv[0]
+
+    def _root_moves(self, board, game):
+        moves = board.candidate_moves()
+        if game.ko_rule != 'simple':
+            # Playouts only know simple ko, so drop superko violations at the root
+            allowed = []
+            for m in moves:
+                b = board.copy()
+                b.play(m)
+                if not game.repeats_position(b.zobrist_hash, game.current_player.other()):
+                    allowed.append(m)
+            moves = allowed
+        if game.pass_count > 0 or not moves:
+            # Passing back can end the game, so let the search weigh it
+            moves.append(PASS)
+        return moves
+
+    def _parallel_search(self, board, root_moves):
+        if self._pool is None:
+            self._stop_event = multiprocessing.Event()
+            self._pool = multiprocessing.Pool(self.workers, initializer=_init_worker,
+                                              initargs=(self._stop_event,))
+        self._stop_event.clear()
+        share = None if self.playouts is None else -(-self.playouts // self.workers)
+        jobs = [(board.size, bytes(board.cells), board.to_move, board.ko, board.passes, root_moves,
+                 self.time_limit, self.rng.getrandbits(32), self.exploration, self.komi, share)
+                for _ in range(self.workers)]
+        return self._pool.map(_worker_search, jobs)
+
+    def stop(self):
+        super().stop()
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
+
+    @staticmethod
+    def _point(board, move):
+        return None if move == PASS else board.point(move)
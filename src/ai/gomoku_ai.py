@@ -0,0 +1,287 @@
+import time
+from game.board import FlatBoard, EMPTY, ZOBRIST_WHITE_TO_MOVE
+from game.player import Player
+from .engine import Engine, SearchInfo
+
+WIN_SCORE = 10_000_000
+INFINITY = WIN_SCORE * 2
+
+# SHAPE[length][open_ends] scores a run of stones; length is capped at 5.
+SHAPE = (
+    (0, 0, 0),
+    (0, 1, 10),
+    (0, 50, 500),
+    (0, 500, 5000),
+    (0, 5000, 50000),
+    (WIN_SCORE, WIN_SCORE, WIN_SCORE),
+)
+
+# Transposition table entry flags
+EXACT, LOWER, UPPER = 0, 1, 2
+MAX_TT_ENTRIES = 1_000_000
+
+class _Timeout(Exception):
+    pass
+
+class GomokuAI(Engine):
+    """Iterative-deepening alpha-beta search for GomokuGame.
+
+    Only empty points within `window` of an existing stone are searched, ordered by how
+    much they extend either side's lines, and at most `max_candidates` of them per node.
+    Positions are keyed by Zobrist hash in a transposition table that is kept between
+    moves. The search stops at `time_limit` seconds and answers with the best move of
+    the deepest completed iteration.
+    """
+    name = "alphabeta"
+
+    def __init__(self, time_limit: float = 1.0, max_depth: int = 12, max_candidates: int = 12, window: int = 2):
+        super().__init__()
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.max_candidates = max_candidates
+        self.window = window
+        self.tt = {}
+        self._size = None
+
+    def select_move(self, game, progress=None):
+        self._stop = False
+        self.info = None
+        move = self.book_move(game)
+        if move is not None:
+            return move
+        size = game.board_size
+        if size != self._size:
+            self._setup(size)
+        board = FlatBoard(size)
+        stones = []
+        for r in range(size):
+            for c in range(size):
+                p = game.board.get(r, c)
+                if p is not None:
+                    i = board.index(r, c)
+                    board.place_index(i, p.value)
+                    stones.append(i)
+        self._board = board
+        self._cells = board.cells
+        self._stones = stones
+
+        start = time.perf_counter()
+        if not stones:
+            centre = (size // 2, size // 2)
+            self.info = SearchInfo(0, 0, 0, centre, 0, 0.0, [centre])
+            return centre
+
+        color = game.current_player.value
+        self._deadline = start + self.time_limit
+        self.nodes = 0
+        best = self._ordered_moves(color, None)[0]
+        if len(self.tt) > MAX_TT_ENTRIES:
+            self.tt.clear()
+
+        for depth in range(1, self.max_depth + 1):
+            try:
+                score, move = self._search_root(depth, color)
+            except _Timeout:
+                break
+            best = move
+            elapsed = time.perf_counter() - start
+            pv = [board.point(i) for i in self._principal_variation(color, depth)]
+            self.info = SearchInfo(depth, self.nodes, int(self.nodes / max(elapsed, 1e-9)),
+                                   board.point(best), score, elapsed, pv)
+            if progress:
+                progress(self.info)
+            # A forced result will not change with more depth
+            if abs(score) >= WIN_SCORE - 100:
+                break
+        if self.info is None:
+            elapsed = time.perf_counter() - start
+            self.info = SearchInfo(0, self.nodes, int(self.nodes / max(elapsed, 1e-9)),
+                                   board.point(best), 0, elapsed, [board.point(best)])
+        return board.point(best)
+
+    def _setup(self, size):
+        self._size = size
+        self.tt.clear()
+        board = FlatBoard(size)
+        self._steps = (1, board.stride, board.stride + 1, board.stride - 1)
+        # Playable cells within `window` of each playable cell, for candidate generation
+        self._near = [()] * len(board.cells)
+        for r in range(size):
+            for c in range(size):
+                self._near[board.index(r, c)] = tuple(
+                    board.index(r + dr, c + dc)
+                    for dr in range(-self.window, self.window + 1)
+                    for dc in range(-self.window, self.window + 1)
+                    if (dr or dc) and 0 <= r + dr < size and 0 <= c + dc < size
+                )
+
+    def _key(self, color):
+        h = self._board.zobrist_hash
+        return h ^ ZOBRIST_WHITE_TO_MOVE if color == Player.WHITE.value else h
+
+    def _search_root(self, depth, color):
+        alpha = -INFINITY
+        best_move = None
+        entry = self.tt.get(self._key(color))
+        for m in self._ordered_moves(color, entry[3] if entry else None):
+            self._play(m, color)
+            try:
+                score = -self._negamax(depth - 1, -INFINITY, -alpha, 3 - color, m, 1)
+            finally:
+                self._unplay(m)
+            if best_move is None or score > alpha:
+                alpha = score
+                best_move = m
+        self.tt[self._key(color)] = (depth, EXACT, alpha, best_move)
+        return alpha, best_move
+
+    def _negamax(self, depth, alpha, beta, color, last, ply):
+        self.nodes += 1
+        if not self.nodes & 255 and (self._stop or time.perf_counter() > self._deadline):
+            raise _Timeout()
+        if self._makes_five(last):
+            # The opponent's last move won; prefer the slowest loss
+            return -WIN_SCORE + ply
+        if depth == 0:
+            return self._evaluate(color)
+
+        key = self._key(color)
+        entry = self.tt.get(key)
+        tt_move = None
+        if entry is not None:
+            e_depth, flag, value, tt_move = entry
+            if e_depth >= depth:
+                if flag == EXACT:
+                    return value
+                if flag == LOWER and value >= beta:
+                    return value
+                if flag == UPPER and value <= alpha:
+                    return value
+
+        moves = self._ordered_moves(color, tt_move)
+        if not moves:
+            return 0 # Board full: draw
+
+        alpha_orig = alpha
+        best = -INFINITY
+        best_move = moves[0]
+        for m in moves:
+            self._play(m, color)
+            try:
+                score = -self._negamax(depth - 1, -beta, -alpha, 3 - color, m, ply + 1)
+            finally:
+                self._unplay(m)
+            if score > best:
+                best = score
+                best_move = m
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        flag = EXACT
+        if best <= alpha_orig:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        self.tt[key] = (depth, flag, best, best_move)
+        return best
+
+    def _play(self, i, color):
+        self._board.place_index(i, color)
+        self._stones.append(i)
+
+    def _unplay(self, i):
+        self._board.remove_index(i)
+        self._stones.pop()
+
+    def _makes_five(self, i):
+        cells = self._cells
+        v = cells[i]
+        for s in self._steps:
+            n = 1
+            j = i + s
+            while cells[j] == v:
+                n += 1
+                j += s
+            j = i - s
+            while cells[j] == v:
+                n += 1
+                j -= s
+            if n >= 5:
+                return True
+        return False
+
+    def _point_score(self, i, v):
+        """How much playing v at empty cell i would extend v's lines."""
+        cells = self._cells
+        total = 0
+        for s in self._steps:
+            n = 1
+            j = i + s
+            while cells[j] == v:
+                n += 1
+                j += s
+            open_ends = cells[j] == EMPTY
+            j = i - s
+            while cells[j] == v:
+                n += 1
+                j -= s
+            open_ends += cells[j] == EMPTY
+            total += SHAPE[min(n, 5)][open_ends]
+        return total
+
+    def _ordered_moves(self, color, first):
+        cells = self._cells
+        near = self._near
+        candidates = set()
+        for s in self._stones:
+            for j in near[s]:
+                if cells[j] == EMPTY:
+                    candidates.add(j)
+        opponent = 3 - color
+        scored = sorted(((self._point_score(j, color) + self._point_score(j, opponent), j) for j in candidates),
+                        reverse=True)
+        moves = [j for _, j in scored[:self.max_candidates]]
+        if first is not None and cells[first] == EMPTY:
+            if first in moves:
+                moves.remove(first)
+            moves.insert(0, first)
+        return moves
+
+    def _evaluate(self, color):
+        """Static score from color's point of view: sum of run shapes on the board."""
+        cells = self._cells
+        score = [0, 0, 0]
+        for i in self._stones:
+            v = cells[i]
+            for s in self._steps:
+                before = cells[i - s]
+                if before == v:
+                    continue # Counted from the start of the run
+                n = 1
+                j = i + s
+                while cells[j] == v:
+                    n += 1
+                    j += s
+                score[v] += SHAPE[min(n, 5)][(before == EMPTY) + (cells[j] == EMPTY)]
+        # The side to move gets to extend its shapes first
+        return score[color] * 2 - score[3 - color]
+
+    def _principal_variation(self, color, depth):
+        pv = []
+        played = []
+        for _ in range(depth):
+            entry = self.tt.get(self._key(color))
+            if entry is None or entry[3] is None or self._cells[entry[3]] != EMPTY:
+                break
+            m = entry[3]
+            pv.append(m)
+            self._play(m, color)
+            played.append(m)
+            if self._makes_five(m):
+                break
+            color = 3 - color
+        for m in reversed(played):
+            self._unplay(m)
+        return pv
@@ -0,0 +1,218 @@
+from game.board import FlatBoard, EMPTY, BLACK, WHITE, BORDER
+from game.player import Player
+
+PASS = -1
+
+class PlayoutBoard(FlatBoard):
+    """Go rules on FlatBoard cell indices, for engines that play many moves.
+
+    Captures, suicide and simple ko follow GoGame exactly, but nothing raises, nothing
+    is cloned per move and there is no undo history. The simple-ko test keeps the point
+    of a single-stone capture by a lone stone: retaking there is the only way a move
+    can recreate the board before the opponent's last move. Superko is not tracked.
+    """
+
+    def __init__(self, size: int):
+        super().__init__(size)
+        self.to_move = BLACK
+        self.ko = PASS # index the side to move may not play, or PASS for none
+        self.passes = 0
+        self.captures = [0, 0, 0] # stones captured by each Player.value
+        self.playable = tuple(self.index(r, c) for r in range(size) for c in range(size))
+        s = self.stride
+        self.diagonals = (s + 1, s - 1, -s + 1, -s - 1)
+
+    @classmethod
+    def from_game(cls, game):
+        """Copies the position, side to move and ko state of a GoGame."""
+        board = cls(game.board_size)
+        for r in range(game.board_size):
+            for c in range(game.board_size):
+                p = game.board.get(r, c)
+                if p is not None:
+                    board.place_index(board.index(r, c), p.value)
+        board.to_move = game.current_player.value
+        board.passes = game.pass_count
+        board.captures = [0, game.captured_stones[Player.BLACK], game.captured_stones[Player.WHITE]]
+        last = game.last_move()
+        if last is not None:
+            if last.point is not None and len(last.captured) == 1:
+                board._set_ko(board.index(*last.point), board.index(*last.captured[0]))
+        return board
+
+    def copy(self):
+        new = PlayoutBoard.__new__(PlayoutBoard)
+        new.__dict__.update(self.__dict__)
+        new.cells = self.cells[:]
+        new.captures = self.captures[:]
+        return new
+
+    def _has_liberty(self, i):
+        """Whether the chain through stone i has at least one liberty."""
+        cells = self.cells
+        v = cells[i]
+        stack = [i]
+        seen = {i}
+        while stack:
+            j = stack.pop()
+            for off in self.offsets:
+                k = j + off
+                c = cells[k]
+                if c == EMPTY:
+                    return True
+                if c == v and k not in seen:
+                    seen.add(k)
+                    stack.append(k)
+        return False
+
+    def _chain(self, i):
+        cells = self.cells
+        v = cells[i]
+        stack = [i]
+        seen = {i}
+        while stack:
+            j = stack.pop()
+            for off in self.offsets:
+                k = j + off
+                if cells[k] == v and k not in seen:
+                    seen.add(k)
+                    stack.append(k)
+        return seen
+
+    def is_legal(self, i):
+        """Whether the side to move may play cell i (PASS is always legal)."""
+        if i == PASS:
+            return True
+        cells = self.cells
+        if cells[i] != EMPTY or i == self.ko:
+            return False
+        for off in self.offsets:
+            if cells[i + off] == EMPTY:
+                return True
+        # No empty neighbour: legal only if it captures or joins a chain with liberties
+        v = self.to_move
+        cells[i] = v
+        legal = False
+        for off in self.offsets:
+            k = i + off
+            if cells[k] == 3 - v and not self._has_liberty(k):
+                legal = True
+                break
+        if not legal:
+            legal = self._has_liberty(i)
+        cells[i] = EMPTY
+        return legal
+
+    def is_eye(self, i, v):
+        """Whether empty cell i is a true-looking eye of colour v (not worth filling)."""
+        cells = self.cells
+        for off in self.offsets:
+            c = cells[i + off]
+            if c != v and c != BORDER:
+                return False
+        bad = 0
+        edge = False
+        for off in self.diagonals:
+            c = cells[i + off]
+            if c == BORDER:
+                edge = True
+            elif c != v and c != EMPTY:
+                bad += 1
+        return bad == 0 if edge else bad < 2
+
+    def play(self, i):
+        """Plays cell i (or PASS) for the side to move. i must be legal.
+
+        Returns the list of captured cell indices.
+        """
+        v = self.to_move
+        self.to_move = 3 - v
+        self.ko = PASS
+        if i == PASS:
+            self.passes += 1
+            return []
+        self.passes = 0
+        cells = self.cells
+        self.place_index(i, v)
+        captured = []
+        for off in self.offsets:
+            k = i + off
+            if cells[k] == 3 - v and not self._has_liberty(k):
+                for s in self._chain(k):
+                    self.remove_index(s)
+                    captured.append(s)
+        if captured:
+            self.captures[v] += len(captured)
+            if len(captured) == 1:
+                self._set_ko(i, captured[0])
+        return captured
+
+    def _set_ko(self, i, captured):
+        # A lone stone whose only liberty is the point it just captured
+        cells = self.cells
+        v = cells[i]
+        for off in self.offsets:
+            c = cells[i + off]
+            if c == v or (c == EMPTY and i + off != captured):
+                return
+        self.ko = captured
+
+    def candidate_moves(self):
+        """Legal moves that do not fill one of the mover's own eyes."""
+        v = self.to_move
+        return [i for i in self.playable
+                if self.cells[i] == EMPTY and not self.is_eye(i, v) and self.is_legal(i)]
+
+    def random_playout(self, rng, max_moves=None):
+        """Plays random non-eye-filling moves until both sides pass."""
+        if max_moves is None:
+            max_moves = 3 * len(self.playable)
+        cells = self.cells
+        empties = [i for i in self.playable if cells[i] == EMPTY]
+        for _ in range(max_moves):
+            if self.passes >= 2:
+                break
+            v = self.to_move
+            n = len(empties)
+            chosen = PASS
+            start = rng.randrange(n) if n else 0
+            for t in range(n):
+                idx = (start + t) % n
+                i = empties[idx]
+                if not self.is_eye(i, v) and self.is_legal(i):
+                    chosen = i
+                    # O(1) removal: move the last empty cell into the hole
+                    empties[idx] = empties[-1]
+                    empties.pop()
+                    break
+            empties.extend(self.play(chosen))
+
+    def area_score(self, komi=0.0):
+        """Black's area score minus White's, the way GoGame.calculate_winner counts."""
+        cells = self.cells
+        score = [0, 0, 0]
+        seen = set()
+        for i in self.playable:
+            c = cells[i]
+            if c != EMPTY:
+                score[c] += 1
+            elif i not in seen:
+                region = [i]
+                seen.add(i)
+                owners = 0 # bit mask of colours touching the region
+                j = 0
+                while j < len(region):
+                    x = region[j]
+                    j += 1
+                    for off in self.offsets:
+                        k = x + off
+                        c = cells[k]
+                        if c == EMPTY:
+                            if k not in seen:
+                                seen.add(k)
+                                region.append(k)
+                        elif c != BORDER:
+                            owners |= c
+                if owners == BLACK or owners == WHITE:
+                    score[owners] += len(region)
+        return score[BLACK] - score[WHITE] - komi
@@ -0,0 +1,75 @@
+import random
+from game.go import GoGame
+from .engine import Engine, SearchInfo
+from .playout import PlayoutBoard
+
+class RandomEngine(Engine):
+    """Plays a uniformly random legal move (in Go, never into its own eyes)."""
+    name = "random"
+
+    def __init__(self, seed: int = None):
+        super().__init__()
+        self.rng = random.Random(seed)
+
+    def select_move(self, game, progress=None):
+        moves = self.candidate_moves(game)
+        move = self.rng.choice(moves) if moves else None
+        self.info = SearchInfo(0, 0, 0, move, 0, 0.0, [move])
+        return move
+
+    def candidate_moves(self, game):
+        if isinstance(game, GoGame):
+            board = PlayoutBoard.from_game(game)
+            return [board.point(i) for i in board.candidate_moves() if self._allowed(game, board, i)]
+        return game.legal_moves()
+
+    def is_legal(self, game, move):
+        return game.is_legal(*move)
+
+    @staticmethod
+    def _allowed(game, board, i):
+        # PlayoutBoard knows simple ko only
+        if game.ko_rule == 'simple':
+            return True
+        b = board.copy()
+        b.play(i)
+        return not game.repeats_position(b.zobrist_hash, game.current_player.other())
+
+class ScriptedEngine(RandomEngine):
+    """Replays a fixed list of moves ((row, col) or None for a pass), then plays randomly.
+
+    Scripted moves that are not legal when their turn comes are skipped.
+    """
+    name = "script"
+
+    def __init__(self, moves, seed: int = None):
+        super().__init__(seed)
+        self.moves = list(moves)
+        self.position = 0
+
+    @classmethod
+    def from_file(cls, filename, seed: int = None):
+        """Reads one move per line as 1-based 'row col', or 'pass'; '#' starts a comment."""
+        moves = []
+        with open(filename) as f:
+            for line in f:
+                line = line.split('#', 1)[0].strip()
+                if not line:
+                    continue
+                if line.lower() == 'pass':
+                    moves.append(None)
+                else:
+                    r, c = line.split()
+                    moves.append((int(r) - 1, int(c) - 1))
+        return cls(moves, seed)
+
+    def select_move(self, game, progress=None):
+        while self.position < len(self.moves):
+            move = self.moves[self.position]
+            self.position += 1
+            if move is None:
+                if isinstance(game, GoGame):
+                    return None
+            elif game.board.is_within_bounds(*move) and self.is_legal(game, move):
+                return move
+        return super().select_move(game, progress)
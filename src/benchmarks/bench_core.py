@@ -0,0 +1,192 @@
+"""Benchmarks for the game core: moves, undo, cloning, group scans, scoring and storage.
+
+Reports ops/sec per benchmark and board size plus memory held per game, can save the
+numbers as a JSON baseline, and exits non-zero when a run is slower (or uses more
+memory) than a saved baseline by more than the threshold.
+
+Usage:
+    python src/benchmarks/bench_core.py                      # print results
+    python src/benchmarks/bench_core.py --save base.json     # record a baseline
+    python src/benchmarks/bench_core.py --compare base.json  # fail on regressions
+"""
+import sys
+import os
+import argparse
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.go import GoGame
+from game.gomoku import GomokuGame
+from game.exceptions import InvalidMoveError
+from utils.storage import save_game, load_game
+
+SIZES = (9, 13, 19)
+SEED = 2024
+
+def go_sequence(size, seed=SEED):
+    """A fixed, legal random Go game: list of (row, col), None for a pass."""
+    rng = random.Random(seed + size)
+    game = GoGame(size)
+    moves = []
+    points = [(r, c) for r in range(size) for c in range(size)]
+    for _ in range(int(size * size * 0.9)):
+        rng.shuffle(points)
+        for p in points:
+            if game.board.get(*p) is not None:
+                continue
+            try:
+                game.place_stone(*p)
+            except InvalidMoveError:
+                continue
+            moves.append(p)
+            break
+        else:
+            game.pass_turn()
+            moves.append(None)
+    return moves
+
+def gomoku_sequence(size, seed=SEED):
+    """A fixed Gomoku game that stops one move before anyone has five."""
+    rng = random.Random(seed + size)
+    game = GomokuGame(size)
+    moves = []
+    points = [(r, c) for r in range(size) for c in range(size)]
+    rng.shuffle(points)
+    for p in points:
+        game.place_stone(*p)
+        if game.is_game_over():
+            break
+        moves.append(p)
+    return moves
+
+def replay(game, moves):
+    for m in moves:
+        if m is None:
+            game.pass_turn()
+        else:
+            game.place_stone(*m)
+    return game
+
+def measure(fn, ops, min_time):
+    """Best ops/sec over three timing rounds of at least min_time each."""
+    best = 0.0
+    for _ in range(3):
+        reps = 0
+        start = time.perf_counter()
+        while True:
+            fn()
+            reps += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = max(best, ops * reps / elapsed)
+    return best
+
+def game_memory(make):
+    """Bytes still allocated by the game object that make() returns."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    game = make()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del game
+    return after - before
+
+def run(sizes=SIZES, min_time=0.2):
+    results = {}
+    for size in sizes:
+        moves = go_sequence(size)
+        final = replay(GoGame(size), moves)
+        stones = [(r, c) for r in range(size) for c in range(size) if final.board.get(r, c) is not None]
+
+        results[f"go.place_stone/{size}"] = measure(lambda: replay(GoGame(size), moves), len(moves), min_time)
+
+        def undo_all():
+            game = replay(GoGame(size), moves)
+            start = time.perf_counter()
+            while game.history:
+                game.undo()
+            return time.perf_counter() - start
+        results[f"go.undo/{size}"] = max(len(moves) / undo_all() for _ in range(5))
+
+        middle = replay(GoGame(size), moves[:len(moves) // 2])
+        probes = middle.legal_moves()
+
+        def play_unplay():
+            for m in probes:
+                middle.unplay(middle.play(m))
+        results[f"go.play_unplay/{size}"] = measure(play_unplay, len(probes), min_time)
+
+        results[f"board.clone/{size}"] = measure(final.board.clone, 1, min_time)
+        results[f"go._get_group/{size}"] = measure(
+            lambda: [final._get_group(r, c, final.board) for r, c in stones], len(stones), min_time)
+        results[f"go.calculate_winner/{size}"] = measure(final.calculate_winner, 1, min_time)
+        results[f"go.memory_bytes/{size}"] = game_memory(lambda: replay(GoGame(size), moves))
+
+        g_moves = gomoku_sequence(size)
+        g_final = replay(GomokuGame(size), g_moves)
+        results[f"gomoku.place_stone/{size}"] = measure(lambda: replay(GomokuGame(size), g_moves), len(g_moves), min_time)
+        results[f"gomoku.check_winner_at/{size}"] = measure(
+            lambda: [g_final.check_winner_at(r, c) for r, c in g_moves], len(g_moves), min_time)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bench.sav")
+            results[f"storage.save_game/{size}"] = measure(lambda: save_game(final, path), 1, min_time)
+            results[f"storage.load_game/{size}"] = measure(lambda: load_game(path), 1, min_time)
+            results[f"storage.file_bytes/{size}"] = os.path.getsize(path)
+    return results
+
+def lower_is_better(name):
+    return 'bytes' in name
+
+def compare(results, baseline, threshold):
+    """Returns a list of (name, baseline, current) that regressed by more than threshold."""
+    regressions = []
+    for name, base in baseline.items():
+        if name not in results or not base:
+            continue
+        current = results[name]
+        if lower_is_better(name):
+            worse = current > base * (1 + threshold)
+        else:
+            worse = current < base * (1 - threshold)
+        if worse:
+            regressions.append((name, base, current))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES))
+    parser.add_argument('--min-time', type=float, default=0.2, help="seconds per timing round")
+    parser.add_argument('--save', metavar='FILE', help="write results as a JSON baseline")
+    parser.add_argument('--compare', metavar='FILE', help="compare against a JSON baseline")
+    parser.add_argument('--threshold', type=float, default=0.2, help="allowed regression (default 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.min_time)
+    for name, value in results.items():
+        unit = "bytes" if lower_is_better(name) else "ops/s"
+        print(f"{name:<32} {value:>14,.0f} {unit}")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.save}.")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for name, base, current in regressions:
+            print(f"REGRESSION {name}: {base:,.0f} -> {current:,.0f}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%}.")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,38 @@
+"""Search speed of the Gomoku engine: nodes per second and depth reached in a fixed time.
+
+Usage: python src/benchmarks/bench_gomoku_ai.py [seconds_per_position]
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.gomoku import GomokuGame
+from ai.gomoku_ai import GomokuAI
+
+# Standard test positions on 15x15, as 0-based move sequences from the empty board
+POSITIONS = {
+    'opening': [(7, 7), (7, 8), (8, 8)],
+    'early': [(7, 7), (7, 8), (8, 8), (6, 6), (9, 9), (6, 7), (6, 8), (8, 6)],
+    'middle': [(7, 7), (7, 8), (8, 8), (6, 6), (9, 9), (10, 10), (8, 7), (8, 9),
+               (9, 7), (6, 7), (10, 7), (11, 7), (9, 8), (9, 6), (7, 9), (6, 10)],
+    'attack': [(7, 3), (8, 8), (7, 4), (8, 9), (7, 5), (9, 9)],
+}
+
+def run(seconds=1.0):
+    results = {}
+    for name, moves in POSITIONS.items():
+        game = GomokuGame(15)
+        for m in moves:
+            game.place_stone(*m)
+        engine = GomokuAI(time_limit=seconds)
+        move = engine.select_move(game)
+        info = engine.info
+        results[name] = {'move': move, 'depth': info.depth, 'nodes': info.nodes, 'nps': info.nps}
+    return results
+
+if __name__ == '__main__':
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    print(f"{'position':<10} {'move':<10} {'depth':>5} {'nodes':>8} {'nodes/s':>8}")
+    for name, r in run(seconds).items():
+        move = f"{r['move'][0] + 1} {r['move'][1] + 1}"
+        print(f"{name:<10} {move:<10} {r['depth']:>5} {r['nodes']:>8} {r['nps']:>8}")
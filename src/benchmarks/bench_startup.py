@@ -0,0 +1,146 @@
+"""Startup benchmark: how long each entry point takes to import what it needs.
+
+Every scenario runs in a fresh interpreter under `python -X importtime`. It reports
+the time from the first import to the end of the first command (interpreter start
+up itself is not counted), the slowest modules by their own import time, and any
+module the scenario must not load. The sources are copied to a temporary
+directory and byte-compiled there, as they are after installation, so the numbers
+do not include compiling .py files and the source tree is left untouched.
+
+Budgets are for a quiet machine. The 'eager' scenario imports every module the
+entry points used to load up front; it has no budget and serves as the reference
+lazy scenarios are compared with, which holds on a busy machine too.
+
+Usage:
+    python src/benchmarks/bench_startup.py            # report, exit 1 if over budget
+    python src/benchmarks/bench_startup.py --top 20   # list more modules
+"""
+import sys
+import os
+import argparse
+import compileall
+import json
+import shutil
+import subprocess
+import tempfile
+
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Heavy modules no scenario should load unless it uses them
+_ENGINES = ('ai.go_mcts', 'ai.gomoku_ai', 'multiprocessing', 'concurrent.futures.process')
+_STORAGE = ('utils.storage', 'utils.sgf', 'utils.book', 'utils.journal', 'pickle', 'tempfile')
+
+# name: (code, budget in ms or None, modules it must not import)
+SCENARIOS = {
+    'cli': ("from ui.cli import CLI\ncli = CLI()\ncli.process_command('help')",
+            30, ('game.go', 'game.gomoku', 'tkinter') + _ENGINES + _STORAGE),
+    'cli.gomoku': ("from ui.cli import CLI\nCLI().process_command('start gomoku 15')",
+                   40, ('game.go', 'tkinter') + _ENGINES + _STORAGE),
+    'cli.go': ("from ui.cli import CLI\nCLI().process_command('start go 19')",
+               40, ('game.gomoku', 'tkinter') + _ENGINES + _STORAGE),
+    'gtp': ("from ui.gtp import GTP\nGTP().handle('play b D4')",
+            40, ('game.gomoku', 'tkinter') + _ENGINES + _STORAGE),
+    'gui': ("import ui.gui", 80, ('game.go', 'game.gomoku') + _ENGINES + _STORAGE),
+    'eager': ("import ui.cli, game.go, game.gomoku, ai.go_mcts, ai.gomoku_ai, utils.storage, utils.sgf\n"
+              "ui.cli.CLI().process_command('help')", None, ()),
+}
+
+# Only sys and time are loaded before the clock starts; the result is the last line
+_PROBE = """import sys, time
+sys.path.insert(0, {src!r})
+_before = set(sys.modules)
+_start = time.perf_counter()
+{code}
+_ms = (time.perf_counter() - _start) * 1000
+_modules = sorted(set(sys.modules) - _before)
+import json
+print(json.dumps({{'ms': _ms, 'modules': _modules}}))
+"""
+
+def probe(code, src=SRC):
+    """Runs code in a fresh interpreter with src on the path; returns (ms, modules it
+    imported, importtime rows).
+
+    Rows are (module, self microseconds, cumulative microseconds) for the modules
+    the code imported, in import order.
+    """
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', _PROBE.format(src=src, code=code)],
+                          capture_output=True, text=True, check=True)
+    result = json.loads(proc.stdout.splitlines()[-1])
+    modules = set(result['modules'])
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue # the header line
+        module = fields[2].strip()
+        if module in modules:
+            rows.append((module, int(fields[0]), int(fields[1])))
+    return result['ms'], modules, rows
+
+def available(name):
+    code, _, _ = SCENARIOS[name]
+    if 'ui.gui' not in code:
+        return True
+    try:
+        import tkinter # noqa: F401 - only checking that it exists
+    except ImportError:
+        return False
+    return True
+
+def run(names=None, repeat=3):
+    """{name: (best ms, budget ms, forbidden modules loaded, importtime rows)}."""
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, 'src')
+        shutil.copytree(SRC, src, ignore=shutil.ignore_patterns('__pycache__', 'tests'))
+        compileall.compile_dir(src, quiet=1)
+        results = {}
+        for name in names or SCENARIOS:
+            if not available(name):
+                continue
+            code, budget, forbidden = SCENARIOS[name]
+            best = None
+            for _ in range(repeat):
+                ms, modules, rows = probe(code, src)
+                if best is None or ms < best[0]:
+                    best = (ms, rows)
+            loaded = sorted(m for m in forbidden if m in modules)
+            results[name] = (best[0], budget, loaded, best[1])
+    return results
+
+def failures(results):
+    """Messages for scenarios over their time budget or loading forbidden modules."""
+    messages = []
+    for name, (ms, budget, loaded, _) in results.items():
+        if budget is not None and ms > budget:
+            messages.append(f"{name}: {ms:.1f} ms is over the {budget} ms budget")
+        if loaded:
+            messages.append(f"{name}: imports {', '.join(loaded)}")
+    return messages
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('scenarios', nargs='*', metavar='SCENARIO',
+                        help=f"scenarios to run: {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument('--top', type=int, default=8, help="slowest modules to list per scenario")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per scenario; the best counts")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario {unknown[0]}")
+
+    results = run(args.scenarios, args.repeat)
+    for name, (ms, budget, loaded, rows) in results.items():
+        limit = "reference" if budget is None else f"budget {budget} ms"
+        print(f"{name:<12} {ms:7.1f} ms  ({limit}, {len(rows)} modules imported)")
+        for module, self_us, cumulative_us in sorted(rows, key=lambda r: -r[1])[:args.top]:
+            print(f"    {self_us / 1000:7.2f} ms self {cumulative_us / 1000:7.2f} ms total  {module}")
+    messages = failures(results)
+    for message in messages:
+        print(f"OVER BUDGET {message}")
+    return 1 if messages else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
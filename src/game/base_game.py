@@ -1,47 +1,375 @@
+from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Optional, Tuple
-from .board import Board
+from collections import namedtuple
+from .board import Board, ZOBRIST_WHITE_TO_MOVE
 from .player import Player
 from .exceptions import InvalidMoveError
+from . import profiling
+
+# One undo step. point is (row, col), or None for a pass; captured lists the points
+# of stones the move removed; pass_count is the value before the move.
+MoveRecord = namedtuple('MoveRecord', ['point', 'player', 'captured', 'pass_count'])
+
+_OTHER = {Player.BLACK: Player.WHITE, Player.WHITE: Player.BLACK}
+_PLAYERS = (None, Player.BLACK, Player.WHITE)
+
+# Review mode keeps a board checkpoint every CHECKPOINT_INTERVAL moves, widening the
+# interval for long games so there are at most MAX_CHECKPOINTS of them
+CHECKPOINT_INTERVAL = 16
+MAX_CHECKPOINTS = 64
+_RESTORE_COST = 20 # A checkpoint restore costs about as much as this many moves
 
 class BaseGame(ABC):
-    def __init__(self, board_size: int):
+    kind = None # 'go' or 'gomoku', so callers need not import every variant to tell them apart
+    # Attributes that make up the position, which a checkpoint restore replaces;
+    # settings, review state and the journal are kept
+    _position_state = ('board', 'current_player', '_history', '_lazy_moves', '_legal',
+                       'game_over', 'winner')
+
+    def __init__(self, board_size: int, board_cls=Board):
         self.board_size = board_size
-        self.board = Board(board_size)
+        # board_cls picks the backend, Board or FlatBoard; both share one interface
+        self.board = board_cls(board_size)
         self.current_player = Player.BLACK
-        self.history = [] # List of tuples (Board, Player)
+        self._history = [] # List of MoveRecord, oldest first
+        # Moves of a loaded game that come before _history; replayed on first use
+        self._lazy_moves = None
+        # Legal moves of the current position as an ordered dict of points, built on
+        # first request and dropped whenever a move is made or undone
+        self._legal = None
+        # Review mode: every move of the game being reviewed, and checkpoints of
+        # the positions after every _interval moves; see goto()
+        self._line = None
+        self._checkpoints = {}
+        self._interval = CHECKPOINT_INTERVAL
+        # Journal (utils.journal) told about every move, undo, resignation and goto
+        self.journal = None
         self.game_over = False
         self.winner = None
 
+    @property
+    def history(self):
+        if self._lazy_moves is not None:
+            self._rebuild_history()
+        return self._history
+
+    @history.setter
+    def history(self, records):
+        self._history = records
+        self._lazy_moves = None
+
     def switch_player(self):
-        self.current_player = self.current_player.other()
+        self.current_player = _OTHER[self.current_player]
 
-    def save_state(self):
-        """Saves the current state to history for undo."""
-        self.history.append((self.board.clone(), self.current_player))
+    def save_state(self, record: MoveRecord):
+        """Pushes the record of the move about to be made onto history for undo."""
+        line = self._line
+        if line is not None:
+            i = self.move_number()
+            if i == len(line):
+                line.append(record.point)
+            elif line[i] != record.point:
+                # A new move from a reviewed position replaces the rest of the line
+                del line[i:]
+                line.append(record.point)
+                for k in [k for k in self._checkpoints if k > i]:
+                    del self._checkpoints[k]
+        self._history.append(record)
+        self._legal = None
+        if self.journal is not None:
+            self.journal.record_move(record.point)
 
     def undo(self):
-        """Reverts to the previous state."""
+        """Reverts the last move by applying its record in reverse."""
         if not self.history:
             raise InvalidMoveError("No moves to undo.")
-        
-        prev_board, prev_player = self.history.pop()
-        self.board = prev_board
-        self.current_player = prev_player
+        self.unplay(self._history[-1])
+        return True
+
+    def play(self, move):
+        """Low-level make-move for search code: plays (row, col), or None for a pass.
+
+        Changes the game in place like place_stone / pass_turn but never raises:
+        returns a token to hand to unplay(), or None (and changes nothing) if the
+        move is illegal.
+        """
+        if self.game_over:
+            return None
+        if move is None:
+            return self._play_pass()
+        if not self.board.is_within_bounds(move[0], move[1]):
+            return None
+        return self._play_point(move)
+
+    def unplay(self, token):
+        """Takes back the move play() returned token for; it must be the latest move."""
+        history = self._history
+        if not history or history[-1] is not token:
+            raise InvalidMoveError("Only the latest move can be taken back.")
+        history.pop()
+        self._legal = None
+        self._revert(token)
+        self.current_player = token.player
         self.game_over = False
         self.winner = None
-        return True
+        if self.journal is not None:
+            self.journal.record_undo()
+
+    def resign(self):
+        """The side to move gives up and the other side wins."""
+        if self.game_over:
+            raise InvalidMoveError("Game is already over.")
+        self.game_over = True
+        self.winner = _OTHER[self.current_player]
+        if self.journal is not None:
+            self.journal.record_resign()
+
+    def _revert(self, record: MoveRecord):
+        """Takes a move back off the board. Runs before current_player is restored."""
+        if record.point is not None:
+            self.board.remove_stone(*record.point)
+
+    def move_list(self):
+        """Every move played so far, (row, col) or None for a pass, oldest first."""
+        return (self._lazy_moves or []) + [record.point for record in self._history]
+
+    def move_number(self):
+        """How many moves have been played to reach the current position."""
+        return len(self._history) + (len(self._lazy_moves) if self._lazy_moves is not None else 0)
+
+    def review_length(self):
+        """Moves in the game under review; move_number() when not reviewing."""
+        return len(self._line) if self._line is not None else self.move_number()
+
+    def review_moves(self):
+        """Every move of the game under review; move_list() when not reviewing."""
+        return list(self._line) if self._line is not None else self.move_list()
+
+    def goto(self, move_number):
+        """Shows the position after the first move_number moves (0: the empty board).
+
+        The first call starts review mode: the game's moves are kept, so forward()
+        can play them again after going back, and the game is replayed once on a
+        scratch copy to checkpoint the position every few moves. From then on any
+        jump costs at most one checkpoint restore plus a few replayed moves. Playing
+        a different move from a reviewed position drops the rest of the old line.
+        """
+        line = self._line
+        if line is None:
+            line = self.move_list()
+            self._interval = max(CHECKPOINT_INTERVAL, -(-len(line) // MAX_CHECKPOINTS))
+            self._checkpoints = self._build_checkpoints(line)
+            self._line = line
+        if not 0 <= move_number <= len(line):
+            raise InvalidMoveError(f"Move number must be from 0 to {len(line)}.")
+        if move_number == self.move_number():
+            return
+        # The journal gets the jump as one record, not the moves it takes
+        journal, self.journal = self.journal, None
+        try:
+            self._goto(move_number)
+        finally:
+            self.journal = journal
+        if journal is not None:
+            journal.record_goto(move_number)
+
+    def _goto(self, move_number):
+        current = self.move_number()
+        base = move_number - move_number % self._interval
+        while base and base not in self._checkpoints:
+            base -= self._interval
+        restore_cost = _RESTORE_COST + move_number - base
+        if move_number < current:
+            steps = current - move_number
+            # The record a loaded game starts with cannot be taken back cheaply
+            undoable = len(self._history) - (self._lazy_moves is not None)
+            if steps <= undoable and steps <= restore_cost:
+                for _ in range(steps):
+                    self.unplay(self._history[-1])
+                return
+        elif base <= current or move_number - current <= restore_cost:
+            self._replay(current, move_number)
+            return
+        self._restore_checkpoint(base)
+        self._replay(base, move_number)
+
+    def forward(self):
+        """Plays the next move of the game under review."""
+        if self.move_number() >= self.review_length():
+            raise InvalidMoveError("Already at the last move.")
+        self.goto(self.move_number() + 1)
+
+    def back(self):
+        """Steps back one move, keeping it for forward()."""
+        if self.move_number() == 0:
+            raise InvalidMoveError("Already at the first move.")
+        self.goto(self.move_number() - 1)
+
+    def _build_checkpoints(self, line):
+        replay = self.new_game()
+        interval = self._interval
+        checkpoints = {}
+        for i, move in enumerate(line, 1):
+            if replay.play(move) is None:
+                raise InvalidMoveError(f"Move {i} of the game cannot be replayed.")
+            if i % interval == 0:
+                checkpoints[i] = replay._checkpoint()
+        return checkpoints
+
+    def _replay(self, start, end):
+        line = self._line
+        interval = self._interval
+        checkpoints = self._checkpoints
+        for i in range(start, end):
+            if self.play(line[i]) is None:
+                raise InvalidMoveError(f"Move {i + 1} of the game cannot be replayed.")
+            if (i + 1) % interval == 0 and i + 1 not in checkpoints and len(checkpoints) < MAX_CHECKPOINTS:
+                checkpoints[i + 1] = self._checkpoint()
+
+    def _restore_checkpoint(self, index):
+        if index:
+            game = self._from_checkpoint(self._checkpoints[index], self._line[:index])
+        else:
+            game = self.new_game()
+        for name in self._position_state:
+            setattr(self, name, getattr(game, name))
+
+    def _checkpoint(self):
+        """Compact snapshot of the position: one byte per point (0 empty, 1 black,
+        2 white), side to move, result, the last move's captures and _extra_state()."""
+        get = self.board.get
+        n = self.board_size
+        stones = bytes(0 if p is None else p.value for p in (get(r, c) for r in range(n) for c in range(n)))
+        last = self.last_move()
+        return (stones, self.current_player, self.game_over, self.winner,
+                last.captured if last else (), self._extra_state())
+
+    def _from_checkpoint(self, checkpoint, moves):
+        """A new game at a _checkpoint() position, reached by moves."""
+        stones, player, over, winner, captured, extra = checkpoint
+        n = self.board_size
+        game = self.new_game()
+        game.current_player = player
+        game.restore([(i // n, i % n, _PLAYERS[v]) for i, v in enumerate(stones) if v], moves, captured)
+        game.game_over = over
+        game.winner = winner
+        game._set_extra_state(extra)
+        return game
+
+    def _extra_state(self):
+        """Game specific state a checkpoint must keep besides the board."""
+        return ()
+
+    def _set_extra_state(self, extra):
+        pass
+
+    def last_move(self) -> MoveRecord | None:
+        """Record of the latest move, or None; cheaper than history[-1] after a load."""
+        if self._history:
+            return self._history[-1]
+        return self.history[-1] if self.history else None
+
+    def restore(self, stones, moves, last_captured=()):
+        """Sets up a saved position without replaying the game.
+
+        stones lists (row, col, player) on the board, moves is every move played so
+        far ((row, col), or None for a pass) and last_captured the stones the final
+        move took. Only the final move's record is built now; the rest of history is
+        replayed from moves the first time undo or review asks for it.
+        """
+        for r, c, p in stones:
+            self.board.place_stone(r, c, p)
+        self._legal = None
+        if not moves:
+            return
+        last = len(moves) - 1
+        passes = 0
+        while passes < last and moves[last - 1 - passes] is None:
+            passes += 1
+        player = Player.BLACK if last % 2 == 0 else Player.WHITE
+        self._history = [MoveRecord(moves[-1], player, tuple(last_captured), passes)]
+        self._lazy_moves = list(moves[:-1]) if last else None
+
+    def _rebuild_history(self):
+        moves, self._lazy_moves = self._lazy_moves, None
+        replay = self.new_game()
+        for move in moves:
+            if move is None:
+                replay.pass_turn()
+            else:
+                replay.place_stone(*move)
+        self._history = replay._history + self._history
+        return replay
+
+    def new_game(self):
+        """An empty game with the same size and settings."""
+        return type(self)(self.board_size, type(self.board))
+
+    def copy(self):
+        """An independent copy of the game, e.g. for a search running in another thread."""
+        return self._from_checkpoint(self._checkpoint(), self.move_list())
+
+    def legal_moves(self):
+        """Every point the side to move may play, as (row, col) in row-major order.
+
+        Worked out once per position and reused until the next move or undo. A pass
+        (in Go) is always allowed and is not listed.
+        """
+        if self.game_over:
+            return []
+        if self._legal is None:
+            self._legal = dict.fromkeys(self._generate_legal_moves())
+        return list(self._legal)
+
+    def is_legal(self, row: int, col: int) -> bool:
+        """Whether place_stone(row, col) would succeed, without changing the game."""
+        if self.game_over or not self.board.is_within_bounds(row, col):
+            return False
+        if self._legal is not None:
+            return (row, col) in self._legal
+        return self._move_error(row, col) is None
+
+    def _move_error(self, row: int, col: int) -> str | None:
+        """Why the side to move may not play at an on-board point, or None if it may."""
+        if self.board.get(row, col) is not None:
+            return "Position already occupied."
+        return None
+
+    def _generate_legal_moves(self):
+        n = self.board_size
+        return [(r, c) for r in range(n) for c in range(n) if self._move_error(r, c) is None]
 
-    @abstractmethod
     def place_stone(self, row: int, col: int):
-        """Attempts to place a stone. Should raise InvalidMoveError if invalid."""
+        """Places a stone for the side to move. Raises InvalidMoveError if invalid."""
+        if self.game_over:
+            raise InvalidMoveError("Game is already over.")
+        if not self.board.is_within_bounds(row, col):
+            raise InvalidMoveError("Position out of bounds.")
+        if self._play_point((row, col)) is None:
+            raise InvalidMoveError(self._move_error(row, col))
+
+    @abstractmethod
+    def _play_point(self, point):
+        """Plays at an on-board point of an unfinished game. Returns the MoveRecord
+        pushed onto history, or None without changing anything if the move is illegal."""
         pass
 
+    def _play_pass(self):
+        """Passes, if the game allows it; same contract as _play_point."""
+        return None
+
     @abstractmethod
-    def check_winner(self) -> Optional[Player]:
+    def check_winner(self) -> Player | None:
         """Checks if there is a winner."""
         pass
 
+    def position_hash(self) -> int:
+        """64-bit Zobrist key of the board plus side to move, e.g. for caches."""
+        h = self.board.zobrist_hash
+        if self.current_player == Player.WHITE:
+            h ^= ZOBRIST_WHITE_TO_MOVE
+        return h
+
     def get_board(self):
         return self.board
     
@@ -50,3 +378,5 @@ class BaseGame(ABC):
 
     def is_game_over(self):
         return self.game_over
+
+profiling.instrument(BaseGame, ('place_stone', 'undo', 'save_state'), 'game')
@@ -0,0 +1,197 @@
+"""Vectorized engines that step a whole batch of games at once. Requires NumPy.
+
+Boards are (B, N, N) int8 arrays using FlatBoard's cell codes (0 empty, 1 black,
+2 white); moves are given per game as a flat index row * N + col. Every rule check
+works on the full batch with a few array operations instead of a Python loop per game.
+"""
+import numpy as np
+from .board import EMPTY, BLACK, WHITE, BORDER
+from .exceptions import InvalidBoardSizeError
+
+PASS = -1
+
+def _pad(a, value):
+    return np.pad(a, ((0, 0), (1, 1), (1, 1)), constant_values=value)
+
+def _neighbors(a, value):
+    """The four orthogonal neighbour views of a (B, N, N) array, off-board = value."""
+    p = _pad(a, value)
+    return (p[:, :-2, 1:-1], p[:, 2:, 1:-1], p[:, 1:-1, :-2], p[:, 1:-1, 2:])
+
+class _Batch:
+    def __init__(self, batch_size: int, size: int):
+        if not (8 <= size <= 19):
+            raise InvalidBoardSizeError(f"Board size must be between 8 and 19. Got {size}.")
+        self.batch_size = batch_size
+        self.size = size
+        self.boards = np.zeros((batch_size, size, size), dtype=np.int8)
+        self.to_move = np.full(batch_size, BLACK, dtype=np.int8)
+        self.done = np.zeros(batch_size, dtype=bool)
+        self.winner = np.zeros(batch_size, dtype=np.int8) # 0 = none / draw
+
+    def _place(self, moves):
+        """Puts each active game's stone down; returns (games, rows, cols) that moved."""
+        moves = np.asarray(moves)
+        games = np.nonzero(~self.done & (moves >= 0))[0]
+        rows, cols = np.divmod(moves[games], self.size)
+        self.boards[games, rows, cols] = self.to_move[games]
+        return games, rows, cols
+
+class BatchGomoku(_Batch):
+    """B Gomoku games stepped together; matches GomokuGame move for move."""
+
+    def legal_mask(self):
+        return (self.boards == EMPTY) & ~self.done[:, None, None]
+
+    def play(self, moves):
+        """Plays moves[b] in every unfinished game b. Moves must be legal."""
+        games, _, _ = self._place(moves)
+        won = self.fives(self.to_move)[games]
+        full = ~(self.boards[games] == EMPTY).any(axis=(1, 2))
+        self.done[games] = won | full
+        self.winner[games] = np.where(won, self.to_move[games], 0)
+        # Like GomokuGame, the turn does not pass once the game is over
+        keep = games[~(won | full)]
+        self.to_move[keep] = 3 - self.to_move[keep]
+
+    def fives(self, colors):
+        """Whether each game has five in a row of colors[b], via sliding-window sums."""
+        mine = (self.boards == np.asarray(colors, dtype=np.int8)[:, None, None]).astype(np.int8)
+        n = self.size
+        found = np.zeros(self.batch_size, dtype=bool)
+        windows = (
+            sum(mine[:, :, k:n - 4 + k] for k in range(5)),                              # rows
+            sum(mine[:, k:n - 4 + k, :] for k in range(5)),                              # columns
+            sum(mine[:, k:n - 4 + k, k:n - 4 + k] for k in range(5)),                    # diagonals
+            sum(mine[:, k:n - 4 + k, 4 - k:n - k] for k in range(5)),                    # anti-diagonals
+        )
+        for w in windows:
+            found |= (w == 5).any(axis=(1, 2))
+        return found
+
+class BatchGo(_Batch):
+    """B Go games stepped together; matches GoGame with the default simple ko rule."""
+
+    def __init__(self, batch_size: int, size: int):
+        super().__init__(batch_size, size)
+        self.ko = np.full(batch_size, PASS, dtype=np.int64) # flat index forbidden to the mover
+        self.passes = np.zeros(batch_size, dtype=np.int8)
+        self.captures = np.zeros((batch_size, 3), dtype=np.int64) # indexed by colour
+        self._index = np.arange(batch_size * size * size, dtype=np.int64).reshape(batch_size, size, size)
+
+    def groups(self):
+        """Labels every chain and counts its liberties.
+
+        Returns (labels, liberties): labels holds a batch-unique id per chain (the
+        smallest global cell index in it; empty cells get the sentinel B*N*N) and
+        liberties the liberty count of the chain through each stone (0 elsewhere).
+        """
+        boards = self.boards
+        stones = boards != EMPTY
+        sentinel = boards.size
+        labels = np.where(stones, self._index, sentinel)
+        neighbor_colors = _neighbors(boards, BORDER)
+        same = [(nc == boards) & stones for nc in neighbor_colors]
+        # Min-label propagation until every chain carries one label
+        while True:
+            new = labels
+            for s, nl in zip(same, _neighbors(labels, sentinel)):
+                new = np.where(s, np.minimum(new, nl), new)
+            if np.array_equal(new, labels):
+                break
+            labels = new
+
+        # Distinct (chain, empty neighbour) pairs are the liberties
+        empty = boards == EMPTY
+        keys = []
+        for step, ne in zip((-self.size, self.size, -1, 1), _neighbors(empty, False)):
+            m = stones & ne
+            keys.append(labels[m] * sentinel + self._index[m] + step)
+        keys = np.unique(np.concatenate(keys))
+        per_label = np.bincount(keys // sentinel, minlength=sentinel + 1)
+        liberties = np.where(stones, per_label[labels], 0)
+        return labels, liberties
+
+    def legal_mask(self):
+        """(B, N, N) mask of the points the side to move may play."""
+        _, liberties = self.groups()
+        me = self.to_move[:, None, None]
+        ok = np.zeros(self.boards.shape, dtype=bool)
+        for nc, nl in zip(_neighbors(self.boards, BORDER), _neighbors(liberties, 0)):
+            ok |= nc == EMPTY                      # a free liberty
+            ok |= (nc == me) & (nl > 1)            # joins a chain that keeps a liberty
+            ok |= (nc == 3 - me) & (nl == 1)       # captures
+        n2 = self.size * self.size
+        not_ko = self._index % n2 != self.ko[:, None, None]
+        return (self.boards == EMPTY) & ok & not_ko & ~self.done[:, None, None]
+
+    def play(self, moves):
+        """Plays moves[b] (flat index, or PASS) in every unfinished game b.
+
+        Moves must be legal, e.g. taken from legal_mask().
+        """
+        moves = np.asarray(moves)
+        live = ~self.done
+        passing = live & (moves == PASS)
+        labels, liberties = self.groups()
+        games, rows, cols = self._place(moves)
+        me = self.to_move[games]
+
+        # Opponent chains whose last liberty was the played point die
+        dead = np.zeros(self.boards.size + 1, dtype=bool)
+        n = self.size
+        for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            r, c = rows + dr, cols + dc
+            inside = (r >= 0) & (r < n) & (c >= 0) & (c < n)
+            g, r, c = games[inside], r[inside], c[inside]
+            hit = (self.boards[g, r, c] == 3 - me[inside]) & (liberties[g, r, c] == 1)
+            dead[labels[g[hit], r[hit], c[hit]]] = True
+        captured = dead[labels] & (self.boards != EMPTY)
+        counts = captured.sum(axis=(1, 2))
+        self.boards[captured] = EMPTY
+        self.captures[games, me] += counts[games]
+
+        # Simple ko: a lone stone that captured exactly one stone and has only that liberty
+        self.ko[live] = PASS
+        single = games[counts[games] == 1]
+        if len(single):
+            r, c = np.divmod(moves[single], n)
+            color = self.to_move[single]
+            padded = _pad(self.boards[single], BORDER)
+            around = np.stack([padded[np.arange(len(single)), r + 1 + dr, c + 1 + dc]
+                               for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1))])
+            lone = ~(around == color).any(axis=0) & ((around == EMPTY).sum(axis=0) == 1)
+            ko_games = single[lone]
+            self.ko[ko_games] = captured[ko_games].reshape(len(ko_games), n * n).argmax(axis=1)
+
+        self.passes[games] = 0
+        self.passes[passing] += 1
+        over = passing & (self.passes >= 2)
+        if over.any():
+            self.done |= over
+            score = self.area_scores()
+            self.winner[over] = np.where(score[over] > 0, BLACK, np.where(score[over] < 0, WHITE, 0))
+        moved = live & (moves >= 0) | passing
+        self.to_move[moved] = 3 - self.to_move[moved]
+
+    def area_scores(self):
+        """Black area minus White area per game, as GoGame.calculate_winner counts it."""
+        boards = self.boards
+        empty = boards == EMPTY
+        reach = {}
+        for color in (BLACK, WHITE):
+            # Empty points connected to a stone of this colour through empty points
+            r = np.zeros(boards.shape, dtype=bool)
+            for nc in _neighbors(boards, BORDER):
+                r |= empty & (nc == color)
+            while True:
+                new = r.copy()
+                for nr in _neighbors(r, False):
+                    new |= empty & nr
+                if np.array_equal(new, r):
+                    break
+                r = new
+            reach[color] = r
+        black = (boards == BLACK) | (reach[BLACK] & ~reach[WHITE])
+        white = (boards == WHITE) | (reach[WHITE] & ~reach[BLACK])
+        return black.sum(axis=(1, 2)).astype(np.int64) - white.sum(axis=(1, 2))
@@ -0,0 +1,66 @@
+from .exceptions import InvalidBoardSizeError
+
+class GomokuBitboard:
+    """Gomoku position as one Python int per player.
+
+    Bit row * stride + col is set when that player has a stone there. Each row carries
+    one always-empty padding column, so shifting a row past its end lands on a zero bit
+    instead of wrapping into the next row. Five in a row along direction s (1, stride,
+    stride + 1, stride - 1) is then found with three shift-and-AND steps.
+    """
+
+    def __init__(self, size: int):
+        if not (8 <= size <= 19):
+            raise InvalidBoardSizeError(f"Board size must be between 8 and 19. Got {size}.")
+        self.size = size
+        self.stride = size + 1
+        # Indexed by Player.value; slot 0 is unused so player.value can index directly
+        self.bits = [0, 0, 0]
+        self.occupied = 0
+        self.full_mask = 0
+        for r in range(size):
+            self.full_mask |= ((1 << size) - 1) << (r * self.stride)
+        self.shifts = (1, self.stride, self.stride + 1, self.stride - 1)
+
+    def bit(self, row: int, col: int) -> int:
+        return 1 << (row * self.stride + col)
+
+    def is_empty(self, row: int, col: int) -> bool:
+        return not self.occupied >> (row * self.stride + col) & 1
+
+    def place(self, row: int, col: int, value: int):
+        b = 1 << (row * self.stride + col)
+        self.bits[value] |= b
+        self.occupied |= b
+
+    def remove(self, row: int, col: int, value: int):
+        b = ~(1 << (row * self.stride + col))
+        self.bits[value] &= b
+        self.occupied &= b
+
+    def has_five(self, value: int) -> bool:
+        """Whether the player with this Player.value has five (or more) in a row."""
+        b = self.bits[value]
+        for s in self.shifts:
+            m = b & (b >> s)        # two in a row
+            m &= m >> (2 * s)       # four in a row
+            if m & (b >> (4 * s)):  # five in a row
+                return True
+        return False
+
+    def empty_points(self):
+        """Yields (row, col) of every empty point in row-major order."""
+        free = self.full_mask & ~self.occupied
+        while free:
+            low = free & -free
+            yield divmod(low.bit_length() - 1, self.stride)
+            free ^= low
+
+    def is_full(self) -> bool:
+        return self.occupied == self.full_mask
+
+    def copy(self):
+        new = GomokuBitboard.__new__(GomokuBitboard)
+        new.__dict__.update(self.__dict__)
+        new.bits = self.bits[:]
+        return new
@@ -1,6 +1,24 @@
+import random
 from .player import Player
 from .exceptions import InvalidBoardSizeError
 
+# Fixed seed so hashes are stable across processes and can be stored on disk.
+_ZOBRIST_SEED = 0x5EED
+_zobrist_tables = {}
+
+# XORed into a position hash when White is to move.
+ZOBRIST_WHITE_TO_MOVE = random.Random(_ZOBRIST_SEED - 1).getrandbits(64)
+
+def zobrist_table(size: int):
+    """Returns table[row][col][player.value] of 64-bit keys for a board size."""
+    table = _zobrist_tables.get(size)
+    if table is None:
+        rng = random.Random(_ZOBRIST_SEED + size)
+        table = [[(0, rng.getrandbits(64), rng.getrandbits(64)) for _ in range(size)]
+                 for _ in range(size)]
+        _zobrist_tables[size] = table
+    return table
+
 class Board:
     def __init__(self, size: int):
         if not (8 <= size <= 19):
@@ -9,6 +27,9 @@ class Board:
         # Grid is a list of lists. None represents empty.
         # indexed as grid[row][col]
         self.grid = [[None for _ in range(size)] for _ in range(size)]
+        # Incremental Zobrist hash of the stones on the board (0 for an empty board)
+        self._zobrist = zobrist_table(size)
+        self.zobrist_hash = 0
 
     def is_within_bounds(self, row: int, col: int) -> bool:
         return 0 <= row < self.size and 0 <= col < self.size
@@ -20,12 +41,36 @@ class Board:
 
     def place_stone(self, row: int, col: int, player: Player):
         if self.is_within_bounds(row, col):
+            keys = self._zobrist[row][col]
+            old = self.grid[row][col]
+            if old is not None:
+                self.zobrist_hash ^= keys[old.value]
             self.grid[row][col] = player
+            self.zobrist_hash ^= keys[player.value]
 
     def remove_stone(self, row: int, col: int):
         if self.is_within_bounds(row, col):
+            old = self.grid[row][col]
+            if old is not None:
+                self.zobrist_hash ^= self._zobrist[row][col][old.value]
             self.grid[row][col] = None
 
+    def stone_key(self, row: int, col: int, player: Player) -> int:
+        """The Zobrist key XORed into the hash for a stone of player at (row, col)."""
+        return self._zobrist[row][col][player.value]
+
+    def run_length(self, row: int, col: int, dr: int, dc: int) -> int:
+        """Number of stones matching (row, col) when stepping (dr, dc) away from it."""
+        player = self.get(row, col)
+        count = 0
+        row += dr
+        col += dc
+        while self.is_within_bounds(row, col) and self.grid[row][col] == player:
+            count += 1
+            row += dr
+            col += dc
+        return count
+
     def is_full(self) -> bool:
         for r in range(self.size):
             for c in range(self.size):
@@ -39,6 +84,7 @@ class Board:
         for r in range(self.size):
             for c in range(self.size):
                 new_board.grid[r][c] = self.grid[r][c]
+        new_board.zobrist_hash = self.zobrist_hash
         return new_board
 
     def __str__(self):
@@ -54,3 +100,135 @@ class Board:
                     row_str.append(p.symbol())
             s.append(" ".join(row_str))
         return "\n".join(s)
+
+
+# Cell codes used by FlatBoard. Stones use Player.value so codes and enums map 1:1.
+EMPTY = 0
+BLACK = Player.BLACK.value
+WHITE = Player.WHITE.value
+BORDER = 3
+_DECODE = (None, Player.BLACK, Player.WHITE, None)
+
+class FlatBoard:
+    """Board backend on a single bytearray with a one-cell sentinel border.
+
+    Offers the same interface as Board, so games and UIs can use either. Engines can
+    also work on cells/index()/offsets directly: walking off the playing area always
+    lands on a BORDER cell, so neighbour scans need no bounds checks.
+    """
+
+    def __init__(self, size: int):
+        if not (8 <= size <= 19):
+            raise InvalidBoardSizeError(f"Board size must be between 8 and 19. Got {size}.")
+        self.size = size
+        self.stride = size + 2
+        self.cells = bytearray([BORDER]) * (self.stride * self.stride)
+        for r in range(size):
+            start = self.index(r, 0)
+            self.cells[start:start + size] = bytes(size)
+        # Offsets to the four orthogonal neighbours of a cell index
+        self.offsets = (1, -1, self.stride, -self.stride)
+        self.empty_count = size * size
+        self._zobrist = _flat_zobrist_table(size)
+        self.zobrist_hash = 0
+
+    def index(self, row: int, col: int) -> int:
+        return (row + 1) * self.stride + col + 1
+
+    def point(self, index: int):
+        """Inverse of index(): the (row, col) of a cell index."""
+        r, c = divmod(index, self.stride)
+        return r - 1, c - 1
+
+    def is_within_bounds(self, row: int, col: int) -> bool:
+        return 0 <= row < self.size and 0 <= col < self.size
+
+    def get(self, row: int, col: int):
+        if not (0 <= row < self.size and 0 <= col < self.size):
+            return None
+        return _DECODE[self.cells[(row + 1) * self.stride + col + 1]]
+
+    def place_stone(self, row: int, col: int, player: Player):
+        if 0 <= row < self.size and 0 <= col < self.size:
+            i = (row + 1) * self.stride + col + 1
+            old = self.cells[i]
+            if old == EMPTY:
+                self.empty_count -= 1
+            else:
+                self.zobrist_hash ^= self._zobrist[i][old]
+            self.cells[i] = player.value
+            self.zobrist_hash ^= self._zobrist[i][player.value]
+
+    def remove_stone(self, row: int, col: int):
+        if 0 <= row < self.size and 0 <= col < self.size:
+            i = (row + 1) * self.stride + col + 1
+            old = self.cells[i]
+            if old != EMPTY:
+                self.zobrist_hash ^= self._zobrist[i][old]
+                self.cells[i] = EMPTY
+                self.empty_count += 1
+
+    def stone_key(self, row: int, col: int, player: Player) -> int:
+        return self._zobrist[self.index(row, col)][player.value]
+
+    def place_index(self, i: int, value: int):
+        """place_stone() by cell index and code, for engines. i must be an empty playable cell."""
+        self.cells[i] = value
+        self.empty_count -= 1
+        self.zobrist_hash ^= self._zobrist[i][value]
+
+    def remove_index(self, i: int):
+        """remove_stone() by cell index. i must hold a stone."""
+        self.zobrist_hash ^= self._zobrist[i][self.cells[i]]
+        self.cells[i] = EMPTY
+        self.empty_count += 1
+
+    def run_length(self, row: int, col: int, dr: int, dc: int) -> int:
+        cells = self.cells
+        i = self.index(row, col)
+        v = cells[i]
+        step = dr * self.stride + dc
+        count = 0
+        i += step
+        # The border stops the walk, whatever the direction
+        while cells[i] == v:
+            count += 1
+            i += step
+        return count
+
+    def is_full(self) -> bool:
+        return self.empty_count == 0
+
+    @property
+    def grid(self):
+        """List-of-lists view matching Board.grid (a copy; read-only)."""
+        return [[self.get(r, c) for c in range(self.size)] for r in range(self.size)]
+
+    def clone(self):
+        """Create a deep copy of the board."""
+        new_board = FlatBoard.__new__(FlatBoard)
+        new_board.size = self.size
+        new_board.stride = self.stride
+        new_board.cells = self.cells[:]
+        new_board.offsets = self.offsets
+        new_board.empty_count = self.empty_count
+        new_board._zobrist = self._zobrist
+        new_board.zobrist_hash = self.zobrist_hash
+        return new_board
+
+    def __str__(self):
+        return "\n".join(" ".join("." if p is None else p.symbol() for p in row) for row in self.grid)
+
+_flat_zobrist_tables = {}
+
+def _flat_zobrist_table(size: int):
+    # Same keys as zobrist_table(), laid out by cell index, so both backends hash alike
+    table = _flat_zobrist_tables.get(size)
+    if table is None:
+        stride = size + 2
+        table = [(0, 0, 0)] * (stride * stride)
+        for r, row in enumerate(zobrist_table(size)):
+            for c, keys in enumerate(row):
+                table[(r + 1) * stride + c + 1] = keys
+        _flat_zobrist_tables[size] = table
+    return table
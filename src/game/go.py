@@ -1,99 +1,568 @@
-from .base_game import BaseGame
+from .base_game import BaseGame, MoveRecord
+from .board import Board, ZOBRIST_WHITE_TO_MOVE
 from .player import Player
 from .exceptions import InvalidMoveError
-import copy
+from . import profiling
+from collections import deque
+
+class Chain:
+    """A connected group of same-coloured stones together with its liberties."""
+    __slots__ = ('color', 'stones', 'liberties')
+
+    def __init__(self, color, stones, liberties):
+        self.color = color
+        self.stones = stones
+        self.liberties = liberties
+
+class Region:
+    """A connected area of empty points. edges[v] counts (point, neighbouring stone of
+    Player value v) pairs, so the region is territory of a colour when only it has edges."""
+    __slots__ = ('points', 'edges')
+
+    def __init__(self, points, edges):
+        self.points = points
+        self.edges = edges
+
+    def owner(self):
+        black, white = self.edges[1], self.edges[2]
+        if black and not white:
+            return 1
+        if white and not black:
+            return 2
+        return 0
+
+class _Search:
+    __slots__ = ('frontier', 'members')
+
+    def __init__(self, start):
+        # Breadth-first, so searches on both sides of a stone meet close to it
+        self.frontier = deque([start])
+        self.members = [start]
+
+# 'simple' only forbids retaking a ko immediately; 'positional' forbids repeating any
+# earlier board; 'situational' forbids repeating a board with the same side to move.
+KO_RULES = ('simple', 'positional', 'situational')
+
+_NEIGHBOR_TABLES = {}
+
+def _neighbor_table(size):
+    """point -> tuple of on-board neighbours; shared, read-only, one per board size."""
+    table = _NEIGHBOR_TABLES.get(size)
+    if table is None:
+        table = {}
+        for r in range(size):
+            for c in range(size):
+                table[(r, c)] = tuple(
+                    (r + dr, c + dc) for dr, dc in [(0, 1), (0, -1), (1, 0), (-1, 0)]
+                    if 0 <= r + dr < size and 0 <= c + dc < size
+                )
+        _NEIGHBOR_TABLES[size] = table
+    return table
+
+_RING_TABLES = {}
+_RING = ((-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1))
+
+def _ring_table(size):
+    """point -> the 8 surrounding points clockwise from north (None off the board);
+    orthogonal neighbours sit at even positions."""
+    table = _RING_TABLES.get(size)
+    if table is None:
+        table = {}
+        for r in range(size):
+            for c in range(size):
+                table[(r, c)] = tuple(
+                    (r + dr, c + dc) if 0 <= r + dr < size and 0 <= c + dc < size else None
+                    for dr, dc in _RING
+                )
+        _RING_TABLES[size] = table
+    return table
 
 class GoGame(BaseGame):
-    def __init__(self, board_size: int):
-        super().__init__(board_size)
+    kind = 'go'
+    _position_state = BaseGame._position_state + (
+        'pass_count', 'captured_stones', '_chains', '_hash_history', '_seen_positions',
+        '_regions', '_stone_count', '_territory')
+
+    def __init__(self, board_size: int, ko_rule: str = 'simple', board_cls=Board, komi: float = 0.0):
+        if ko_rule not in KO_RULES:
+            raise ValueError(f"Unknown ko rule '{ko_rule}'. Choose one of {', '.join(KO_RULES)}.")
+        super().__init__(board_size, board_cls)
+        self.ko_rule = ko_rule
+        self.komi = komi
         self.pass_count = 0
         self.captured_stones = {Player.BLACK: 0, Player.WHITE: 0}
         # History needed for Ko check is already in BaseGame, but we need to ensure it's used correctly.
 
+        # Neighbours of every point are fixed for a given size, so compute them once.
+        self._neighbor_table = _neighbor_table(board_size)
+        self._ring_table = _ring_table(board_size)
+        # point -> Chain, kept up to date incrementally as stones are added and captured
+        self._chains = {}
+        # Board hash after every action (index 0 is the empty board) and how often each
+        # superko key has occurred, so repetition checks are O(1).
+        self._hash_history = [self.board.zobrist_hash]
+        self._seen_positions = {self._superko_key(self.board.zobrist_hash, self.current_player): 1}
+        # Empty regions and per-colour stone / territory counts (indexed by Player.value,
+        # 0 for neutral), updated with every stone placed or removed so the area score
+        # is always current. The empty board is one neutral region.
+        region = Region(set(self._neighbor_table), [0, 0, 0])
+        self._regions = dict.fromkeys(self._neighbor_table, region)
+        self._stone_count = [0, 0, 0]
+        self._territory = [board_size * board_size, 0, 0]
+
+    def new_game(self):
+        return GoGame(self.board_size, self.ko_rule, type(self.board), self.komi)
+
+    def _extra_state(self):
+        return self.pass_count, self.captured_stones[Player.BLACK], self.captured_stones[Player.WHITE]
+
+    def _set_extra_state(self, extra):
+        self.pass_count, black, white = extra
+        self.captured_stones = {Player.BLACK: black, Player.WHITE: white}
+
+    def restore(self, stones, moves, last_captured=()):
+        super().restore(stones, moves, last_captured)
+        self._rebuild_chains()
+        # Regions are rebuilt on first use, keeping loads fast
+        self._regions = None
+        h = self.board.zobrist_hash
+        self._hash_history = [h]
+        if moves:
+            # Board before the final move, enough for the simple ko check
+            record = self._history[-1]
+            prev = h
+            if record.point is not None:
+                prev ^= self.board.stone_key(record.point[0], record.point[1], record.player)
+                for r, c in record.captured:
+                    prev ^= self.board.stone_key(r, c, record.player.other())
+            self._hash_history = [prev, h]
+        self._count_positions(len(moves) - 1 if moves else 0)
+
+    def _rebuild_history(self):
+        replay = super()._rebuild_history()
+        # The replay ends on the board before the final loaded move
+        self._hash_history = replay._hash_history + self._hash_history[1:]
+        self._count_positions()
+        return replay
+
+    def _count_positions(self, offset=0):
+        # Every action switches the player, so Black is to move after an even number
+        # of them; offset is the action count at _hash_history[0]
+        self._seen_positions = {}
+        for i, h in enumerate(self._hash_history):
+            key = self._superko_key(h, Player.BLACK if (i + offset) % 2 == 0 else Player.WHITE)
+            self._seen_positions[key] = self._seen_positions.get(key, 0) + 1
+
     def pass_turn(self):
-        self.save_state()
+        self._play_pass()
+
+    def _play_pass(self):
+        record = MoveRecord(None, self.current_player, (), self.pass_count)
+        self.save_state(record)
         self.pass_count += 1
         if self.pass_count >= 2:
             self.game_over = True
             self.winner = self.calculate_winner()
         self.switch_player()
+        self._record_position()
+        return record
 
-    def save_state(self):
-        """Saves the current state including captured stones and pass count."""
-        self.history.append((self.board.clone(), self.current_player, self.captured_stones.copy(), self.pass_count))
+    def _revert(self, record):
+        """Undoes a move or pass: lifts the stone, puts captured stones back."""
+        self._forget_position()
+        self.pass_count = record.pass_count
+        if record.point is None:
+            return
 
-    def undo(self):
-        """Reverts to the previous state."""
-        if not self.history:
-            raise InvalidMoveError("No moves to undo.")
-        
-        prev_board, prev_player, prev_captured, prev_pass = self.history.pop()
-        self.board = prev_board
-        self.current_player = prev_player
-        self.captured_stones = prev_captured
-        self.pass_count = prev_pass
-        self.game_over = False
-        self.winner = None
-        return True
-
-    def place_stone(self, row: int, col: int):
-        if self.game_over:
-            raise InvalidMoveError("Game is already over.")
-        
-        if not self.board.is_within_bounds(row, col):
-            raise InvalidMoveError("Position out of bounds.")
-
-        if self.board.get(row, col) is not None:
-            raise InvalidMoveError("Position already occupied.")
-
-        # Tentative move logic
-        # Clone the board to test the move
-        test_board = self.board.clone()
-        test_board.place_stone(row, col, self.current_player)
-
-        # Check captures
-        captured_any = False
-        stones_captured_count = 0
-        opponent = self.current_player.other()
-        neighbors = self._get_neighbors(row, col)
-        
-        for nr, nc in neighbors:
-            if test_board.get(nr, nc) == opponent:
-                group = self._get_group(nr, nc, test_board)
-                if self._count_liberties(group, test_board) == 0:
-                    stones_captured_count += len(group)
-                    self._remove_group(group, test_board)
-                    captured_any = True
-
-        # Check suicide
-        my_group = self._get_group(row, col, test_board)
-        if self._count_liberties(my_group, test_board) == 0:
-            raise InvalidMoveError("Suicide move is not allowed.")
-
-        # Check Ko
-        if len(self.history) > 0:
-            ko_state = self.history[-1][0]
-            if self._boards_equal(test_board, ko_state):
-                 raise InvalidMoveError("Ko rule violation.")
-
-        # If valid:
-        self.save_state()
-        self.board = test_board
-        self.captured_stones[self.current_player] += stones_captured_count
+        point = record.point
+        self.board.remove_stone(*point)
+        self._empty_point(point, record.player.value)
+        # The chain the stone joined may fall apart without it
+        chain = self._chains.pop(point)
+        if len(chain.stones) > 1:
+            rest = chain.stones - {point}
+            for s in rest:
+                del self._chains[s]
+            self._build_chains(rest, chain.color)
+        for n in self._neighbor_table[point]:
+            other = self._chains.get(n)
+            if other is not None:
+                other.liberties.add(point)
+
+        if record.captured:
+            color = record.player.other()
+            for s in record.captured:
+                self.board.place_stone(s[0], s[1], color)
+                self._fill_point(s, color.value)
+            for s in record.captured:
+                for n in self._neighbor_table[s]:
+                    other = self._chains.get(n)
+                    if other is not None:
+                        other.liberties.discard(s)
+            self._build_chains(set(record.captured), color)
+            self.captured_stones[record.player] -= len(record.captured)
+
+    def _play_point(self, point):
+        if point in self._chains:
+            return None
+        player = self.current_player
+        captured_chains, error = self._analyse_move(point, player)
+        if error is not None:
+            return None
+
+        captured = tuple(s for chain in captured_chains for s in chain.stones) if captured_chains else ()
+        record = MoveRecord(point, player, captured, self.pass_count)
+        self.save_state(record)
+        self.board.place_stone(point[0], point[1], player)
+        self._add_stone(point, player)
+        self._fill_point(point, player.value)
+        for chain in captured_chains:
+            self._capture_chain(chain)
+        if captured:
+            self.captured_stones[player] += len(captured)
         self.pass_count = 0 # Reset pass count on valid move
         self.switch_player()
+        self._record_position()
+        return record
+
+    def _analyse_move(self, point, player):
+        """Chains player would capture at the empty point, and why the move is illegal (or None).
+
+        Works from the chain table alone, without touching the board.
+        """
+        row, col = point
+        has_liberty = False
+        captured_chains = []
+        for n in self._neighbor_table[point]:
+            chain = self._chains.get(n)
+            if chain is None:
+                has_liberty = True
+            elif chain.color == player:
+                # The merged chain keeps any liberty other than this point
+                if len(chain.liberties) > 1:
+                    has_liberty = True
+            elif len(chain.liberties) == 1 and chain not in captured_chains:
+                captured_chains.append(chain)
+
+        if not has_liberty and not captured_chains:
+            return captured_chains, "Suicide move is not allowed."
+
+        # Check Ko on the hash of the resulting position
+        new_hash = self.board.zobrist_hash ^ self.board.stone_key(row, col, player)
+        for chain in captured_chains:
+            for r, c in chain.stones:
+                new_hash ^= self.board.stone_key(r, c, chain.color)
+        if self.repeats_position(new_hash, player.other()):
+            return captured_chains, "Ko rule violation."
+        return captured_chains, None
+
+    def _move_error(self, row, col):
+        if (row, col) in self._chains:
+            return "Position already occupied."
+        return self._analyse_move((row, col), self.current_player)[1]
+
+    def _generate_legal_moves(self):
+        chains = self._chains
+        player = self.current_player
+        analyse = self._analyse_move
+        return [p for p in self._neighbor_table
+                if p not in chains and analyse(p, player)[1] is None]
 
-    def _boards_equal(self, b1, b2):
-        # Optimization: just compare grids
-        return b1.grid == b2.grid
+    def _add_stone(self, point, color):
+        """Registers a newly placed stone, merging it with adjacent friendly chains."""
+        chain = Chain(color, {point}, set())
+        self._chains[point] = chain
+        for n in self._neighbor_table[point]:
+            other = self._chains.get(n)
+            if other is None:
+                chain.liberties.add(n)
+            else:
+                other.liberties.discard(point)
+        for n in self._neighbor_table[point]:
+            other = self._chains.get(n)
+            if other is not None and other.color == color and other is not chain:
+                chain = self._merge_chains(chain, other)
+        return chain
+
+    def _merge_chains(self, a, b):
+        # Relabel the smaller chain so merging costs O(min(|a|, |b|))
+        if len(a.stones) < len(b.stones):
+            a, b = b, a
+        for s in b.stones:
+            self._chains[s] = a
+        a.stones |= b.stones
+        a.liberties |= b.liberties
+        return a
+
+    def _capture_chain(self, chain):
+        """Removes a captured chain from the board and gives its points back as liberties."""
+        for s in chain.stones:
+            self.board.remove_stone(*s)
+            del self._chains[s]
+            self._empty_point(s, chain.color.value)
+        for s in chain.stones:
+            for n in self._neighbor_table[s]:
+                other = self._chains.get(n)
+                if other is not None:
+                    other.liberties.add(s)
+
+    def _rebuild_chains(self):
+        """Recomputes the chain table from scratch, e.g. after the board was replaced."""
+        self._chains = chains = {}
+        grid = self.board.grid
+        table = self._neighbor_table
+        for point in table:
+            color = grid[point[0]][point[1]]
+            if color is None or point in chains:
+                continue
+            chain = Chain(color, {point}, set())
+            chains[point] = chain
+            stack = [point]
+            while stack:
+                for n in table[stack.pop()]:
+                    v = grid[n[0]][n[1]]
+                    if v is None:
+                        chain.liberties.add(n)
+                    elif v == color and n not in chains:
+                        chain.stones.add(n)
+                        chains[n] = chain
+                        stack.append(n)
+
+    def _build_chains(self, stones, color):
+        """Adds chains for a set of same-coloured stones missing from the chain table.
+
+        Every friendly neighbour of these stones must be in the set itself, which holds
+        for the pieces of a chain that lost a stone and for a captured group put back.
+        """
+        chains = self._chains
+        table = self._neighbor_table
+        for start in stones:
+            if start in chains:
+                continue
+            chain = Chain(color, {start}, set())
+            chains[start] = chain
+            stack = [start]
+            while stack:
+                for n in table[stack.pop()]:
+                    if n in stones:
+                        if n not in chains:
+                            chain.stones.add(n)
+                            chains[n] = chain
+                            stack.append(n)
+                    elif n not in chains:
+                        chain.liberties.add(n)
+
+    def _rebuild_regions(self):
+        """Recomputes empty regions and area counts from the board."""
+        self._regions = regions = {}
+        self._stone_count = stones = [0, 0, 0]
+        self._territory = territory = [0, 0, 0]
+        grid = self.board.grid
+        table = self._neighbor_table
+        for point in table:
+            v = grid[point[0]][point[1]]
+            if v is not None:
+                stones[v.value] += 1
+                continue
+            if point in regions:
+                continue
+            region = Region({point}, [0, 0, 0])
+            regions[point] = region
+            stack = [point]
+            while stack:
+                for n in table[stack.pop()]:
+                    v = grid[n[0]][n[1]]
+                    if v is not None:
+                        region.edges[v.value] += 1
+                    elif n not in region.points:
+                        region.points.add(n)
+                        regions[n] = region
+                        stack.append(n)
+            territory[region.owner()] += len(region.points)
+
+    def _fill_point(self, point, color):
+        """Region bookkeeping for a stone of Player value color put on an empty point."""
+        if self._regions is None:
+            self._rebuild_regions() # the board already shows the change
+            return
+        # A point is empty exactly when it belongs to a region
+        regions = self._regions
+        region = regions.pop(point)
+        territory = self._territory
+        territory[region.owner()] -= len(region.points)
+        region.points.discard(point)
+        self._stone_count[color] += 1
+        starts = []
+        for n in self._neighbor_table[point]:
+            if n in regions:
+                starts.append(n)
+                region.edges[color] += 1
+            else:
+                region.edges[self.board.get(*n).value] -= 1
+        if len(starts) > 1 and not self._locally_connected(point):
+            for piece in self._split_region(region, starts):
+                territory[piece.owner()] += len(piece.points)
+        territory[region.owner()] += len(region.points)
+
+    def _locally_connected(self, point):
+        """Whether the empty neighbours of point are linked through the 8 points around it."""
+        regions = self._regions
+        empty = [p in regions for p in self._ring_table[point]]
+        if all(empty):
+            return True
+        # Walk the ring from an occupied point and count empty arcs holding a neighbour
+        k = empty.index(False)
+        arcs = 0
+        has_neighbor = False
+        for j in range(1, 9):
+            i = (k + j) % 8
+            if empty[i]:
+                if i % 2 == 0:
+                    has_neighbor = True
+            elif has_neighbor:
+                arcs += 1
+                has_neighbor = False
+        return arcs <= 1
+
+    def _split_region(self, region, starts):
+        """Carves off the parts of region that a new stone cut from the rest.
+
+        One search grows from each empty neighbour of the stone, a step each in turn.
+        Searches that meet are joined; a search that runs out of points first has
+        found a separate piece. The search left over keeps the region, so only the
+        pieces cut off (and as many steps elsewhere) are ever visited.
+        """
+        points = region.points
+        table = self._neighbor_table
+        owner = {}
+        active = []
+        for s in starts:
+            if s not in owner:
+                search = _Search(s)
+                owner[s] = search
+                active.append(search)
+        pieces = []
+        while len(active) > 1:
+            for search in list(active):
+                if search not in active:
+                    continue # joined another search this round
+                if not search.frontier:
+                    active.remove(search)
+                    pieces.append(search.members)
+                    if len(active) == 1:
+                        break
+                    continue
+                for n in table[search.frontier.popleft()]:
+                    if n not in points:
+                        continue
+                    other = owner.get(n)
+                    if other is None:
+                        owner[n] = search
+                        search.frontier.append(n)
+                        search.members.append(n)
+                    elif other is not search:
+                        # Relabel the smaller search into the larger one
+                        if len(other.members) > len(search.members):
+                            search, other = other, search
+                        for m in other.members:
+                            owner[m] = search
+                        search.members.extend(other.members)
+                        search.frontier.extend(other.frontier)
+                        active.remove(other)
+
+        new_regions = []
+        board = self.board
+        regions = self._regions
+        for members in pieces:
+            piece = Region(set(members), [0, 0, 0])
+            for p in members:
+                points.discard(p)
+                regions[p] = piece
+                for n in table[p]:
+                    if n not in regions:
+                        piece.edges[board.get(*n).value] += 1
+            region.edges[1] -= piece.edges[1]
+            region.edges[2] -= piece.edges[2]
+            new_regions.append(piece)
+        return new_regions
+
+    def _empty_point(self, point, color):
+        """Region bookkeeping for a stone of Player value color taken off the board."""
+        if self._regions is None:
+            self._rebuild_regions()
+            return
+        self._stone_count[color] -= 1
+        territory = self._territory
+        regions = self._regions
+        merged = Region({point}, [0, 0, 0])
+        neighbors = []
+        for n in self._neighbor_table[point]:
+            other = regions.get(n)
+            if other is None:
+                merged.edges[self.board.get(*n).value] += 1
+                continue
+            if other not in neighbors:
+                neighbors.append(other)
+                territory[other.owner()] -= len(other.points)
+            other.edges[color] -= 1 # n no longer touches the removed stone
+        if neighbors:
+            # Relabel into the largest neighbouring region
+            neighbors.sort(key=lambda r: len(r.points), reverse=True)
+            target = neighbors[0]
+            for other in neighbors[1:] + [merged]:
+                target.points |= other.points
+                target.edges[1] += other.edges[1]
+                target.edges[2] += other.edges[2]
+                for p in other.points:
+                    regions[p] = target
+            merged = target
+        else:
+            regions[point] = merged
+        territory[merged.owner()] += len(merged.points)
+
+    def score(self):
+        """(Black area, White area + komi) by area scoring, kept up to date move by move."""
+        if self._regions is None:
+            self._rebuild_regions()
+        black = self._stone_count[1] + self._territory[1]
+        white = self._stone_count[2] + self._territory[2]
+        return black, white + self.komi
+
+    def get_chain(self, row: int, col: int):
+        """Returns the Chain containing (row, col), or None for an empty point."""
+        return self._chains.get((row, col))
+
+    def _superko_key(self, board_hash, to_move):
+        if self.ko_rule == 'situational' and to_move == Player.WHITE:
+            return board_hash ^ ZOBRIST_WHITE_TO_MOVE
+        return board_hash
+
+    def repeats_position(self, board_hash, to_move):
+        """Whether a move producing board_hash (with to_move next) breaks the ko rule."""
+        if self._lazy_moves is not None and self.ko_rule != 'simple':
+            # Superko needs every earlier position of a loaded game
+            self._rebuild_history()
+        if self.ko_rule == 'simple':
+            # Same board as before the opponent's last action
+            return len(self._hash_history) >= 2 and board_hash == self._hash_history[-2]
+        return self._superko_key(board_hash, to_move) in self._seen_positions
+
+    def _record_position(self):
+        h = self.board.zobrist_hash
+        self._hash_history.append(h)
+        key = self._superko_key(h, self.current_player)
+        self._seen_positions[key] = self._seen_positions.get(key, 0) + 1
+
+    def _forget_position(self):
+        # Called before the undone action's player is restored
+        key = self._superko_key(self._hash_history.pop(), self.current_player)
+        if self._seen_positions[key] == 1:
+            del self._seen_positions[key]
+        else:
+            self._seen_positions[key] -= 1
 
     def _get_neighbors(self, r, c):
-        n = []
-        for dr, dc in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-            nr, nc = r + dr, c + dc
-            if self.board.is_within_bounds(nr, nc):
-                n.append((nr, nc))
-        return n
+        return list(self._neighbor_table[(r, c)])
 
     def _get_group(self, r, c, board):
         color = board.get(r, c)
@@ -131,30 +600,9 @@ class GoGame(BaseGame):
             board.remove_stone(r, c)
 
     def calculate_winner(self):
-        # Simple Area Scoring
-        # Score = Stones on board + Territory
-        black_score = 0
-        white_score = 0
-        
-        visited = set()
-
-        for r in range(self.board_size):
-            for c in range(self.board_size):
-                p = self.board.get(r, c)
-                if p == Player.BLACK:
-                    black_score += 1
-                elif p == Player.WHITE:
-                    white_score += 1
-                elif (r, c) not in visited:
-                    # Empty spot, check territory
-                    territory, owner = self._evaluate_territory(r, c, visited)
-                    if owner == Player.BLACK:
-                        black_score += len(territory)
-                    elif owner == Player.WHITE:
-                        white_score += len(territory)
-        
-        # Komi (6.5 usually, but let's stick to integers or simple logic)
-        # Prompt doesn't specify. I'll return the one with higher score.
+        # Area scoring: stones on board + empty regions bordered by one colour only.
+        # The counts are maintained incrementally, see score().
+        black_score, white_score = self.score()
         if black_score > white_score:
             return Player.BLACK
         elif white_score > black_score:
@@ -162,34 +610,11 @@ class GoGame(BaseGame):
         else:
             return None # Draw?
 
-    def _evaluate_territory(self, r, c, visited):
-        # BFS to find empty region and neighbors
-        region = set()
-        stack = [(r, c)]
-        visited.add((r, c))
-        region.add((r, c))
-        
-        owners = set() # Players touching this region
-        
-        while stack:
-            curr_r, curr_c = stack.pop()
-            
-            for dr, dc in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                nr, nc = curr_r + dr, curr_c + dc
-                if self.board.is_within_bounds(nr, nc):
-                    p = self.board.get(nr, nc)
-                    if p is None:
-                        if (nr, nc) not in visited:
-                            visited.add((nr, nc))
-                            region.add((nr, nc))
-                            stack.append((nr, nc))
-                    else:
-                        owners.add(p)
-        
-        if len(owners) == 1:
-            return region, list(owners)[0]
-        else:
-            return region, None # Neutral
-
     def check_winner(self):
         return self.winner
+
+# Group and liberty scans: _analyse_move checks a move's captures and liberties,
+# the others flood-fill chains or empty regions
+profiling.instrument(GoGame, ('pass_turn', '_analyse_move', '_build_chains', '_rebuild_chains',
+                              '_rebuild_regions', '_split_region', '_get_group', '_count_liberties',
+                              'score', 'calculate_winner'), 'go')
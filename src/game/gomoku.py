@@ -1,33 +1,75 @@
-from .base_game import BaseGame
+from .base_game import BaseGame, MoveRecord
+from .board import Board
+from .bitboard import GomokuBitboard
 from .player import Player
-from .exceptions import InvalidMoveError
+from . import profiling
 
 class GomokuGame(BaseGame):
-    def __init__(self, board_size: int):
-        super().__init__(board_size)
+    kind = 'gomoku'
+    _position_state = BaseGame._position_state + ('bitboard',)
 
-    def place_stone(self, row: int, col: int):
-        if self.game_over:
-            raise InvalidMoveError("Game is already over.")
+    def __init__(self, board_size: int, board_cls=Board, bitboard: bool = False):
+        super().__init__(board_size, board_cls)
+        # Optional bitboard mirror of the position: legality and win checks become a
+        # handful of integer operations instead of per-cell board lookups.
+        self.bitboard = GomokuBitboard(board_size) if bitboard else None
 
-        if not self.board.is_within_bounds(row, col):
-            raise InvalidMoveError("Position out of bounds.")
+    def new_game(self):
+        return GomokuGame(self.board_size, type(self.board), self.bitboard is not None)
 
-        if self.board.get(row, col) is not None:
-            raise InvalidMoveError("Position already occupied.")
+    def restore(self, stones, moves, last_captured=()):
+        super().restore(stones, moves, last_captured)
+        if self.bitboard is not None:
+            for r, c, p in stones:
+                self.bitboard.place(r, c, p.value)
 
-        self.save_state()
-        self.board.place_stone(row, col, self.current_player)
+    def _play_point(self, point):
+        row, col = point
+        bits = self.bitboard
+        if bits is not None:
+            if not bits.is_empty(row, col):
+                return None
+        elif self.board.get(row, col) is not None:
+            return None
+
+        player = self.current_player
+        record = MoveRecord(point, player, (), 0)
+        self.save_state(record)
+        self.board.place_stone(row, col, player)
         
-        winner = self.check_winner_at(row, col)
+        if bits is not None:
+            bits.place(row, col, player.value)
+            winner = player if bits.has_five(player.value) else None
+            full = bits.is_full()
+        else:
+            winner = self.check_winner_at(row, col)
+            full = winner is None and self.board.is_full()
         if winner:
             self.game_over = True
             self.winner = winner
-        elif self.board.is_full():
+        elif full:
             self.game_over = True
             self.winner = None # Draw
         else:
             self.switch_player()
+        return record
+
+    def _move_error(self, row, col):
+        if self.bitboard is not None:
+            return None if self.bitboard.is_empty(row, col) else "Position already occupied."
+        return super()._move_error(row, col)
+
+    def _generate_legal_moves(self):
+        if self.bitboard is not None:
+            return self.bitboard.empty_points()
+        get = self.board.get
+        n = self.board_size
+        return [(r, c) for r in range(n) for c in range(n) if get(r, c) is None]
+
+    def _revert(self, record):
+        super()._revert(record)
+        if self.bitboard is not None:
+            self.bitboard.remove(record.point[0], record.point[1], record.player.value)
 
     def check_winner(self):
         return self.winner
@@ -41,22 +83,10 @@ class GomokuGame(BaseGame):
         directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
         
         for dr, dc in directions:
-            count = 1
-            # Check forward
-            for i in range(1, 5):
-                r, c = row + dr * i, col + dc * i
-                if self.board.get(r, c) == player:
-                    count += 1
-                else:
-                    break
-            # Check backward
-            for i in range(1, 5):
-                r, c = row - dr * i, col - dc * i
-                if self.board.get(r, c) == player:
-                    count += 1
-                else:
-                    break
-            
+            # Count forward and backward from the stone
+            count = 1 + self.board.run_length(row, col, dr, dc) + self.board.run_length(row, col, -dr, -dc)
             if count >= 5:
                 return player
         return None
+
+profiling.instrument(GomokuGame, ('check_winner_at',), 'gomoku')
@@ -0,0 +1,183 @@
+"""Optional call counters and latency histograms for the game core and storage.
+
+Modules name their instrumented functions with instrument(). While profiling is
+off those functions are the plain originals, so it costs nothing; enable() swaps
+in timing wrappers and disable() puts the originals back. Each label, e.g.
+'go._get_group', gets a call count, total time and a power-of-two histogram of
+call times. enable(trace=True) also keeps every call as a Chrome trace event, so
+a dump() opens in chrome://tracing or Perfetto.
+
+Calls made through a reference taken before enable() (e.g. a module-level
+`from utils.storage import save_game`) are not counted. With several threads the
+counts may be slightly off.
+"""
+import os
+import sys
+import time
+from _thread import get_ident
+from collections import deque
+
+TRACE_LIMIT = 1_000_000 # Most recent calls kept as trace events
+
+_points = [] # (owner, name, label) of every instrumented function
+_originals = {} # (owner, name) -> original function, while enabled
+_stats = {} # label -> CallStats
+_trace = None # deque of (label, start ns, duration ns, thread) when tracing
+_epoch = 0
+_enabled = False
+
+class CallStats:
+    """Call count, total and maximum time, and histogram of one label, in ns.
+
+    buckets[i] counts calls that took from 2**(i-1) up to 2**i ns.
+    """
+    __slots__ = ('count', 'total', 'max', 'buckets')
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.buckets = [0] * 64
+
+    def add(self, ns):
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+        self.buckets[ns.bit_length()] += 1
+
+    def percentile(self, q):
+        """Upper bound in ns of the bucket holding the q-quantile call (within 2x)."""
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= target:
+                return min(1 << i, self.max)
+        return 0
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'total_ms': self.total / 1e6,
+            'mean_us': self.total / self.count / 1e3 if self.count else 0.0,
+            'p50_us': self.percentile(0.5) / 1e3,
+            'p99_us': self.percentile(0.99) / 1e3,
+            'max_us': self.max / 1e3,
+            'histogram_ns': {1 << i: n for i, n in enumerate(self.buckets) if n},
+        }
+
+def instrument(owner, names, prefix):
+    """Registers functions of owner (a class or module) as prefix.name labels."""
+    for name in names:
+        point = (owner, name, f"{prefix}.{name}")
+        _points.append(point)
+        if _enabled:
+            _wrap(*point)
+
+def _wrap(owner, name, label):
+    func = vars(owner)[name]
+    stats = _stats.setdefault(label, CallStats())
+    perf_counter_ns = time.perf_counter_ns
+
+    def timed(*args, **kwargs):
+        start = perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = perf_counter_ns() - start
+            stats.add(elapsed)
+            if _trace is not None:
+                _trace.append((label, start, elapsed, get_ident()))
+
+    timed.__name__ = func.__name__
+    timed.__qualname__ = func.__qualname__
+    timed.__doc__ = func.__doc__
+    timed.__wrapped__ = func
+    _originals[(owner, name)] = func
+    setattr(owner, name, timed)
+
+def enable(trace=False):
+    """Starts counting calls; with trace, also records each call as an event."""
+    global _enabled, _trace, _epoch
+    if trace and _trace is None:
+        _trace = deque(maxlen=TRACE_LIMIT)
+        _epoch = time.perf_counter_ns()
+    elif not trace:
+        _trace = None
+    if not _enabled:
+        _enabled = True
+        for point in _points:
+            _wrap(*point)
+
+def disable():
+    """Puts the original functions back; what was recorded is kept for reports."""
+    global _enabled
+    for (owner, name), func in _originals.items():
+        setattr(owner, name, func)
+    _originals.clear()
+    _enabled = False
+
+def enabled():
+    return _enabled
+
+def tracing():
+    return _trace is not None
+
+def reset():
+    """Drops everything recorded so far."""
+    for stats in _stats.values():
+        stats.clear()
+    if _trace is not None:
+        _trace.clear()
+
+def stats():
+    """{label: CallStats.to_dict()} for labels called at least once, slowest total first."""
+    called = sorted((s for s in _stats.items() if s[1].count), key=lambda s: -s[1].total)
+    return {label: s.to_dict() for label, s in called}
+
+def history_bytes(game):
+    """Approximate bytes a game holds for undo: move records, their capture lists,
+    moves of a loaded game not yet replayed, and Go's position history."""
+    records = game._history
+    total = sys.getsizeof(records)
+    for record in records:
+        total += sys.getsizeof(record) + sys.getsizeof(record.captured)
+    if game._lazy_moves is not None:
+        total += sys.getsizeof(game._lazy_moves)
+    for name in ('_hash_history', '_seen_positions'):
+        held = getattr(game, name, None)
+        if held is not None:
+            total += sys.getsizeof(held)
+    return total
+
+def report(game=None):
+    """Text table of stats(), plus the history size of game if given."""
+    lines = [f"{'call':<24} {'count':>8} {'total ms':>10} {'mean us':>9} "
+             f"{'p50 us':>9} {'p99 us':>9} {'max us':>9}"]
+    for label, s in stats().items():
+        lines.append(f"{label:<24} {s['count']:>8} {s['total_ms']:>10.2f} {s['mean_us']:>9.1f} "
+                     f"{s['p50_us']:>9.1f} {s['p99_us']:>9.1f} {s['max_us']:>9.1f}")
+    if game is not None:
+        lines.append(f"History: {len(game.move_list())} moves, {history_bytes(game):,} bytes")
+    return "\n".join(lines)
+
+def to_json(game=None):
+    """Stats as a dict that is also a Chrome trace file (traceEvents, empty unless tracing)."""
+    pid = os.getpid()
+    events = [{'name': label, 'cat': label.split('.', 1)[0], 'ph': 'X', 'pid': pid, 'tid': tid,
+               'ts': (start - _epoch) / 1e3, 'dur': ns / 1e3}
+              for label, start, ns, tid in (_trace or ())]
+    data = {'stats': stats(), 'traceEvents': events}
+    if game is not None:
+        data['history'] = {'moves': len(game.move_list()), 'bytes': history_bytes(game)}
+    return data
+
+def dump(path, game=None):
+    """Writes to_json() to path."""
+    import json
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(to_json(game), f)
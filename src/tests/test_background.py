@@ -0,0 +1,93 @@
+import unittest
+import time
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.gomoku import GomokuGame
+from game.go import GoGame
+from ai.gomoku_ai import GomokuAI
+from ai.engine import Engine
+from ai.background import BackgroundSearch
+from tests.test_gomoku_ai import play
+from tests.test_storage import random_go_game
+
+def wait(search, timeout=10.0):
+    end = time.perf_counter() + timeout
+    while search.running() and time.perf_counter() < end:
+        time.sleep(0.01)
+
+class FailingEngine(Engine):
+    def select_move(self, game, progress=None):
+        raise RuntimeError("broken")
+
+class TestBackgroundSearch(unittest.TestCase):
+    def setUp(self):
+        self.game = GomokuGame(15)
+        play(self.game, [(7, 7), (7, 8), (8, 8), (6, 6)])
+
+    def test_search_runs_on_a_copy(self):
+        search = BackgroundSearch(GomokuAI(time_limit=0.2))
+        search.start(self.game)
+        # The caller's game may change while the search runs
+        self.game.place_stone(0, 0)
+        self.game.undo()
+        wait(search)
+        self.assertTrue(search.done())
+        self.assertTrue(self.game.is_legal(*search.move))
+        self.assertIsNotNone(search.info)
+        self.assertEqual(len(self.game.move_list()), 4)
+        self.assertTrue(search.is_for(self.game))
+        self.game.place_stone(0, 0)
+        self.assertFalse(search.is_for(self.game))
+
+    def test_cancel_is_prompt(self):
+        search = BackgroundSearch(GomokuAI(time_limit=30))
+        search.start(self.game)
+        time.sleep(0.05)
+        start = time.perf_counter()
+        search.cancel()
+        self.assertLess(time.perf_counter() - start, 2.0)
+        self.assertFalse(search.running())
+        self.assertFalse(search.done())
+
+    def test_ponder_hit_and_miss(self):
+        search = BackgroundSearch(GomokuAI(time_limit=0.3))
+        self.assertFalse(search.ponder(self.game, (7, 7))) # occupied
+        self.assertTrue(search.ponder(self.game, (9, 9)))
+        self.assertFalse(search.done())
+        self.game.place_stone(9, 9)
+        self.assertTrue(search.adopt(self.game))
+        wait(search)
+        self.assertTrue(search.done())
+        self.assertTrue(self.game.is_legal(*search.move))
+
+        self.game.place_stone(*search.move)
+        search.ponder(self.game, (1, 1))
+        self.game.place_stone(2, 2)
+        self.assertFalse(search.adopt(self.game))
+        self.assertFalse(search.running())
+
+    def test_go_pass_prediction(self):
+        game = random_go_game(9, 20)
+        search = BackgroundSearch(FailingEngine())
+        self.assertTrue(search.ponder(game, None))
+        game.pass_turn()
+        self.assertTrue(search.adopt(game))
+        wait(search)
+        self.assertIsInstance(search.error, RuntimeError)
+
+    def test_copy_matches(self):
+        game = random_go_game(9, 60, komi=6.5)
+        copy = game.copy()
+        self.assertEqual(copy.board.grid, game.board.grid)
+        self.assertEqual(copy.captured_stones, game.captured_stones)
+        self.assertEqual(copy.pass_count, game.pass_count)
+        self.assertEqual(copy.legal_moves(), game.legal_moves())
+        self.assertEqual(copy.score(), game.score())
+        copy.undo()
+        self.assertNotEqual(copy.board.grid, game.board.grid)
+        self.assertIsInstance(GoGame(9).copy(), GoGame)
+
+if __name__ == '__main__':
+    unittest.main()
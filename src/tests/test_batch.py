@@ -0,0 +1,93 @@
+import unittest
+import random
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from game.go import GoGame
+from game.gomoku import GomokuGame
+from game.player import Player
+from game.exceptions import InvalidMoveError
+
+def board_codes(game):
+    n = game.board_size
+    return [[(game.board.get(r, c).value if game.board.get(r, c) else 0) for c in range(n)] for r in range(n)]
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestBatchGomoku(unittest.TestCase):
+    def test_matches_gomoku_game(self):
+        from game.batch import BatchGomoku
+        rng = random.Random(21)
+        batch = BatchGomoku(16, 15)
+        games = [GomokuGame(15) for _ in range(16)]
+        while not batch.done.all():
+            mask = batch.legal_mask()
+            moves = []
+            for b, game in enumerate(games):
+                self.assertEqual(bool(batch.done[b]), game.is_game_over())
+                if game.is_game_over():
+                    moves.append(-1)
+                    continue
+                legal = [i for i in range(225) if mask[b].flat[i]]
+                self.assertEqual(len(legal), 225 - len(game.history))
+                m = rng.choice(legal)
+                game.place_stone(*divmod(m, 15))
+                moves.append(m)
+            batch.play(moves)
+        for b, game in enumerate(games):
+            self.assertEqual(batch.boards[b].tolist(), board_codes(game))
+            w = game.check_winner()
+            self.assertEqual(int(batch.winner[b]), w.value if w else 0)
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestBatchGo(unittest.TestCase):
+    def test_matches_go_game(self):
+        from game.batch import BatchGo, PASS
+        rng = random.Random(22)
+        size = 9
+        batch = BatchGo(8, size)
+        games = [GoGame(size) for _ in range(8)]
+        for _ in range(160):
+            mask = batch.legal_mask()
+            moves = []
+            for b, game in enumerate(games):
+                if game.is_game_over():
+                    moves.append(PASS)
+                    continue
+                # Legal mask must agree with GoGame on every point
+                legal = []
+                for i in range(size * size):
+                    ok = True
+                    try:
+                        game.place_stone(*divmod(i, size))
+                        game.undo()
+                    except InvalidMoveError:
+                        ok = False
+                    self.assertEqual(bool(mask[b].flat[i]), ok, (b, divmod(i, size)))
+                    if ok:
+                        legal.append(i)
+                if not legal or rng.random() < 0.03:
+                    game.pass_turn()
+                    moves.append(PASS)
+                else:
+                    m = rng.choice(legal)
+                    game.place_stone(*divmod(m, size))
+                    moves.append(m)
+            batch.play(moves)
+            for b, game in enumerate(games):
+                self.assertEqual(batch.boards[b].tolist(), board_codes(game))
+                self.assertEqual(int(batch.to_move[b]), game.current_player.value)
+                self.assertEqual(int(batch.captures[b, 1]), game.captured_stones[Player.BLACK])
+                self.assertEqual(int(batch.captures[b, 2]), game.captured_stones[Player.WHITE])
+                self.assertEqual(bool(batch.done[b]), game.is_game_over())
+                if game.is_game_over():
+                    w = game.check_winner()
+                    self.assertEqual(int(batch.winner[b]), w.value if w else 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_core import go_sequence, gomoku_sequence, replay, compare
+from benchmarks import bench_startup
+from game.go import GoGame
+from game.gomoku import GomokuGame
+
+class TestBenchCore(unittest.TestCase):
+    def test_sequences_are_fixed_and_legal(self):
+        self.assertEqual(go_sequence(9), go_sequence(9))
+        game = replay(GoGame(9), go_sequence(9))
+        self.assertEqual(len(game.history), len(go_sequence(9)))
+        g = replay(GomokuGame(9), gomoku_sequence(9))
+        self.assertFalse(g.is_game_over())
+
+    def test_compare_flags_regressions(self):
+        baseline = {"go.place_stone/9": 1000.0, "go.memory_bytes/9": 1000, "gone/9": 5.0}
+        ok = {"go.place_stone/9": 850.0, "go.memory_bytes/9": 1150}
+        self.assertEqual(compare(ok, baseline, 0.2), [])
+        bad = {"go.place_stone/9": 700.0, "go.memory_bytes/9": 1300}
+        names = [name for name, _, _ in compare(bad, baseline, 0.2)]
+        self.assertEqual(sorted(names), ["go.memory_bytes/9", "go.place_stone/9"])
+
+class TestStartup(unittest.TestCase):
+    def test_lazy_imports(self):
+        # Timings are only compared with each other, so a busy machine cannot fail this
+        results = bench_startup.run(['cli', 'cli.go', 'eager'])
+        for name in ('cli', 'cli.go'):
+            ms, _, loaded, _ = results[name]
+            self.assertEqual(loaded, [], name)
+            self.assertLess(ms, results['eager'][0], name)
+
+    def test_failures_reports_budget_and_imports(self):
+        results = {'cli': (45.0, 30, ['game.go'], []), 'gtp': (10.0, 40, [], []),
+                   'eager': (90.0, None, [], [])}
+        self.assertEqual(bench_startup.failures(results),
+                         ["cli: 45.0 ms is over the 30 ms budget", "cli: imports game.go"])
+
+if __name__ == '__main__':
+    unittest.main()
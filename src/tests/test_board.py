@@ -0,0 +1,62 @@
+import unittest
+import random
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.board import Board, FlatBoard
+from game.player import Player
+from game.exceptions import InvalidBoardSizeError
+
+class TestFlatBoard(unittest.TestCase):
+    def test_invalid_size(self):
+        with self.assertRaises(InvalidBoardSizeError):
+            FlatBoard(7)
+
+    def test_sentinel_border(self):
+        b = FlatBoard(9)
+        self.assertIsNone(b.get(-1, 0))
+        self.assertIsNone(b.get(9, 9))
+        b.place_stone(9, 0, Player.BLACK) # ignored like Board
+        self.assertEqual(b.empty_count, 81)
+        i = b.index(0, 0)
+        self.assertEqual(b.point(i), (0, 0))
+        self.assertEqual([b.cells[i + off] for off in b.offsets].count(0), 2)
+
+    def test_is_full(self):
+        b = FlatBoard(8)
+        for r in range(8):
+            for c in range(8):
+                self.assertFalse(b.is_full())
+                b.place_stone(r, c, Player.WHITE)
+        self.assertTrue(b.is_full())
+        b.remove_stone(3, 3)
+        self.assertFalse(b.is_full())
+
+    def test_matches_list_board(self):
+        rng = random.Random(7)
+        for size in (9, 13, 19):
+            ref = Board(size)
+            flat = FlatBoard(size)
+            for _ in range(2000):
+                r, c = rng.randrange(size), rng.randrange(size)
+                if rng.random() < 0.3:
+                    ref.remove_stone(r, c)
+                    flat.remove_stone(r, c)
+                else:
+                    p = rng.choice([Player.BLACK, Player.WHITE])
+                    ref.place_stone(r, c, p)
+                    flat.place_stone(r, c, p)
+                for dr, dc in [(0, 1), (1, 0), (1, 1), (1, -1), (-1, 1)]:
+                    if ref.get(r, c) is not None:
+                        self.assertEqual(flat.run_length(r, c, dr, dc), ref.run_length(r, c, dr, dc))
+            self.assertEqual(flat.grid, ref.grid)
+            self.assertEqual(flat.zobrist_hash, ref.zobrist_hash)
+            self.assertEqual(flat.is_full(), ref.is_full())
+            self.assertEqual(str(flat), str(ref))
+            copy = flat.clone()
+            copy.remove_stone(0, 0)
+            self.assertEqual(flat.grid, ref.grid)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.go import GoGame
+from game.gomoku import GomokuGame
+from game.player import Player
+from utils.book import BookBuilder, OpeningBook, ingest_file
+from utils.sgf import write_games
+from ai.gomoku_ai import GomokuAI
+from tests.test_storage import random_go_game
+
+def finished_gomoku(moves):
+    game = GomokuGame(15)
+    for m in moves:
+        game.place_stone(*m)
+    return game
+
+BLACK_WINS = [(7, 7), (0, 0), (7, 8), (0, 1), (7, 9), (0, 2), (7, 10), (0, 3), (7, 11)]
+WHITE_WINS = [(7, 7), (8, 8), (0, 0), (8, 9), (0, 1), (8, 10), (0, 2), (8, 11), (14, 14), (8, 12)]
+
+class TestOpeningBook(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'test.book')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, games, **kwargs):
+        with BookBuilder(self.path, **kwargs) as builder:
+            for g in games:
+                builder.add_game(g)
+        return OpeningBook(self.path)
+
+    def test_counts_and_scores(self):
+        book = self.build([finished_gomoku(BLACK_WINS), finished_gomoku(BLACK_WINS),
+                           finished_gomoku(WHITE_WINS)])
+        first = book.moves(GomokuGame(15))
+        self.assertEqual(first, [((7, 7), 3, 2 / 3)])
+        after = finished_gomoku([(7, 7)])
+        replies = {e.move: (e.games, e.score) for e in book.moves(after)}
+        self.assertEqual(replies, {(0, 0): (2, 0.0), (8, 8): (1, 1.0)})
+        self.assertEqual(book.moves(GomokuGame(9)), [])
+        self.assertEqual(book.moves(GoGame(15)), [])
+        book.close()
+
+    def test_spilled_runs_match_in_memory_build(self):
+        games = [random_go_game(9, 40, seed=i) for i in range(20)]
+        self.build(games).close()
+        with open(self.path, 'rb') as f:
+            expected = f.read()
+        self.build(games, run_size=50).close()
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), expected)
+
+    def test_max_moves_and_mixed_sizes(self):
+        with BookBuilder(self.path, max_moves=2) as builder:
+            self.assertTrue(builder.add_game(finished_gomoku(BLACK_WINS)))
+            self.assertFalse(builder.add_game(GomokuGame(9)))
+        book = OpeningBook(self.path)
+        self.assertEqual(len(book), 2)
+        book.close()
+
+    def test_bad_board_size_rejects_only_its_record(self):
+        sgf = os.path.join(self.tmp.name, 'games.sgf')
+        with open(sgf, 'w') as f:
+            f.write("(;GM[4]SZ[5];B[aa])(;GM[1]SZ[21];B[aa])")
+            write_games(f, [finished_gomoku(BLACK_WINS)])
+        with BookBuilder(self.path) as builder:
+            self.assertEqual(ingest_file(builder, sgf), (1, 2))
+
+    def test_ingest_sgf_and_engine_uses_book(self):
+        sgf = os.path.join(self.tmp.name, 'games.sgf')
+        with open(sgf, 'w') as f:
+            write_games(f, [finished_gomoku(BLACK_WINS), finished_gomoku(BLACK_WINS)])
+            f.write("(;GM[4]SZ[15];B[hh];B[ii])")
+        with BookBuilder(self.path) as builder:
+            self.assertEqual(ingest_file(builder, sgf), (2, 1))
+        ai = GomokuAI(time_limit=0.05)
+        ai.book = OpeningBook(self.path)
+        game = finished_gomoku([(7, 7)])
+        self.assertEqual(ai.select_move(game), (0, 0))
+        self.assertEqual(ai.info.nodes, 0)
+        self.assertEqual(game.move_list(), [(7, 7)])
+        ai.book.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import io
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ui.cli import CLI
+
+SCRIPT = """# capture in the corner
+start go 9 6.5
+place 1 2
+place 1 1
+place 2 1
+place 1 2   # occupied
+place 9 9
+pass
+"""
+
+class TestScriptMode(unittest.TestCase):
+    def run_script(self, text, **kwargs):
+        out = io.StringIO()
+        summary = CLI().run_script(io.StringIO(text), out, **kwargs)
+        return summary, out.getvalue()
+
+    def test_summary(self):
+        summary, output = self.run_script(SCRIPT)
+        self.assertEqual(summary['commands'], 7)
+        self.assertEqual(summary['errors'], [{'line': 6, 'message': "Invalid move: Position already occupied."}])
+        self.assertEqual(summary['game'], 'go')
+        self.assertEqual(summary['moves'], 5)
+        self.assertEqual(summary['captures'], {'black': 1, 'white': 0})
+        self.assertEqual(summary['to_move'], 'white')
+        self.assertEqual(summary['score']['komi'], 6.5)
+        self.assertFalse(summary['over'])
+
+    def test_board_printing(self):
+        _, end = self.run_script(SCRIPT)
+        self.assertEqual(end.count("1  . X"), 1)
+        _, always = self.run_script(SCRIPT, board='always')
+        self.assertGreater(always.count("Turn:"), 3)
+        _, none = self.run_script(SCRIPT + "board\n", board='none')
+        self.assertEqual(none.count("1  . X"), 1)
+        _, quiet = self.run_script(SCRIPT, quiet=True)
+        self.assertEqual(quiet, "")
+
+    def test_exit_and_game_over(self):
+        summary, output = self.run_script("start gomoku 15\nplace 1 1\nexit\nplace 2 2\n", board='none')
+        self.assertEqual(summary['commands'], 3)
+        self.assertEqual(summary['moves'], 1)
+        moves = "start gomoku 15\n" + "".join(f"place 8 {c}\nplace 9 {c}\n" for c in range(1, 5)) + "place 8 5\n"
+        summary, output = self.run_script(moves)
+        self.assertTrue(summary['over'])
+        self.assertEqual(summary['winner'], 'black')
+        self.assertIn("Game Over! Winner: Black", output)
+
+    def test_bad_ai_time_is_not_kept(self):
+        cli = CLI()
+        summary = cli.run_script(io.StringIO("ai white -1\nai white nan\nai white inf\nai white x\n"),
+                                 io.StringIO(), board='none')
+        self.assertEqual(len(summary['errors']), 4)
+        self.assertEqual(cli.ai_time, 1.0)
+        self.assertIsNone(cli.ai_player)
+        cli.run_script(io.StringIO("ai white 0.5\nai off\n"), io.StringIO(), board='none')
+        self.assertEqual(cli.ai_time, 0.5)
+
+    def test_bad_komi(self):
+        summary, _ = self.run_script("start go 9 nan\nstart go 9 inf\nstart gomoku 9 6.5\n", board='none')
+        self.assertEqual([e['message'] for e in summary['errors']],
+                         ["Komi must be a finite number."] * 2 + ["Gomoku has no komi."])
+        self.assertIsNone(summary['game'])
+
+    def test_save_and_load_in_script(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'g.sgf')
+            summary, _ = self.run_script(SCRIPT + f"save {path}\n")
+            self.assertEqual(len(summary['errors']), 1)
+            loaded, _ = self.run_script(f"load {path}\nload {os.path.join(tmp, 'missing')}\n")
+            self.assertEqual(loaded['hash'], summary['hash'])
+            self.assertEqual(len(loaded['errors']), 1)
+
+    def test_review_commands(self):
+        summary, output = self.run_script(SCRIPT + "goto 2\nback\nforward 3\nback 9\ngoto 6\ngoto x\n", board='none')
+        self.assertIn("Move 2 of 5.", output)
+        self.assertIn("Move 1 of 5.", output)
+        self.assertIn("Move 4 of 5.", output)
+        self.assertIn("Move 0 of 5.", output)
+        self.assertEqual(summary['moves'], 0) # still at the start after the failed gotos
+        self.assertEqual([e['line'] for e in summary['errors']], [6, 13, 14])
+        # A new move from a reviewed position replaces the rest of the game
+        summary, output = self.run_script(SCRIPT + "back 4\nplace 5 5\nforward\n", board='none')
+        self.assertEqual(summary['moves'], 2)
+        self.assertIn("Move 2 of 2.", output)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,14 @@
 import unittest
+import random
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from game.go import GoGame
+from game.board import FlatBoard
 from game.player import Player
 from game.exceptions import InvalidMoveError
+from game import base_game
 
 class TestGoGame(unittest.TestCase):
     def setUp(self):
@@ -100,5 +103,458 @@ class TestGoGame(unittest.TestCase):
         # W: 2,4 -> W: 2,2 (Capture B at 2,3?)
         pass
 
+def reference_move(game, board, player, row, col):
+    """Flood-fill implementation of a Go move (the original algorithm).
+
+    Returns (new_board, captured_count) or None if the move is suicide.
+    """
+    test_board = board.clone()
+    test_board.place_stone(row, col, player)
+    captured = 0
+    for nr, nc in game._get_neighbors(row, col):
+        if test_board.get(nr, nc) == player.other():
+            group = game._get_group(nr, nc, test_board)
+            if game._count_liberties(group, test_board) == 0:
+                captured += len(group)
+                game._remove_group(group, test_board)
+    if game._count_liberties(game._get_group(row, col, test_board), test_board) == 0:
+        return None
+    return test_board, captured
+
+
+class TestGoChains(unittest.TestCase):
+    def assert_chains_match_flood_fill(self, game):
+        board = game.board
+        for r in range(game.board_size):
+            for c in range(game.board_size):
+                chain = game.get_chain(r, c)
+                if board.get(r, c) is None:
+                    self.assertIsNone(chain)
+                    continue
+                group = game._get_group(r, c, board)
+                self.assertEqual(chain.stones, group)
+                self.assertEqual(chain.color, board.get(r, c))
+                self.assertEqual(len(chain.liberties), game._count_liberties(group, board))
+
+    def test_merge_and_capture(self):
+        game = GoGame(9)
+        # Black builds a two-stone chain in the corner, White surrounds it
+        for move in [(0, 0), (0, 2), (0, 1), (1, 1), (5, 5), (1, 0)]:
+            game.place_stone(*move)
+        self.assertIsNone(game.get_chain(0, 0))
+        self.assertIsNone(game.get_chain(0, 1))
+        self.assertEqual(game.captured_stones[Player.WHITE], 2)
+        self.assertEqual(len(game.get_chain(1, 0).liberties), 5)
+        self.assert_chains_match_flood_fill(game)
+
+    def test_random_games_match_flood_fill(self):
+        rng = random.Random(1234)
+        for _ in range(10):
+            game = GoGame(9)
+            for _ in range(150):
+                empties = [(r, c) for r in range(9) for c in range(9) if game.board.get(r, c) is None]
+                row, col = rng.choice(empties)
+                player = game.current_player
+                expected = reference_move(game, game.board, player, row, col)
+                before = game.captured_stones[player]
+                try:
+                    game.place_stone(row, col)
+                except InvalidMoveError as e:
+                    if expected is not None:
+                        # Only ko can reject a move the flood fill accepts
+                        self.assertIn("Ko", str(e))
+                    continue
+                self.assertIsNotNone(expected)
+                self.assertEqual(game.board.grid, expected[0].grid)
+                self.assertEqual(game.captured_stones[player] - before, expected[1])
+                self.assert_chains_match_flood_fill(game)
+
+    def test_undo_restores_chains(self):
+        game = GoGame(9)
+        for move in [(0, 1), (0, 0), (1, 1), (4, 4), (1, 0)]:
+            game.place_stone(*move)
+        game.undo()
+        self.assertEqual(game.board.get(0, 0), Player.WHITE)
+        self.assert_chains_match_flood_fill(game)
+
+    def test_undo_random_games(self):
+        rng = random.Random(99)
+        game = GoGame(9)
+        snapshots = []
+        for _ in range(200):
+            state = ([row[:] for row in game.board.grid], game.current_player,
+                     dict(game.captured_stones), game.pass_count, game.board.zobrist_hash)
+            if rng.random() < 0.05:
+                game.pass_turn()
+                if game.is_game_over():
+                    game.undo()
+                    continue
+            else:
+                empties = [(r, c) for r in range(9) for c in range(9) if game.board.get(r, c) is None]
+                try:
+                    game.place_stone(*rng.choice(empties))
+                except InvalidMoveError:
+                    continue
+            snapshots.append(state)
+
+        # History holds move records, not board copies
+        self.assertFalse(any(hasattr(rec, 'grid') for rec in game.history))
+        while snapshots:
+            game.undo()
+            grid, player, captures, passes, h = snapshots.pop()
+            self.assertEqual(game.board.grid, grid)
+            self.assertEqual(game.current_player, player)
+            self.assertEqual(game.captured_stones, captures)
+            self.assertEqual(game.pass_count, passes)
+            self.assertEqual(game.board.zobrist_hash, h)
+            self.assert_chains_match_flood_fill(game)
+        self.assertEqual(game.history, [])
+
+
+KO_SETUP_BLACK = [(0, 1), (1, 0), (2, 1), (4, 1), (5, 0), (6, 1)]
+KO_SETUP_WHITE = [(0, 2), (1, 3), (2, 2), (1, 1), (4, 2), (5, 3), (6, 2), (5, 1)]
+
+
+def setup_double_ko(game):
+    """Two independent kos; Black can take at (1,2) and (5,2)."""
+    for i, w in enumerate(KO_SETUP_WHITE):
+        if i < len(KO_SETUP_BLACK):
+            game.place_stone(*KO_SETUP_BLACK[i])
+        else:
+            game.pass_turn()
+        game.place_stone(*w)
+
+
+class TestGoKo(unittest.TestCase):
+    def test_simple_ko(self):
+        game = GoGame(9)
+        setup_double_ko(game)
+        game.place_stone(1, 2) # B takes the ko
+        with self.assertRaises(InvalidMoveError):
+            game.place_stone(1, 1) # W cannot retake at once
+        game.place_stone(8, 8) # W ko threat elsewhere
+        game.place_stone(7, 7) # B answers
+        game.place_stone(1, 1) # Now W may retake
+        self.assertIsNone(game.board.get(1, 2))
+
+    def run_superko_cycle(self, game):
+        setup_double_ko(game)
+        game.place_stone(1, 2) # B takes ko 1
+        game.pass_turn()
+        game.place_stone(5, 2) # B takes ko 2
+        game.place_stone(1, 1) # W retakes ko 1
+        game.pass_turn()
+        game.place_stone(5, 1) # W retakes ko 2 -> whole board repeats
+
+    def test_simple_rule_allows_long_cycle(self):
+        game = GoGame(9)
+        self.run_superko_cycle(game)
+        self.assertEqual(game.board.get(5, 1), Player.WHITE)
+
+    def test_positional_superko(self):
+        with self.assertRaises(InvalidMoveError):
+            self.run_superko_cycle(GoGame(9, ko_rule='positional'))
+
+    def test_situational_superko(self):
+        with self.assertRaises(InvalidMoveError):
+            self.run_superko_cycle(GoGame(9, ko_rule='situational'))
+
+    def test_undo_forgets_positions(self):
+        game = GoGame(9, ko_rule='positional')
+        setup_double_ko(game)
+        game.place_stone(1, 2)
+        game.undo()
+        game.place_stone(1, 2) # same move is legal again after undo
+        self.assertEqual(game.captured_stones[Player.BLACK], 1)
+
+    def test_unknown_rule(self):
+        with self.assertRaises(ValueError):
+            GoGame(9, ko_rule='japanese')
+
+    def test_hash_matches_recomputed(self):
+        game = GoGame(9)
+        self.run_superko_cycle(game)
+        board = game.board
+        expected = 0
+        for r in range(9):
+            for c in range(9):
+                p = board.get(r, c)
+                if p is not None:
+                    expected ^= board.stone_key(r, c, p)
+        self.assertEqual(board.zobrist_hash, expected)
+        self.assertEqual(board.clone().zobrist_hash, expected)
+        self.assertNotEqual(game.position_hash(), GoGame(9).position_hash())
+
+
+class TestGoFlatBoard(unittest.TestCase):
+    def test_random_games_match_list_board(self):
+        rng = random.Random(5)
+        ref = GoGame(13)
+        flat = GoGame(13, board_cls=FlatBoard)
+        for _ in range(400):
+            r, c = rng.randrange(13), rng.randrange(13)
+            results = []
+            for game in (ref, flat):
+                try:
+                    game.place_stone(r, c)
+                    results.append(None)
+                except InvalidMoveError as e:
+                    results.append(str(e))
+            self.assertEqual(results[0], results[1])
+            if rng.random() < 0.1:
+                ref.undo()
+                flat.undo()
+            self.assertEqual(flat.board.grid, ref.board.grid)
+            self.assertEqual(flat.captured_stones, ref.captured_stones)
+            self.assertEqual(flat.position_hash(), ref.position_hash())
+
+
+def reference_area(game):
+    """Black and White area by flood-filling every empty region from scratch."""
+    board = game.board
+    size = game.board_size
+    area = {Player.BLACK: 0, Player.WHITE: 0}
+    seen = set()
+    for r in range(size):
+        for c in range(size):
+            p = board.get(r, c)
+            if p is not None:
+                area[p] += 1
+            elif (r, c) not in seen:
+                region, border = [(r, c)], set()
+                seen.add((r, c))
+                for pr, pc in region:
+                    for nr, nc in ((pr+1, pc), (pr-1, pc), (pr, pc+1), (pr, pc-1)):
+                        if 0 <= nr < size and 0 <= nc < size:
+                            q = board.get(nr, nc)
+                            if q is not None:
+                                border.add(q)
+                            elif (nr, nc) not in seen:
+                                seen.add((nr, nc))
+                                region.append((nr, nc))
+                if len(border) == 1:
+                    area[border.pop()] += len(region)
+    return area[Player.BLACK], area[Player.WHITE]
+
+
+class TestGoScore(unittest.TestCase):
+    def test_empty_board_and_komi(self):
+        game = GoGame(9, komi=6.5)
+        self.assertEqual(game.score(), (0, 6.5))
+        game.place_stone(4, 4)
+        self.assertEqual(game.score(), (81, 6.5))
+        game.place_stone(2, 2)
+        self.assertEqual(game.score(), (1, 7.5))
+
+    def test_komi_decides_winner(self):
+        game = GoGame(9, komi=0.5)
+        game.place_stone(0, 0)
+        game.pass_turn()
+        game.pass_turn()
+        self.assertEqual(game.check_winner(), Player.BLACK)
+        game = GoGame(9, komi=81.5)
+        game.place_stone(0, 0)
+        game.pass_turn()
+        game.pass_turn()
+        self.assertEqual(game.check_winner(), Player.WHITE)
+
+    def test_random_games_match_flood_fill(self):
+        rng = random.Random(11)
+        for size in (8, 9):
+            game = GoGame(size)
+            for _ in range(300):
+                if game.history and rng.random() < 0.15:
+                    game.undo()
+                else:
+                    try:
+                        game.place_stone(rng.randrange(size), rng.randrange(size))
+                    except InvalidMoveError:
+                        continue
+                self.assertEqual(game.score(), reference_area(game))
+
+
+def brute_force_legal(game):
+    legal = []
+    for r in range(game.board_size):
+        for c in range(game.board_size):
+            try:
+                game.place_stone(r, c)
+            except InvalidMoveError:
+                continue
+            game.undo()
+            legal.append((r, c))
+    return legal
+
+
+class TestGoLegalMoves(unittest.TestCase):
+    def test_random_games_match_place_stone(self):
+        rng = random.Random(3)
+        for rule in ('simple', 'positional'):
+            game = GoGame(9, ko_rule=rule)
+            for _ in range(120):
+                if rng.random() < 0.3:
+                    # Probe single points before the cache exists
+                    for _ in range(5):
+                        r, c = rng.randrange(9), rng.randrange(9)
+                        self.assertEqual(game.is_legal(r, c), (r, c) in brute_force_legal(game))
+                legal = game.legal_moves()
+                self.assertEqual(legal, brute_force_legal(game))
+                if game.history and rng.random() < 0.1:
+                    game.undo()
+                elif legal:
+                    game.place_stone(*rng.choice(legal))
+                else:
+                    game.pass_turn()
+
+    def test_ko_and_suicide(self):
+        game = GoGame(9)
+        setup_double_ko(game)
+        game.place_stone(1, 2) # B takes the ko
+        self.assertFalse(game.is_legal(1, 1))
+        self.assertNotIn((1, 1), game.legal_moves())
+        game.pass_turn()
+        game.pass_turn()
+        self.assertEqual(game.legal_moves(), [])
+        game.undo()
+        self.assertTrue(game.is_legal(5, 5))
+        self.assertFalse(game.is_legal(1, 2))
+
+
+class TestGoPlayUnplay(unittest.TestCase):
+    def snapshot(self, game):
+        chains = {p: (c.color, frozenset(c.stones), frozenset(c.liberties)) for p, c in game._chains.items()}
+        return (game.board.grid, game.position_hash(), game.current_player, game.pass_count,
+                dict(game.captured_stones), chains, game.score(), list(game._hash_history))
+
+    def test_unplay_restores_everything(self):
+        rng = random.Random(8)
+        game = GoGame(9, ko_rule='positional')
+        for _ in range(100):
+            before = self.snapshot(game)
+            for move in game.legal_moves() + [None]:
+                token = game.play(move)
+                self.assertIsNotNone(token)
+                game.unplay(token)
+                self.assertEqual(self.snapshot(game), before)
+            legal = game.legal_moves()
+            game.play(rng.choice(legal) if legal else None)
+
+    def test_illegal_moves_return_none(self):
+        game = GoGame(9)
+        setup_double_ko(game)
+        game.place_stone(1, 2)
+        before = game.position_hash()
+        for move in [(1, 1), (1, 2), (9, 0), (-1, 3)]:
+            self.assertIsNone(game.play(move))
+        self.assertEqual(game.position_hash(), before)
+        game.play(None)
+        game.play(None)
+        self.assertIsNone(game.play((5, 5)))
+        self.assertIsNone(game.play(None))
+
+    def test_tokens_are_history(self):
+        game = GoGame(9)
+        first = game.play((2, 2))
+        second = game.play((3, 3))
+        self.assertIs(game.history[-1], second)
+        with self.assertRaises(InvalidMoveError):
+            game.unplay(first)
+        game.undo()
+        game.unplay(first)
+        self.assertEqual(game.history, [])
+
+class TestGoReview(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(21)
+        self.game = GoGame(13, ko_rule='positional')
+        for _ in range(150):
+            legal = self.game.legal_moves()
+            self.game.play(rng.choice(legal) if rng.random() > 0.03 and legal else None)
+        self.line = self.game.move_list()
+
+    def snapshot(self, game):
+        return ([row[:] for row in game.board.grid], game.position_hash(), game.current_player,
+                game.pass_count, dict(game.captured_stones), game.score(), game.legal_moves(),
+                game.move_list())
+
+    def test_goto_matches_replay(self):
+        reference = []
+        replay = GoGame(13, ko_rule='positional')
+        reference.append(self.snapshot(replay))
+        for move in self.line:
+            replay.play(move)
+            reference.append(self.snapshot(replay))
+        rng = random.Random(5)
+        for _ in range(200):
+            n = rng.randrange(len(self.line) + 1)
+            self.game.goto(n)
+            self.assertEqual(self.snapshot(self.game), reference[n])
+        self.assertLessEqual(len(self.game._checkpoints), base_game.MAX_CHECKPOINTS)
+        # Undo still works from a position reached through a checkpoint
+        self.game.goto(100)
+        self.game.undo()
+        self.assertEqual(self.snapshot(self.game), reference[99])
+
+    def test_jumps_are_bounded(self):
+        game = self.game
+        counts = {'play': 0, 'unplay': 0, 'restore': 0}
+        def counted(name, func):
+            def call(*args):
+                counts[name] += 1
+                return func(*args)
+            return call
+        game.play = counted('play', game.play)
+        game.unplay = counted('unplay', game.unplay)
+        game._restore_checkpoint = counted('restore', game._restore_checkpoint)
+        limit = base_game._RESTORE_COST + game._interval
+        rng = random.Random(6)
+        # From the very first jump: checkpoints are made when review starts
+        for _ in range(100):
+            for name in counts:
+                counts[name] = 0
+            game.goto(rng.randrange(len(self.line) + 1))
+            self.assertLessEqual(counts['restore'], 1)
+            self.assertLessEqual(counts['play'] + counts['unplay'], limit)
+        self.assertEqual(sorted(game._checkpoints), list(range(game._interval, len(self.line) + 1, game._interval)))
+
+    def test_restore_keeps_settings(self):
+        # Everything a checkpoint restore leaves alone is a setting or review state
+        kept = set(vars(GoGame(9))) - set(GoGame._position_state)
+        self.assertEqual(kept, {'board_size', 'ko_rule', 'komi', 'journal', '_neighbor_table', '_ring_table',
+                                '_line', '_checkpoints', '_interval'})
+        game = self.game
+        marker = object()
+        game.komi = 6.5
+        game.goto(3)
+        game.analysis = marker
+        game.goto(140)
+        game.goto(20)
+        self.assertIs(game.analysis, marker)
+        self.assertEqual(game.komi, 6.5)
+
+    def test_forward_back_and_branch(self):
+        game = self.game
+        with self.assertRaises(InvalidMoveError):
+            game.forward()
+        game.goto(10)
+        game.back()
+        game.forward()
+        game.forward()
+        self.assertEqual(game.move_number(), 11)
+        self.assertEqual(game.review_length(), 150)
+        # Playing the game's own next move keeps the line
+        game.play(self.line[11])
+        self.assertEqual(game.review_length(), 150)
+        # Any other move starts a new line
+        game.play(None)
+        self.assertEqual(game.review_length(), 13)
+        self.assertTrue(all(k <= 12 for k in game._checkpoints))
+        with self.assertRaises(InvalidMoveError):
+            game.goto(14)
+        game.goto(0)
+        with self.assertRaises(InvalidMoveError):
+            game.back()
+
+
 if __name__ == '__main__':
     unittest.main()
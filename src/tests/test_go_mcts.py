@@ -0,0 +1,106 @@
+import unittest
+import random
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.go import GoGame
+from game.player import Player
+from game.exceptions import InvalidMoveError
+from ai.playout import PlayoutBoard, PASS
+from ai.go_mcts import GoMCTS
+
+class TestPlayoutBoard(unittest.TestCase):
+    def assert_same_position(self, board, game):
+        for r in range(game.board_size):
+            for c in range(game.board_size):
+                p = game.board.get(r, c)
+                self.assertEqual(board.cells[board.index(r, c)], p.value if p else 0)
+        self.assertEqual(board.to_move, game.current_player.value)
+        self.assertEqual(board.captures[1:], [game.captured_stones[Player.BLACK], game.captured_stones[Player.WHITE]])
+        self.assertEqual(board.zobrist_hash, game.board.zobrist_hash)
+
+    def test_matches_go_rules(self):
+        rng = random.Random(11)
+        for _ in range(5):
+            game = GoGame(9)
+            board = PlayoutBoard(9)
+            ko_seen = False
+            for _ in range(300):
+                r, c = rng.randrange(9), rng.randrange(9)
+                i = board.index(r, c)
+                legal = board.is_legal(i)
+                try:
+                    game.place_stone(r, c)
+                except InvalidMoveError as e:
+                    self.assertFalse(legal, f"{(r, c)}: {e}")
+                    ko_seen = ko_seen or "Ko" in str(e)
+                    continue
+                self.assertTrue(legal)
+                board.play(i)
+                self.assert_same_position(board, game)
+                # Rebuilding from the game must give the same ko state
+                self.assertEqual(PlayoutBoard.from_game(game).ko, board.ko)
+            game.pass_turn()
+            game.pass_turn()
+            board.play(PASS)
+            board.play(PASS)
+            score = board.area_score()
+            expected = Player.BLACK if score > 0 else Player.WHITE if score < 0 else None
+            self.assertEqual(game.check_winner(), expected)
+
+    def test_ko(self):
+        game = GoGame(9)
+        for m in [(0, 1), (0, 2), (1, 0), (1, 3), (2, 1), (2, 2), (8, 8), (1, 1)]:
+            game.place_stone(*m)
+        game.place_stone(1, 2) # Black takes the ko
+        board = PlayoutBoard.from_game(game)
+        self.assertEqual(board.ko, board.index(1, 1))
+        self.assertFalse(board.is_legal(board.index(1, 1)))
+
+    def test_playout_terminates(self):
+        board = PlayoutBoard(9)
+        board.random_playout(random.Random(2))
+        self.assertEqual(board.passes, 2)
+        # Only eyes are left empty
+        for i in board.playable:
+            if board.cells[i] == 0:
+                self.assertTrue(board.is_eye(i, 1) or board.is_eye(i, 2) or not board.is_legal(i))
+
+class TestGoMCTS(unittest.TestCase):
+    def test_selects_legal_move(self):
+        game = GoGame(9)
+        engine = GoMCTS(time_limit=0.2, workers=1, seed=3)
+        for _ in range(4):
+            move = engine.select_move(game)
+            self.assertIsNotNone(move)
+            game.place_stone(*move)
+        self.assertGreater(engine.info.nodes, 0)
+        self.assertEqual(len(game.history), 4)
+
+    def test_root_parallel(self):
+        game = GoGame(9)
+        game.place_stone(4, 4)
+        engine = GoMCTS(time_limit=0.2, workers=2, seed=5)
+        try:
+            move = engine.select_move(game)
+        finally:
+            engine.close()
+        self.assertIsNone(game.board.get(*move))
+
+    def test_passes_when_board_settled(self):
+        game = GoGame(9)
+        board = PlayoutBoard(9)
+        board.random_playout(random.Random(8))
+        for i in board.playable:
+            if board.cells[i]:
+                r, c = board.point(i)
+                game.board.place_stone(r, c, Player(board.cells[i]))
+        game._rebuild_chains()
+        game.pass_turn()
+        engine = GoMCTS(time_limit=0.2, workers=1, seed=6)
+        # Only eyes remain: filling them never helps
+        self.assertIsNone(engine.select_move(game))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,11 @@
 import unittest
+import random
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from game.gomoku import GomokuGame
+from game.board import FlatBoard
 from game.player import Player
 
 class TestGomoku(unittest.TestCase):
@@ -26,5 +28,124 @@ class TestGomoku(unittest.TestCase):
         self.assertIsNone(self.game.board.get(0, 0))
         self.assertEqual(self.game.current_player, Player.BLACK)
 
+    def test_undo_after_win(self):
+        for i in range(5):
+            self.game.place_stone(0, i)
+            if i < 4:
+                self.game.place_stone(1, i)
+        self.game.undo()
+        self.assertFalse(self.game.is_game_over())
+        self.assertIsNone(self.game.board.get(0, 4))
+        self.assertEqual(self.game.current_player, Player.BLACK)
+        self.assertEqual(len(self.game.history), 8)
+        self.assertEqual(self.game.history[-1].point, (1, 3))
+
+    def test_legal_moves(self):
+        self.assertEqual(len(self.game.legal_moves()), 15 * 15)
+        self.game.place_stone(7, 7)
+        self.game.place_stone(0, 14)
+        moves = self.game.legal_moves()
+        self.assertEqual(len(moves), 15 * 15 - 2)
+        self.assertNotIn((7, 7), moves)
+        self.assertEqual(moves, sorted(moves))
+        self.assertFalse(self.game.is_legal(0, 14))
+        self.assertFalse(self.game.is_legal(15, 0))
+        self.game.undo()
+        self.assertTrue(self.game.is_legal(0, 14))
+        for c in range(4):
+            self.game.place_stone(7, c)
+            self.game.place_stone(8, c)
+        self.game.place_stone(7, 4)
+        self.assertEqual(self.game.legal_moves(), [])
+
+    def test_play_unplay(self):
+        tokens = [self.game.play(m) for m in [(7, 7), (0, 0), (7, 8), (0, 1), (7, 9), (0, 2), (7, 10), (0, 3)]]
+        self.assertIsNone(self.game.play((7, 7)))
+        self.assertIsNone(self.game.play(None))
+        win = self.game.play((7, 11))
+        self.assertEqual(self.game.check_winner(), Player.BLACK)
+        self.assertIsNone(self.game.play((1, 1)))
+        self.game.unplay(win)
+        self.assertFalse(self.game.is_game_over())
+        self.assertEqual(self.game.current_player, Player.BLACK)
+        for token in reversed(tokens):
+            self.game.unplay(token)
+        self.assertEqual(self.game.board.zobrist_hash, 0)
+        self.assertEqual(len(self.game.legal_moves()), 15 * 15)
+
+    def test_review(self):
+        moves = [(7, 7), (0, 0), (7, 8), (0, 1), (7, 9), (0, 2), (7, 10), (0, 3), (7, 11)]
+        for m in moves:
+            self.game.place_stone(*m)
+        self.game.goto(0)
+        self.assertEqual(self.game.board.zobrist_hash, 0)
+        self.assertEqual(len(self.game.legal_moves()), 15 * 15)
+        self.game.goto(9)
+        self.assertEqual(self.game.check_winner(), Player.BLACK)
+        self.game.back()
+        self.assertFalse(self.game.is_game_over())
+        self.assertEqual(self.game.current_player, Player.BLACK)
+        self.game.forward()
+        self.assertTrue(self.game.is_game_over())
+        self.assertEqual(self.game.move_list(), moves)
+
+    def test_review_through_checkpoints(self):
+        rng = random.Random(3)
+        game = self.game
+        while game.move_number() < 60 and not game.is_game_over():
+            game.play(rng.choice(game.legal_moves()))
+        line = game.move_list()
+        for n in [0, len(line), 5, 40, 17, len(line)]:
+            game.goto(n)
+            replay = game.new_game()
+            for move in line[:n]:
+                replay.play(move)
+            self.assertEqual(game.board.zobrist_hash, replay.board.zobrist_hash)
+            self.assertEqual(game.legal_moves(), replay.legal_moves())
+            self.assertEqual(game.is_game_over(), replay.is_game_over())
+
+class TestGomokuFlatBoard(TestGomoku):
+    def setUp(self):
+        self.game = GomokuGame(15, board_cls=FlatBoard)
+
+    def test_win_diagonal_at_edge(self):
+        # Anti-diagonal touching the right and bottom edges
+        for i in range(5):
+            self.game.place_stone(10 + i, 14 - i) # Black
+            if i < 4:
+                self.game.place_stone(0, i) # White
+        self.assertEqual(self.game.check_winner(), Player.BLACK)
+
+
+class TestGomokuBitboard(TestGomoku):
+    def setUp(self):
+        self.game = GomokuGame(15, bitboard=True)
+
+    def test_no_wrap_across_rows(self):
+        # Stones at the end of row 0 and start of row 1 must not count as a line
+        for i, (r, c) in enumerate([(0, 12), (0, 13), (0, 14), (1, 0), (1, 1)]):
+            self.game.place_stone(r, c) # Black
+            if i < 4:
+                self.game.place_stone(5 + i, 7) # White
+        self.assertFalse(self.game.is_game_over())
+
+    def test_matches_board_scan(self):
+        rng = random.Random(3)
+        for _ in range(30):
+            ref = GomokuGame(15)
+            fast = GomokuGame(15, bitboard=True)
+            while not ref.is_game_over():
+                r, c = rng.randrange(15), rng.randrange(15)
+                if ref.board.get(r, c) is not None:
+                    continue
+                ref.place_stone(r, c)
+                fast.place_stone(r, c)
+                self.assertEqual(fast.is_game_over(), ref.is_game_over())
+                self.assertEqual(fast.check_winner(), ref.check_winner())
+            fast.undo()
+            self.assertTrue(fast.bitboard.is_empty(*ref.history[-1].point))
+            self.assertFalse(fast.bitboard.has_five(ref.history[-1].player.value))
+
+
 if __name__ == '__main__':
     unittest.main()
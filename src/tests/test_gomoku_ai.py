@@ -0,0 +1,56 @@
+import unittest
+import time
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.gomoku import GomokuGame
+from game.player import Player
+from ai.gomoku_ai import GomokuAI
+
+def play(game, moves):
+    for m in moves:
+        game.place_stone(*m)
+
+class TestGomokuAI(unittest.TestCase):
+    def setUp(self):
+        self.game = GomokuGame(15)
+        self.ai = GomokuAI(time_limit=0.5)
+
+    def test_opening_move(self):
+        self.assertEqual(self.ai.select_move(self.game), (7, 7))
+
+    def test_takes_win(self):
+        # Black has four in row 7 with one open end
+        play(self.game, [(7, 3), (7, 2), (7, 4), (8, 8), (7, 5), (9, 9), (7, 6), (0, 0)])
+        self.assertEqual(self.ai.select_move(self.game), (7, 7))
+
+    def test_blocks_four(self):
+        # White to move; Black threatens five at (3, 7)
+        play(self.game, [(3, 3), (3, 2), (3, 4), (10, 10), (3, 5), (10, 12), (3, 6)])
+        self.assertEqual(self.game.current_player, Player.WHITE)
+        self.assertEqual(self.ai.select_move(self.game), (3, 7))
+
+    def test_time_budget_and_info(self):
+        play(self.game, [(7, 7), (7, 8), (8, 8), (6, 6), (9, 9), (8, 7)])
+        ai = GomokuAI(time_limit=0.3)
+        reports = []
+        start = time.perf_counter()
+        move = ai.select_move(self.game, progress=reports.append)
+        self.assertLess(time.perf_counter() - start, 0.6)
+        self.assertIsNone(self.game.board.get(*move))
+        self.assertTrue(reports)
+        self.assertEqual(ai.info.best_move, move)
+        self.assertEqual(ai.info.pv[0], move)
+        self.assertGreater(ai.info.nodes, 0)
+        # The game itself is left untouched
+        self.assertEqual(len(self.game.history), 6)
+
+    def test_plays_full_game(self):
+        ai = GomokuAI(time_limit=0.05, max_depth=2)
+        while not self.game.is_game_over():
+            self.game.place_stone(*ai.select_move(self.game))
+        self.assertIsNotNone(self.game.check_winner())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+import io
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.player import Player
+from ui.gtp import GTP
+from utils.sgf import save_sgf
+from tests.test_storage import random_go_game
+
+class TestGTP(unittest.TestCase):
+    def setUp(self):
+        self.gtp = GTP(engine='random', size=9, komi=6.5)
+
+    def ask(self, line):
+        return self.gtp.handle(line)
+
+    def test_framing(self):
+        self.assertEqual(self.ask("7 protocol_version"), "=7 2\n\n")
+        self.assertEqual(self.ask("name\t# comment"), "= oop-big-homework\n\n")
+        self.assertIsNone(self.ask("# only a comment"))
+        self.assertEqual(self.ask("3 fly"), "?3 unknown command\n\n")
+        self.assertEqual(self.ask("known_command play"), "= true\n\n")
+        self.assertIn("final_score", self.ask("list_commands"))
+
+    def test_vertices_and_capture(self):
+        for line in ["play b A8", "play w A9", "play b B9"]:
+            self.assertEqual(self.ask(line), "=\n\n")
+        game = self.gtp.game
+        self.assertEqual(game.board.get(1, 0), Player.BLACK)
+        self.assertIsNone(game.board.get(0, 0))
+        self.assertEqual(game.captured_stones[Player.BLACK], 1)
+        self.assertEqual(self.ask("play w A9"), "? illegal move\n\n") # suicide
+        self.assertEqual(self.ask("play w I5"), "? invalid vertex\n\n")
+        self.assertEqual(self.ask("play w J10"), "? invalid vertex\n\n")
+        self.assertEqual(self.ask("play x A1"), "? invalid color\n\n")
+        self.assertEqual(self.ask("undo"), "=\n\n")
+        self.assertEqual(game.board.get(0, 0), Player.WHITE)
+
+    def test_same_colour_twice_and_pass(self):
+        self.ask("play b E5")
+        self.assertEqual(self.ask("play b D5"), "=\n\n")
+        self.assertEqual(self.ask("play w pass"), "=\n\n")
+        self.assertEqual(self.gtp.game.current_player, Player.BLACK)
+
+    def test_same_colour_twice_is_recorded(self):
+        gtp = GTP(engine='random', size=9, ko_rule='situational')
+        for line in ["play b D4", "play b E5", "undo", "undo"]:
+            self.assertEqual(gtp.handle(line), "=\n\n")
+        self.assertEqual(gtp.game.move_list(), [])
+        gtp.handle("play b D4")
+        self.assertEqual(gtp.handle("play b D4"), "? illegal move\n\n")
+        self.assertEqual(gtp.game.current_player, Player.WHITE) # unchanged by the failed move
+        self.assertEqual(gtp.handle("play b E5"), "=\n\n")
+        self.assertIn(";B[df];W[];B[ee]", gtp.handle("printsgf"))
+        gtp.handle("play w pass")
+        self.assertEqual(gtp.handle("play w A1"), "? cannot move twice in a row after a pass\n\n")
+
+    def test_internal_error(self):
+        def broken(args):
+            raise KeyError('x')
+        self.gtp.commands['name'] = broken
+        self.assertEqual(self.ask("5 name"), "?5 internal error\n\n")
+        self.assertEqual(self.ask("protocol_version"), "= 2\n\n")
+
+    def test_score_and_boards(self):
+        self.ask("play b E5")
+        self.assertEqual(self.ask("final_score"), "= B+74.5\n\n") # lone stone owns the board
+        self.ask("komi 0")
+        self.assertEqual(self.ask("final_score"), "= B+81\n\n")
+        self.assertEqual(self.ask("boardsize 25"), "? unacceptable size\n\n")
+        self.assertEqual(self.ask("boardsize 13"), "=\n\n")
+        self.assertEqual(self.gtp.game.board_size, 13)
+        self.assertEqual(self.ask("play b N13"), "=\n\n")
+        self.assertEqual(self.gtp.game.board.get(0, 12), Player.BLACK)
+        self.ask("clear_board")
+        self.assertEqual(self.gtp.game.move_list(), [])
+        self.assertIn("\n13 . . .", self.ask("showboard"))
+
+    def test_genmove(self):
+        reply = self.ask("genmove w")
+        self.assertTrue(reply.startswith("= "))
+        # Black passes first, so White can open
+        self.assertEqual(self.gtp.game.move_list()[0], None)
+        self.assertEqual(len(self.gtp.game.move_list()), 2)
+        self.assertEqual(self.gtp.game.history[-1].player, Player.WHITE)
+        self.assertTrue(self.ask("reg_genmove w").startswith("= "))
+        self.assertEqual(len(self.gtp.game.move_list()), 2)
+        self.ask("play b pass")
+        self.ask("play w pass")
+        self.assertEqual(self.ask("genmove b"), "= pass\n\n")
+
+    def test_loadsgf_and_run(self):
+        game = random_go_game(9, 30)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'g.sgf')
+            save_sgf(game, path)
+            self.assertEqual(self.ask(f"loadsgf {path} 11"), "=\n\n")
+            self.assertEqual(self.gtp.game.move_list(), game.move_list()[:10])
+            with open(path, 'w') as f:
+                f.write("(;GM[1]SZ[21];B[aa])")
+            self.assertEqual(self.ask(f"loadsgf {path}"), "? cannot load file\n\n")
+        out = io.StringIO()
+        self.gtp.run(io.StringIO("1 clear_board\n2 quit\n3 name\n"), out)
+        self.assertEqual(out.getvalue(), "=1\n\n=2\n\n")
+
+if __name__ == '__main__':
+    unittest.main()
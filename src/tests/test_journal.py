@@ -0,0 +1,155 @@
+import unittest
+import io
+import os
+import sys
+import subprocess
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.go import GoGame
+from game.gomoku import GomokuGame
+from game.player import Player
+from utils import storage
+from utils.journal import Journal, load_journal
+from ui.cli import CLI
+from tests.test_storage import random_go_game
+
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def snapshot(game):
+    n = game.board_size
+    return (game.move_list(), [[game.board.get(r, c) for c in range(n)] for r in range(n)],
+            game.current_player, game.game_over, game.winner, game.review_length())
+
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'game.jnl')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_replays_every_kind_of_record(self):
+        game = GoGame(9, komi=6.5)
+        journal = Journal(self.path)
+        journal.start(game)
+        for point in [(0, 1), (0, 0), (1, 0), (4, 4), (5, 5)]:
+            game.place_stone(*point)
+        game.undo()
+        game.pass_turn()
+        game.goto(2) # review, then branch off the old line
+        game.place_stone(6, 6)
+        game.goto(1)
+        game.forward()
+        game.resign()
+        journal.close()
+        recovered, count, torn = load_journal(self.path)
+        self.assertEqual(snapshot(recovered), snapshot(game))
+        self.assertEqual(recovered.komi, 6.5)
+        self.assertEqual(recovered.winner, Player.WHITE) # Black, to move at move 2, resigned
+        self.assertEqual((count, torn), (12, 0))
+        self.assertIsNone(game.journal)
+
+    def test_torn_tail(self):
+        game = random_go_game(9, 30)
+        journal = Journal(self.path)
+        journal.start(game)
+        game.place_stone(*next(p for p in game.legal_moves()))
+        journal.close()
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        expected = snapshot(game)
+        game.undo()
+        before = snapshot(game)
+        # A crash can cut the last record short, or leave zeros or stale bytes after it
+        for tail, state, ignored in [(data, expected, 0), (data[:-1], before, 3), (data[:-3], before, 1),
+                                     (data + bytes(8), expected, 8), (data + data[-4:], expected, 4)]:
+            with open(self.path, 'wb') as f:
+                f.write(tail)
+            recovered, count, torn = load_journal(self.path)
+            self.assertEqual(snapshot(recovered), state)
+            self.assertEqual(torn, ignored)
+
+    def test_start_on_a_loaded_game(self):
+        game = GomokuGame(9, bitboard=True)
+        for point in [(4, 0), (0, 0), (4, 1), (0, 1), (4, 2), (0, 2), (4, 3), (0, 3), (4, 4)]:
+            game.place_stone(*point)
+        self.assertTrue(game.game_over)
+        with open(self.path + '.sav', 'wb') as f:
+            f.write(storage.encode_game(game))
+        loaded, _ = storage.load_game(self.path + '.sav')
+        Journal(self.path).start(loaded)
+        loaded.journal.close()
+        recovered, count, _ = load_journal(self.path)
+        self.assertEqual(snapshot(recovered), snapshot(game))
+        self.assertIsNotNone(recovered.bitboard)
+        self.assertEqual(count, 9)
+        # A game that ended by resignation keeps its result
+        resigned = random_go_game(9, 10)
+        resigned.resign()
+        Journal(self.path).start(resigned)
+        resigned.journal.close()
+        self.assertEqual(snapshot(load_journal(self.path)[0]), snapshot(resigned))
+
+    def test_start_during_review(self):
+        game = random_go_game(9, 12)
+        game.goto(4)
+        journal = Journal(self.path)
+        journal.start(game)
+        game.forward()
+        game.forward()
+        journal.close()
+        recovered, count, torn = load_journal(self.path)
+        self.assertEqual(snapshot(recovered), snapshot(game))
+        self.assertEqual((count, torn), (15, 0))
+        # Branching off the reviewed line is recovered too
+        journal.start(game)
+        game.back()
+        game.place_stone(*next(p for p in game.legal_moves() if p is not None))
+        game.back()
+        journal.close()
+        self.assertEqual(snapshot(load_journal(self.path)[0]), snapshot(game))
+
+    def test_group_commit(self):
+        game = GoGame(9)
+        journal = Journal(self.path, sync_every=8, sync_interval=3600)
+        journal.start(game)
+        start = os.path.getsize(self.path)
+        for _ in range(20):
+            game.play(next(iter(game.legal_moves())))
+        self.assertEqual(journal.syncs, 2)
+        journal.close()
+        self.assertEqual(journal.syncs, 3)
+        self.assertEqual(os.path.getsize(self.path) - start, 20 * 4)
+
+    def test_survives_kill(self):
+        # Records reach the operating system at once, so even unsynced ones survive
+        code = ("import os, sys\nsys.path.insert(0, {src!r})\n"
+                "from tests.test_journal import Journal\nfrom tests.test_storage import random_go_game\n"
+                "game = random_go_game(9, 0)\nJournal({path!r}, sync_every=1000, sync_interval=3600).start(game)\n"
+                "for point in [(2, 2), (6, 6), (2, 6)]:\n    game.place_stone(*point)\ngame.undo()\n"
+                "os._exit(9)\n").format(src=SRC, path=self.path)
+        proc = subprocess.run([sys.executable, '-c', code])
+        self.assertEqual(proc.returncode, 9)
+        game, msg = storage.load_game(self.path)
+        self.assertEqual(game.move_list(), [(2, 2), (6, 6)])
+        self.assertEqual(msg, "Game recovered from journal (4 records).")
+
+    def test_cli(self):
+        cli = CLI()
+        cli.run_script(io.StringIO(f"journal {self.path}\nstart go 9 5.5\nplace 3 3\nplace 7 7\npass\n"
+                                   "undo\nplace 3 7\nresign\n"), io.StringIO(), board='none')
+        expected = cli.summary()
+        del expected['commands']
+        cli.stop_journal()
+        cli = CLI()
+        out = io.StringIO()
+        cli.run_script(io.StringIO(f"load {self.path}\n"), out, board='none')
+        self.assertIn("recovered from journal (6 records)", out.getvalue())
+        summary = cli.summary()
+        del summary['commands']
+        self.assertEqual(summary, expected)
+        self.assertTrue(summary['over'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import io
+import json
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import profiling
+from game.base_game import BaseGame
+from game.go import GoGame
+from game.gomoku import GomokuGame
+from utils import storage
+from ui.cli import CLI
+from tests.test_storage import random_go_game
+
+class TestProfiling(unittest.TestCase):
+    def tearDown(self):
+        profiling.disable()
+        profiling.reset()
+
+    def test_disabled_runs_the_originals(self):
+        place_stone = vars(BaseGame)['place_stone']
+        score = vars(GoGame)['score']
+        profiling.enable()
+        self.assertIsNot(vars(BaseGame)['place_stone'], place_stone)
+        self.assertIs(vars(BaseGame)['place_stone'].__wrapped__, place_stone)
+        profiling.disable()
+        self.assertIs(vars(BaseGame)['place_stone'], place_stone)
+        self.assertIs(vars(GoGame)['score'], score)
+        GoGame(9).place_stone(2, 2)
+        self.assertEqual(profiling.stats(), {})
+
+    def test_counts(self):
+        profiling.enable()
+        game = GoGame(9)
+        for point in [(0, 1), (0, 0), (1, 0)]: # black captures in the corner
+            game.place_stone(*point)
+        game.undo()
+        game.score()
+        gomoku = GomokuGame(9)
+        gomoku.place_stone(4, 4)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'g.sav')
+            storage.save_game(game, path)
+            storage.load_game(path)
+        stats = profiling.stats()
+        self.assertEqual(stats['game.place_stone']['count'], 4)
+        self.assertEqual(stats['game.save_state']['count'], 4)
+        self.assertEqual(stats['game.undo']['count'], 1)
+        self.assertEqual(stats['go.score']['count'], 1)
+        self.assertEqual(stats['gomoku.check_winner_at']['count'], 1)
+        self.assertEqual(stats['storage.save_game']['count'], 1)
+        self.assertEqual(stats['storage.decode_game']['count'], 1)
+        for s in stats.values():
+            self.assertEqual(sum(s['histogram_ns'].values()), s['count'])
+            self.assertLessEqual(s['p50_us'], s['p99_us'])
+            self.assertLessEqual(s['p99_us'], s['max_us'])
+        # Totals are sorted slowest first
+        totals = [s['total_ms'] for s in stats.values()]
+        self.assertEqual(totals, sorted(totals, reverse=True))
+        profiling.reset()
+        self.assertEqual(profiling.stats(), {})
+
+    def test_percentile_buckets(self):
+        stats = profiling.CallStats()
+        for ns in [100] * 98 + [5000, 100000]:
+            stats.add(ns)
+        self.assertEqual(stats.percentile(0.5), 128)
+        self.assertEqual(stats.percentile(0.99), 8192) # 5000 is in the (4096, 8192] bucket
+        self.assertEqual(stats.percentile(1.0), 100000)
+
+    def test_trace_dump(self):
+        profiling.enable(trace=True)
+        game = random_go_game(9, 20)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'trace.json')
+            profiling.dump(path, game)
+            with open(path) as f:
+                data = json.load(f)
+        events = data['traceEvents']
+        self.assertEqual(len(events), sum(s['count'] for s in data['stats'].values()))
+        self.assertTrue(all(e['ph'] == 'X' and e['dur'] >= 0 for e in events))
+        self.assertEqual(data['history']['moves'], 20)
+
+    def test_history_bytes_grow(self):
+        small = profiling.history_bytes(random_go_game(9, 5))
+        large = profiling.history_bytes(random_go_game(9, 60))
+        self.assertGreater(large, small)
+
+    def test_cli_command(self):
+        out = io.StringIO()
+        cli = CLI()
+        summary = cli.run_script(io.StringIO("stats\nstats on\nstart gomoku 9\nplace 1 1\nstats\nstats off\nstats x\n"),
+                                 out, board='none')
+        text = out.getvalue()
+        self.assertIn("Profiling is off", text)
+        self.assertIn("game.place_stone", text)
+        self.assertIn("History: 1 moves", text)
+        self.assertFalse(profiling.enabled())
+        self.assertEqual([e['line'] for e in summary['errors']], [7])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import asyncio
+import json
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.server import GameServer, Client, run_load
+from utils.sgf import parse_main_line, game_from_nodes
+
+class TestProtocol(unittest.TestCase):
+    def setUp(self):
+        self.server = GameServer()
+
+    def send(self, **request):
+        return self.server.dispatch(json.dumps(request))
+
+    def test_capture_diff_and_undo(self):
+        reply = self.send(id=7, cmd='start', game='go', size=9, komi=6.5)
+        self.assertEqual(reply['id'], 7)
+        gid = reply['game_id']
+        self.assertEqual(reply['state']['stones'], {'black': [], 'white': []})
+        for r, c in [(0, 1), (0, 0)]:
+            self.assertTrue(self.send(cmd='place', game_id=gid, row=r, col=c)['ok'])
+        diff = self.send(cmd='place', game_id=gid, row=1, col=0)['diff']
+        self.assertEqual(diff['added'], [[1, 0, 'black']])
+        self.assertEqual(diff['removed'], [[0, 0, 'white']])
+        self.assertEqual(diff['to_move'], 'white')
+        undo = self.send(cmd='undo', game_id=gid)['diff']
+        self.assertEqual(undo['removed'], [[1, 0, 'black']])
+        self.assertEqual(undo['added'], [[0, 0, 'white']])
+        state = self.send(cmd='state', game_id=gid)['state']
+        self.assertEqual(state['stones'], {'black': [[0, 1]], 'white': [[0, 0]]})
+        self.assertEqual(state['score']['komi'], 6.5)
+
+    def test_errors(self):
+        self.assertFalse(self.server.dispatch("not json")['ok'])
+        self.assertFalse(self.send(cmd='fly')['ok'])
+        self.assertFalse(self.send(cmd='place', game_id=99, row=0, col=0)['ok'])
+        gid = self.send(cmd='start', game='gomoku', size=15)['game_id']
+        self.assertFalse(self.send(cmd='pass', game_id=gid)['ok'])
+        self.assertFalse(self.send(cmd='place', game_id=gid, row='x', col=0)['ok'])
+        self.send(cmd='place', game_id=gid, row=7, col=7)
+        reply = self.send(cmd='place', game_id=gid, row=7, col=7)
+        self.assertEqual(reply['error'], "Position already occupied.")
+        self.assertFalse(self.send(cmd='start', game='chess')['ok'])
+
+    def test_malformed_values(self):
+        gid = self.send(cmd='start', game='go', size=9)['game_id']
+        for request in ['{"cmd":"state","game_id":[1]}', '{"cmd":["x"]}', '{"cmd":{"a":1}}',
+                        '{"cmd":"state","game_id":true}',
+                        f'{{"cmd":"place","game_id":{gid},"row":1e400,"col":0}}',
+                        '{"cmd":"start","game":"go","size":1e400}']:
+            reply = self.server.dispatch(request)
+            self.assertFalse(reply['ok'], request)
+            self.assertIn('error', reply)
+        for komi in ['inf', '-inf', 'nan']:
+            self.assertFalse(self.send(cmd='start', game='go', size=9, komi=komi)['ok'])
+        self.assertEqual(len(self.send(cmd='list')['games']), 1)
+        # Anything unexpected in a handler becomes an error reply too
+        self.server._handlers['list'] = lambda *args: {}['missing']
+        self.assertEqual(self.send(id=3, cmd='list'), {'ok': False, 'error': "Internal error.", 'id': 3})
+
+    def test_resign_save_close(self):
+        gid = self.send(cmd='start', game='go', size=9)['game_id']
+        self.send(cmd='place', game_id=gid, row=4, col=4)
+        diff = self.send(cmd='resign', game_id=gid)['diff']
+        self.assertEqual(diff['winner'], 'black')
+        sgf = self.send(cmd='save', game_id=gid)['sgf']
+        self.assertEqual(game_from_nodes(parse_main_line(sgf)).move_list(), [(4, 4)])
+        self.assertEqual(len(self.send(cmd='list')['games']), 1)
+        self.assertTrue(self.send(cmd='close', game_id=gid)['ok'])
+        self.assertEqual(self.send(cmd='list')['games'], [])
+
+class TestServerSockets(unittest.TestCase):
+    def test_broadcast_and_load(self):
+        async def scenario():
+            server = GameServer()
+            port = await server.start('127.0.0.1', 0)
+            try:
+                a = await Client.connect('127.0.0.1', port)
+                b = await Client.connect('127.0.0.1', port)
+                gid = (await a.request('start', game='go', size=9))['game_id']
+                await b.request('subscribe', game_id=gid)
+                await a.request('place', game_id=gid, row=2, col=2)
+                event = json.loads(await asyncio.wait_for(b.reader.readline(), 5))
+                self.assertEqual(event['event'], 'diff')
+                self.assertEqual(event['diff']['added'], [[2, 2, 'black']])
+                await a.request('close', game_id=gid)
+                event = json.loads(await asyncio.wait_for(b.reader.readline(), 5))
+                self.assertEqual(event, {'event': 'closed', 'game_id': gid})
+                self.assertEqual([len(w) for w in server._watching.values()], [0, 0])
+                a.close()
+                b.close()
+                return await run_load('127.0.0.1', port, players=2, watchers=1, idle=20, duration=0.5)
+            finally:
+                await server.stop()
+        summary = asyncio.run(scenario())
+        self.assertGreater(summary['moves'], 0)
+        self.assertGreater(summary['events'], 0)
+        self.assertEqual(summary['connections'], 24)
+
+if __name__ == '__main__':
+    unittest.main()
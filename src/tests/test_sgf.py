@@ -0,0 +1,74 @@
+import unittest
+import io
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.go import GoGame
+from game.gomoku import GomokuGame
+from game.player import Player
+from utils.sgf import (read_games, write_games, iter_game_texts, parse_main_line,
+                       game_to_sgf, SGFError)
+from utils.storage import save_game, load_game
+from tests.test_storage import random_go_game
+
+TRICKY = "(;GM[1]SZ[9]C[a\\]b(c)\\\\];B[ee](;W[cc];B[dd])(;W[gg]))"
+
+class TestSGF(unittest.TestCase):
+    def test_roundtrip_collection(self):
+        go = random_go_game(13, 120, komi=6.5)
+        gomoku = GomokuGame(15)
+        for p in [(7, 7), (0, 0), (7, 8), (0, 1), (7, 9), (0, 2), (7, 10), (0, 3), (7, 11)]:
+            gomoku.place_stone(*p)
+        buf = io.StringIO()
+        write_games(buf, [go, gomoku])
+        games = list(read_games(io.StringIO(buf.getvalue())))
+        self.assertEqual(len(games), 2)
+        self.assertEqual(games[0].move_list(), go.move_list())
+        self.assertEqual(games[0].board.grid, go.board.grid)
+        self.assertEqual(games[0].komi, 6.5)
+        self.assertIsInstance(games[1], GomokuGame)
+        self.assertEqual(games[1].check_winner(), Player.BLACK)
+
+    def test_streaming_across_chunks(self):
+        text = "junk before " + TRICKY + "\n" + game_to_sgf(random_go_game(9, 40))
+        whole = list(iter_game_texts(io.StringIO(text)))
+        self.assertEqual(len(whole), 2)
+        for size in (1, 2, 5, 13):
+            self.assertEqual(list(iter_game_texts(io.StringIO(text), size)), whole)
+
+    def test_main_line_and_escapes(self):
+        nodes = parse_main_line(TRICKY)
+        self.assertEqual(nodes[0]['C'], ['a]b(c)\\'])
+        self.assertEqual([n.get('B', n.get('W')) for n in nodes[1:]], [['ee'], ['cc'], ['dd']])
+
+    def test_pass_and_result(self):
+        game = next(read_games(io.StringIO("(;GM[1]SZ[9]RE[W+R];B[ee];W[];B[tt])")))
+        self.assertEqual(game.move_list(), [(4, 4), None, None])
+        self.assertTrue(game.is_game_over())
+        resigned = next(read_games(io.StringIO("(;GM[1]SZ[9]RE[W+R];B[ee])")))
+        self.assertEqual(resigned.check_winner(), Player.WHITE)
+
+    def test_bad_records(self):
+        for text in ("(;GM[1]SZ[9];B[ee];B[ff])",          # out of turn
+                     "(;GM[1]SZ[9];B[ee];W[ee])",          # occupied
+                     "(;GM[1]SZ[9]AB[aa];W[ee])",          # setup stones
+                     "(;GM[2]SZ[9])"):                     # other game
+            with self.assertRaises(SGFError):
+                list(read_games(io.StringIO(text)))
+        with self.assertRaises(SGFError):
+            list(iter_game_texts(io.StringIO("(;GM[1];B[aa]")))
+
+    def test_storage_uses_extension(self):
+        game = random_go_game(9, 30)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'game.sgf')
+            self.assertTrue(save_game(game, path)[0])
+            with open(path) as f:
+                self.assertTrue(f.read().startswith("(;GM[1]"))
+            loaded, _ = load_game(path)
+            self.assertEqual(loaded.move_list(), game.move_list())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,209 @@
+import unittest
+import copyreg
+import io
+import pickle
+import random
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.go import GoGame
+from game.gomoku import GomokuGame
+from game.board import Board, FlatBoard
+from game.player import Player
+from game.exceptions import InvalidMoveError
+from utils.storage import save_game, load_game, encode_game, decode_game, SaveFormatError
+from tests.test_go import setup_double_ko
+
+def random_go_game(size, moves, seed=0, **kwargs):
+    rng = random.Random(seed)
+    game = GoGame(size, **kwargs)
+    points = [(r, c) for r in range(size) for c in range(size)]
+    for _ in range(moves):
+        rng.shuffle(points)
+        for p in points:
+            if game.board.get(*p) is None:
+                try:
+                    game.place_stone(*p)
+                    break
+                except InvalidMoveError:
+                    pass
+        else:
+            game.pass_turn()
+    return game
+
+class _Old:
+    """An object as the first, pickle-based version saved it: class plus attributes."""
+    def __init__(self, cls, **attrs):
+        self.cls = cls
+        self.attrs = attrs
+
+    @property
+    def __class__(self):
+        # What pickle records as the object's class
+        return self.cls
+
+class _OldPickler(pickle.Pickler):
+    def reducer_override(self, obj):
+        if isinstance(obj, _Old):
+            return copyreg.__newobj__, (obj.cls,), obj.attrs
+        return NotImplemented
+
+def first_version_save(moves, game_cls=GoGame, size=9):
+    """Bytes the original save_game wrote after moves: the board as a grid of
+    rows and history as the board (and Go counters) before every move."""
+    game = game_cls(size)
+    is_go = game_cls is GoGame
+
+    def board():
+        return _Old(Board, size=size, grid=[[game.board.get(r, c) for c in range(size)] for r in range(size)])
+
+    history = []
+    for move in moves:
+        if is_go:
+            history.append((board(), game.current_player, dict(game.captured_stones), game.pass_count))
+        else:
+            history.append((board(), game.current_player))
+        game.play(move)
+    attrs = dict(board_size=size, board=board(), current_player=game.current_player, history=history,
+                 game_over=game.game_over, winner=game.winner)
+    if is_go:
+        attrs.update(pass_count=game.pass_count, captured_stones=dict(game.captured_stones))
+    out = io.BytesIO()
+    _OldPickler(out).dump(_Old(game_cls, **attrs))
+    return out.getvalue()
+
+class TestStorage(unittest.TestCase):
+    def roundtrip(self, game):
+        return decode_game(encode_game(game))
+
+    def test_go_roundtrip(self):
+        game = random_go_game(13, 150)
+        loaded = self.roundtrip(game)
+        self.assertEqual(loaded.board.grid, game.board.grid)
+        self.assertEqual(loaded.current_player, game.current_player)
+        self.assertEqual(loaded.captured_stones, game.captured_stones)
+        self.assertEqual(loaded.position_hash(), game.position_hash())
+        self.assertEqual(loaded.move_list(), game.move_list())
+
+    def test_history_is_rebuilt_lazily(self):
+        game = random_go_game(9, 80)
+        loaded = self.roundtrip(game)
+        self.assertIsNotNone(loaded._lazy_moves)
+        self.assertEqual(loaded.history, game.history)
+        self.assertIsNone(loaded._lazy_moves)
+        while loaded.history:
+            loaded.undo()
+        self.assertEqual(loaded.board.zobrist_hash, 0)
+
+    def test_moves_after_load_then_undo(self):
+        game = random_go_game(9, 60)
+        loaded = self.roundtrip(game)
+        for g in (game, loaded):
+            g.pass_turn()
+        for _ in range(10):
+            game.undo()
+            loaded.undo()
+        self.assertEqual(loaded.board.grid, game.board.grid)
+        self.assertEqual(loaded._hash_history, game._hash_history)
+
+    def test_simple_ko_survives_load(self):
+        game = GoGame(9)
+        setup_double_ko(game)
+        game.place_stone(1, 2) # B takes the ko
+        loaded = self.roundtrip(game)
+        with self.assertRaises(InvalidMoveError):
+            loaded.place_stone(1, 1)
+
+    def test_superko_survives_load(self):
+        game = GoGame(9, ko_rule='positional')
+        setup_double_ko(game)
+        game.place_stone(1, 2)
+        game.pass_turn()
+        game.place_stone(5, 2)
+        game.place_stone(1, 1)
+        game.pass_turn()
+        loaded = self.roundtrip(game)
+        with self.assertRaises(InvalidMoveError):
+            loaded.place_stone(5, 1)
+
+    def test_settings_roundtrip(self):
+        game = GomokuGame(15, FlatBoard, bitboard=True)
+        for p in [(7, 7), (0, 0), (7, 8), (0, 1), (7, 9), (0, 2), (7, 10), (0, 3)]:
+            game.place_stone(*p)
+        loaded = self.roundtrip(game)
+        self.assertIsInstance(loaded.board, FlatBoard)
+        self.assertIsNotNone(loaded.bitboard)
+        loaded.place_stone(7, 11)
+        self.assertEqual(loaded.check_winner(), Player.BLACK)
+        self.assertEqual(self.roundtrip(loaded).check_winner(), Player.BLACK)
+        go = self.roundtrip(GoGame(9, ko_rule='situational', komi=-7.5))
+        self.assertEqual(go.ko_rule, 'situational')
+        self.assertEqual(go.komi, -7.5)
+
+    def test_score_after_load(self):
+        game = random_go_game(9, 70, komi=6.5)
+        loaded = self.roundtrip(game)
+        self.assertEqual(loaded.score(), game.score())
+        loaded.undo()
+        game.undo()
+        self.assertEqual(loaded.score(), game.score())
+
+    def test_smaller_than_pickle(self):
+        game = random_go_game(19, 200)
+        self.assertLess(len(encode_game(game)) * 5, len(pickle.dumps(game)))
+
+    def test_bad_files(self):
+        with self.assertRaises(SaveFormatError):
+            decode_game(b'junk')
+        data = bytearray(encode_game(GoGame(9)))
+        data[4] = 99
+        with self.assertRaises(SaveFormatError):
+            decode_game(bytes(data))
+
+    def test_save_and_load_files(self):
+        game = random_go_game(9, 30)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'game.sav')
+            ok, _ = save_game(game, path)
+            self.assertTrue(ok)
+            loaded, _ = load_game(path)
+            self.assertEqual(loaded.board.grid, game.board.grid)
+            self.assertIsNone(load_game(os.path.join(tmp, 'missing'))[0])
+
+    def test_first_version_pickles(self):
+        game = random_go_game(9, 40)
+        moves = game.move_list()
+        gomoku = [(4, 0), (0, 0), (4, 1), (0, 1), (4, 2), (0, 2), (4, 3), (0, 3), (4, 4)]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'old.pkl')
+            with open(path, 'wb') as f:
+                f.write(first_version_save(moves))
+            loaded, _ = load_game(path)
+            self.assertEqual(loaded.move_list(), moves)
+            self.assertEqual(loaded.board.grid, game.board.grid)
+            self.assertEqual(loaded.captured_stones, game.captured_stones)
+            self.assertEqual(loaded.score(), game.score())
+            move = loaded.legal_moves()[0]
+            loaded.place_stone(*move)
+            loaded.undo()
+            loaded.undo()
+            self.assertEqual(loaded.move_list(), moves[:-1])
+
+            with open(path, 'wb') as f:
+                f.write(first_version_save(gomoku, GomokuGame))
+            loaded, _ = load_game(path)
+            self.assertEqual(loaded.winner, Player.BLACK)
+            loaded.undo()
+            loaded.place_stone(8, 8)
+
+            # Only the old game classes may be unpickled
+            with open(path, 'wb') as f:
+                pickle.dump(game, f)
+            loaded, msg = load_game(path)
+            self.assertIsNone(loaded)
+            self.assertIn("Not a saved game", msg)
+
+if __name__ == '__main__':
+    unittest.main()
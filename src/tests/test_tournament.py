@@ -0,0 +1,90 @@
+import unittest
+import math
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.player import Player
+from utils.tournament import run_tournament, play_game, make_engine, check_player, is_timed, elo_from_score, elo_estimate, SPRT
+
+class TestTournament(unittest.TestCase):
+    def test_elo(self):
+        self.assertAlmostEqual(elo_from_score(0.5), 0.0)
+        self.assertAlmostEqual(elo_from_score(1 / (1 + 10 ** (-100 / 400))), 100.0)
+        elo, low, high = elo_estimate([1, 0, 0.5, 1])
+        self.assertLess(low, elo)
+        self.assertLess(elo, high)
+
+    def test_sprt(self):
+        strong = SPRT(0, 50)
+        for _ in range(200):
+            strong.add(1.0)
+            strong.add(0.5)
+            if strong.decision():
+                break
+        self.assertEqual(strong.decision(), 'H1')
+        weak = SPRT(0, 50)
+        for _ in range(200):
+            weak.add(0.0)
+            weak.add(0.5)
+            if weak.decision():
+                break
+        self.assertEqual(weak.decision(), 'H0')
+
+    def test_play_game(self):
+        result = play_game('go', 9, 'random', 'random', 1, seed=3)
+        self.assertEqual(result.a_color, Player.WHITE)
+        self.assertIn(result.score, (0.0, 0.5, 1.0))
+        self.assertGreater(result.moves, 10)
+
+    def test_reproducible_across_workers(self):
+        seen = []
+        serial = run_tournament('gomoku', 9, 'random', 'random', 6, workers=1, seed=7,
+                                on_result=lambda r, s: seen.append(r.score))
+        parallel = run_tournament('gomoku', 9, 'random', 'random', 6, workers=2, seed=7)
+        for key in ('games', 'wins', 'draws', 'losses', 'elo'):
+            self.assertEqual(serial[key], parallel[key])
+        self.assertEqual(len(seen), 6)
+
+    def test_fixed_budgets_are_reproducible(self):
+        self.assertTrue(is_timed('mcts'))
+        self.assertTrue(is_timed('alphabeta:0.5'))
+        self.assertFalse(is_timed('mcts:200p'))
+        self.assertFalse(is_timed('alphabeta:3d'))
+        self.assertFalse(is_timed('random'))
+        self.assertEqual(make_engine('mcts:50p').playouts, 50)
+        self.assertEqual(make_engine('alphabeta:3D').max_depth, 3)
+        for game_type, spec in [('go', 'mcts:30p'), ('gomoku', 'alphabeta:2d')]:
+            runs = [play_game(game_type, 9, spec, 'random', 0, seed=5, max_moves=40) for _ in range(2)]
+            self.assertEqual(runs[0][:5], runs[1][:5]) # all but the time taken
+
+    def test_script_path_keeps_its_case(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'Moves.txt')
+            with open(path, 'w') as f:
+                f.write("5 5\n")
+            self.assertEqual(make_engine('script:' + path).moves, [(4, 4)])
+
+    def test_engine_must_fit_the_game(self):
+        check_player('mcts:10p', 'go')
+        check_player('random', 'go')
+        with self.assertRaises(ValueError):
+            make_engine('alphabeta:1d', game_type='go')
+        with self.assertRaises(ValueError):
+            make_engine('mcts:10p', game_type='gomoku')
+        with self.assertRaises(ValueError):
+            run_tournament('go', 9, 'random', 'alphabeta:1d', 2, workers=2)
+        with self.assertRaises(ValueError):
+            run_tournament('gomoku', 9, 'mcts:10p', 'random', 2)
+
+    def test_sprt_stops_early(self):
+        # The alpha-beta engine always beats a random mover
+        summary = run_tournament('gomoku', 9, 'alphabeta:0.01', 'random', 200, seed=1,
+                                 sprt=SPRT(0, 200, 0.1, 0.1))
+        self.assertEqual(summary['sprt'], 'H1')
+        self.assertLess(summary['games'], 200)
+        self.assertTrue(math.isfinite(summary['elo']))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,20 +1,33 @@
 import sys
 import os
+import io
+import math
+import time
 
 # Add the parent directory to path so we can import modules if running directly
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from game.go import GoGame
-from game.gomoku import GomokuGame
 from game.player import Player
 from game.exceptions import GameError
-from utils.storage import save_game, load_game
+from game import profiling
+
+# Game variants, engines, storage and the opening book are imported by the
+# commands that need them, so a session only loads what it uses.
 
 class CLI:
     def __init__(self):
         self.game = None
         self.running = True
         self.show_hints = True
+        self.ai_player = None # Player the computer plays, or None
+        self.ai_time = 1.0
+        self.ai_engine = None
+        self.book = None
+        self.journal = None # utils.journal.Journal autosaving the current game, or None
+        self.auto_board = True # Print the board after every move
+        self.commands = 0
+        self.errors = [] # (line number, message) of every failed command
+        self.line_number = None
 
     def start(self):
         print("Welcome to the Board Game Platform!")
@@ -29,7 +42,8 @@ class CLI:
                 print("\nExiting...")
                 self.running = False
             except Exception as e:
-                print(f"Error: {e}")
+                self.fail(f"Error: {e}")
+        self.stop_journal()
 
     def process_command(self, line):
         parts = line.split()
@@ -40,6 +54,7 @@ class CLI:
             self.show_help()
         elif cmd == 'exit' or cmd == 'quit':
             self.running = False
+            self.reset_engine()
         elif cmd == 'start':
             self.cmd_start(args)
         elif cmd == 'restart':
@@ -58,66 +73,101 @@ class CLI:
             self.cmd_load(args)
         elif cmd == 'hints':
             self.cmd_hints(args)
+        elif cmd == 'ai':
+            self.cmd_ai(args)
+        elif cmd == 'book':
+            self.cmd_book(args)
+        elif cmd == 'goto':
+            self.cmd_goto(args)
+        elif cmd in ('back', 'forward'):
+            self.cmd_step(cmd, args)
+        elif cmd == 'stats':
+            self.cmd_stats(args)
+        elif cmd == 'journal':
+            self.cmd_journal(args)
+        elif cmd == 'board':
+            if self.game:
+                self.print_board(force=True)
+            else:
+                self.fail("No active game.")
         else:
-            print("Unknown command. Type 'help' for list.")
+            self.fail("Unknown command. Type 'help' for list.")
 
     def show_help(self):
         print("Commands:")
-        print("  start <go|gomoku> <size>  : Start a new game (size 8-19)")
+        print("  start <go|gomoku> <size> [komi]: Start a new game (size 8-19)")
         print("  restart                   : Restart current game")
         print("  place <row> <col>         : Place stone (e.g., 'place 3 4')")
         print("  pass                      : Pass turn (Go only)")
         print("  undo                      : Undo last move")
+        print("  back [n] / forward [n]    : Review: step back or forward n moves (default 1)")
+        print("  goto <move>               : Review: show the position after a move (0 = start)")
         print("  resign                    : Resign the game")
-        print("  save <filename>           : Save game to file")
-        print("  load <filename>           : Load game from file")
+        print("  save <filename>           : Save game to file (.sgf for SGF)")
+        print("  load <filename>           : Load game from file (.sgf for SGF, or a journal)")
+        print("  journal <filename|off>    : Autosave every move to a journal that 'load' recovers")
         print("  hints <on|off>            : Show/Hide hints")
+        print("  ai <black|white|off> [sec]: Let the computer play a colour")
+        print("  book <filename|off>       : Use an opening book for hints and the computer")
+        print("  board                     : Print the board")
+        print("  stats [on|trace|off|reset|save <file>]: Profiling counters (save writes JSON,")
+        print("                              also a Chrome trace after 'stats trace')")
         print("  exit                      : Exit program")
 
     def cmd_start(self, args):
-        if len(args) != 2:
-            print("Usage: start <go|gomoku> <size>")
+        if len(args) not in (2, 3):
+            self.fail("Usage: start <go|gomoku> <size> [komi]")
             return
         
         gtype = args[0].lower()
         try:
             size = int(args[1])
+            komi = float(args[2]) if len(args) == 3 else 0.0
         except ValueError:
-            print("Size must be an integer.")
+            self.fail("Size and komi must be numbers.")
+            return
+        if not math.isfinite(komi):
+            self.fail("Komi must be a finite number.")
+            return
+        if len(args) == 3 and gtype == 'gomoku':
+            self.fail("Gomoku has no komi.")
             return
 
         try:
             if gtype == 'go':
-                self.game = GoGame(size)
+                from game.go import GoGame
+                self.game = GoGame(size, komi=komi)
             elif gtype == 'gomoku':
+                from game.gomoku import GomokuGame
                 self.game = GomokuGame(size)
             else:
-                print("Unknown game type. Choose 'go' or 'gomoku'.")
+                self.fail("Unknown game type. Choose 'go' or 'gomoku'.")
                 return
             print(f"Started {gtype.capitalize()} game on {size}x{size} board.")
+            self.follow_journal()
+            self.reset_engine()
             self.print_board()
+            self.ai_move()
         except GameError as e:
-            print(f"Error starting game: {e}")
+            self.fail(f"Error starting game: {e}")
 
     def cmd_restart(self):
         if not self.game:
-            print("No active game.")
+            self.fail("No active game.")
             return
         # Re-initialize with same params
-        size = self.game.board_size
-        if isinstance(self.game, GoGame):
-            self.game = GoGame(size)
-        else:
-            self.game = GomokuGame(size)
+        self.game = self.game.new_game()
         print("Game restarted.")
+        self.follow_journal()
         self.print_board()
+        self.ai_move()
 
     def cmd_place(self, args):
         if not self.game:
-            print("No active game. Use 'start' first.")
+            self.fail("No active game. Use 'start' first.")
             return
         if len(args) != 2:
-            print("Usage: place <row> <col>")
+            self.fail("Usage: place <row> <col>")
             return
         
         try:
@@ -128,18 +178,19 @@ class CLI:
             self.game.place_stone(r, c)
             self.print_board()
             self.check_game_over()
+            self.ai_move()
             
         except ValueError:
-            print("Coordinates must be integers.")
+            self.fail("Coordinates must be integers.")
         except GameError as e:
-            print(f"Invalid move: {e}")
+            self.fail(f"Invalid move: {e}")
 
     def cmd_pass(self):
         if not self.game:
-            print("No active game.")
+            self.fail("No active game.")
             return
         
-        if isinstance(self.game, GoGame):
+        if self.game.kind == 'go':
             try:
                 self.game.pass_turn()
                 print(f"{self.game.get_current_player().other()} passed.")
@@ -148,60 +199,147 @@ class CLI:
                 # Actually pass doesn't change board, but maybe we should show whose turn it is.
                 if not self.game.is_game_over():
                     print(f"Current Player: {self.game.get_current_player()}")
+                self.ai_move()
             except GameError as e:
-                print(f"Error: {e}")
+                self.fail(f"Error: {e}")
         else:
-            print("Pass is only available in Go.")
+            self.fail("Pass is only available in Go.")
 
     def cmd_undo(self):
         if not self.game:
-            print("No active game.")
+            self.fail("No active game.")
             return
         try:
             self.game.undo()
+            # Against the computer, take back its reply as well as our move
+            if self.ai_player == self.game.get_current_player() and self.game.history:
+                self.game.undo()
             print("Undid last move.")
             self.print_board()
         except GameError as e:
-            print(f"Cannot undo: {e}")
+            self.fail(f"Cannot undo: {e}")
+
+    def cmd_goto(self, args):
+        if not self.game:
+            self.fail("No active game.")
+            return
+        if len(args) != 1:
+            self.fail("Usage: goto <move>")
+            return
+        try:
+            self.review(int(args[0]))
+        except ValueError:
+            self.fail("Move number must be an integer.")
+
+    def cmd_step(self, cmd, args):
+        if not self.game:
+            self.fail("No active game.")
+            return
+        if len(args) > 1:
+            self.fail(f"Usage: {cmd} [n]")
+            return
+        try:
+            steps = int(args[0]) if args else 1
+        except ValueError:
+            self.fail("Number of moves must be an integer.")
+            return
+        current = self.game.move_number()
+        if cmd == 'back':
+            self.review(max(0, current - steps))
+        else:
+            self.review(min(self.game.review_length(), current + steps))
+
+    def review(self, move_number):
+        """Shows the position after move_number moves; playing on from it starts a new line."""
+        try:
+            self.game.goto(move_number)
+        except GameError as e:
+            self.fail(f"Cannot go there: {e}")
+            return
+        print(f"Move {self.game.move_number()} of {self.game.review_length()}.")
+        self.print_board()
 
     def cmd_resign(self):
         if not self.game:
-            print("No active game.")
+            self.fail("No active game.")
             return
-        
-        winner = self.game.get_current_player().other()
-        print(f"{self.game.get_current_player()} resigns. {winner} wins!")
-        self.game.game_over = True
-        self.game.winner = winner
+        try:
+            self.game.resign()
+        except GameError as e:
+            self.fail(f"Cannot resign: {e}")
+            return
+        print(f"{self.game.get_current_player()} resigns. {self.game.winner} wins!")
 
     def cmd_save(self, args):
         if not self.game:
-            print("No active game.")
+            self.fail("No active game.")
             return
         if len(args) != 1:
-            print("Usage: save <filename>")
+            self.fail("Usage: save <filename>")
             return
         
+        from utils.storage import save_game
         success, msg = save_game(self.game, args[0])
-        print(msg)
+        if success:
+            print(msg)
+        else:
+            self.fail(msg)
 
     def cmd_load(self, args):
         if len(args) != 1:
-            print("Usage: load <filename>")
+            self.fail("Usage: load <filename>")
             return
         
+        from utils.storage import load_game
         game, msg = load_game(args[0])
         if game:
             self.game = game
+            self.reset_engine()
             print(msg)
+            self.follow_journal()
             self.print_board()
             self.check_game_over()
+            self.ai_move()
         else:
-            print(msg)
+            self.fail(msg)
+
+    def cmd_journal(self, args):
+        if len(args) != 1:
+            self.fail("Usage: journal <filename|off>")
+            return
+        if args[0].lower() == 'off':
+            self.stop_journal()
+            print("Journal off.")
+            return
+        self.set_journal(args[0])
+
+    def set_journal(self, path):
+        """Autosaves the current game, and every game started after it, to path."""
+        from utils.journal import Journal
+        self.stop_journal()
+        if os.path.exists(path) and not self.game:
+            print(f"'{path}' will be replaced by the next game; 'load {path}' recovers its game.")
+        self.journal = Journal(path)
+        print(f"Journaling moves to {path}.")
+        self.follow_journal()
+
+    def follow_journal(self):
+        """Starts the journal over for the current game, if journaling is on."""
+        if self.journal and self.game:
+            try:
+                self.journal.start(self.game)
+            except OSError as e:
+                self.journal = None
+                self.fail(f"Journal off: {e}")
+
+    def stop_journal(self):
+        if self.journal:
+            self.journal.close()
+            self.journal = None
 
     def cmd_hints(self, args):
         if len(args) != 1:
-            print("Usage: hints <on|off>")
+            self.fail("Usage: hints <on|off>")
             return
         mode = args[0].lower()
         if mode == 'on':
@@ -211,7 +349,125 @@ class CLI:
             self.show_hints = False
             print("Hints disabled.")
         else:
-            print("Invalid option.")
+            self.fail("Invalid option.")
+
+    def cmd_ai(self, args):
+        if len(args) not in (1, 2):
+            self.fail("Usage: ai <black|white|off> [seconds]")
+            return
+        side = args[0].lower()
+        if side == 'off':
+            self.ai_player = None
+            print("Computer player disabled.")
+            return
+        if side not in ('black', 'white'):
+            self.fail("Invalid option.")
+            return
+        seconds = self.ai_time
+        if len(args) == 2:
+            try:
+                seconds = float(args[1])
+            except ValueError:
+                self.fail("Seconds must be a number.")
+                return
+            # Also rules out nan and inf
+            if not 0 < seconds < float('inf'):
+                self.fail("Seconds must be positive.")
+                return
+        self.ai_time = seconds
+        self.ai_player = Player.BLACK if side == 'black' else Player.WHITE
+        self.reset_engine()
+        print(f"Computer plays {self.ai_player} ({self.ai_time:g}s per move).")
+        self.ai_move()
+
+    def cmd_book(self, args):
+        if len(args) != 1:
+            self.fail("Usage: book <filename|off>")
+            return
+        if self.book is not None:
+            self.book.close()
+            self.book = None
+        if args[0].lower() != 'off':
+            from utils.book import OpeningBook
+            try:
+                self.book = OpeningBook(args[0])
+            except (OSError, ValueError) as e:
+                self.fail(f"Cannot open book: {e}")
+                return
+            print(f"Opening book loaded ({len(self.book)} entries).")
+        else:
+            print("Opening book disabled.")
+        self.reset_engine()
+        if self.game:
+            self.print_board()
+
+    def cmd_stats(self, args):
+        if not args:
+            if not profiling.enabled() and not profiling.stats():
+                print("Profiling is off. Use 'stats on' to start counting.")
+                return
+            print(profiling.report(self.game))
+            return
+        mode = args[0].lower()
+        if mode in ('on', 'trace') and len(args) == 1:
+            profiling.enable(trace=mode == 'trace')
+            print("Profiling enabled" + (" with trace events." if mode == 'trace' else "."))
+        elif mode == 'off' and len(args) == 1:
+            profiling.disable()
+            print("Profiling disabled.")
+        elif mode == 'reset' and len(args) == 1:
+            profiling.reset()
+            print("Profiling counters cleared.")
+        elif mode == 'save' and len(args) == 2:
+            try:
+                profiling.dump(args[1], self.game)
+            except OSError as e:
+                self.fail(f"Cannot save stats: {e}")
+                return
+            print(f"Stats saved to {args[1]}.")
+        else:
+            self.fail("Usage: stats [on|trace|off|reset|save <file>]")
+
+    def make_engine(self):
+        """Returns an engine for the current game type, or None if there is none."""
+        kind = self.game.kind if self.game else None
+        if kind == 'gomoku':
+            from ai.gomoku_ai import GomokuAI
+            engine = GomokuAI(time_limit=self.ai_time)
+        elif kind == 'go':
+            from ai.go_mcts import GoMCTS
+            engine = GoMCTS(time_limit=self.ai_time, komi=self.game.komi)
+        else:
+            return None
+        engine.book = self.book
+        return engine
+
+    def reset_engine(self):
+        if self.ai_engine is not None:
+            self.ai_engine.close()
+            self.ai_engine = None
+
+    def ai_move(self):
+        """Lets the computer move if it is its turn."""
+        if (not self.game or self.game.is_game_over()
+                or self.ai_player != self.game.get_current_player()):
+            return
+        if self.ai_engine is None:
+            self.ai_engine = self.make_engine()
+            if self.ai_engine is None:
+                self.fail("No computer player for this game type.")
+                return
+        move = self.ai_engine.select_move(self.game)
+        info = self.ai_engine.info
+        if move is None:
+            self.game.pass_turn()
+            print(f"Computer ({self.ai_player}) passes.")
+        else:
+            self.game.place_stone(*move)
+            print(f"Computer ({self.ai_player}) plays {move[0] + 1} {move[1] + 1}"
+                  f" (depth {info.depth}, {info.nps} nodes/s)")
+            self.print_board()
+        self.check_game_over()
 
     def check_game_over(self):
         if self.game.is_game_over():
@@ -221,8 +477,79 @@ class CLI:
             else:
                 print("Game Over! Draw.")
 
-    def print_board(self):
-        if not self.game:
+    def fail(self, message):
+        """Prints why a command failed and records it for the script summary."""
+        print(message)
+        self.errors.append((self.line_number, message))
+
+    def run_script(self, lines, out=None, board='end', quiet=False):
+        """Runs commands without prompting and returns summary().
+
+        Blank lines and '#' comments are skipped; 'exit' ends the script. Output is
+        collected in memory and written to out (default stdout) in large chunks.
+        board is 'always' to print it after every move as interactively, 'end' to
+        print it once when the script finishes, or 'none'. quiet drops all output.
+        """
+        out = out or sys.stdout
+        self.auto_board = board == 'always'
+        import contextlib
+        buf = None if quiet else io.StringIO()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(buf):
+            for number, line in enumerate(lines, 1):
+                line = line.split('#', 1)[0].strip()
+                if not line:
+                    continue
+                self.line_number = number
+                self.commands += 1
+                try:
+                    self.process_command(line)
+                except Exception as e:
+                    self.fail(f"Error: {e}")
+                if buf is not None and buf.tell() > 1 << 16:
+                    out.write(buf.getvalue())
+                    buf.seek(0)
+                    buf.truncate()
+                if not self.running:
+                    break
+            self.line_number = None
+            if board == 'end' and self.game:
+                self.print_board(force=True)
+        if buf is not None:
+            out.write(buf.getvalue())
+        summary = self.summary()
+        summary['seconds'] = round(time.perf_counter() - start, 6)
+        return summary
+
+    def summary(self):
+        """Machine-readable state: commands run, failures and the current game."""
+        summary = {
+            'commands': self.commands,
+            'errors': [{'line': n, 'message': m} for n, m in self.errors],
+            'game': None,
+        }
+        game = self.game
+        if game:
+            over = game.is_game_over()
+            winner = game.check_winner() if over else None
+            summary.update({
+                'game': game.kind,
+                'size': game.board_size,
+                'moves': len(game.move_list()),
+                'to_move': str(game.get_current_player()).lower(),
+                'over': over,
+                'winner': str(winner).lower() if winner else None,
+                'hash': f"{game.position_hash():016x}",
+            })
+            if game.kind == 'go':
+                black, white = game.score()
+                summary['captures'] = {'black': game.captured_stones[Player.BLACK],
+                                       'white': game.captured_stones[Player.WHITE]}
+                summary['score'] = {'black': black, 'white': white, 'komi': game.komi}
+        return summary
+
+    def print_board(self, force=False):
+        if not self.game or not (self.auto_board or force):
             return
         
         b = self.game.get_board()
@@ -248,8 +575,16 @@ class CLI:
         
         if self.show_hints and not self.game.is_game_over():
             print(f"Turn: {self.game.get_current_player()} ({self.game.get_current_player().symbol().strip()})")
-            if isinstance(self.game, GoGame):
+            if self.game.kind == 'go':
                 print(f"Captures - Black: {self.game.captured_stones[Player.BLACK]}, White: {self.game.captured_stones[Player.WHITE]}")
+                black, white = self.game.score()
+                print(f"Score (area, komi {self.game.komi:g}) - Black: {black:g}, White: {white:g}")
+            if self.book is not None:
+                entries = self.book.moves(self.game)[:3]
+                if entries:
+                    print("Book: " + ", ".join(
+                        ("pass" if e.move is None else f"{e.move[0] + 1} {e.move[1] + 1}")
+                        + f" ({e.games} games, {e.score:.0%})" for e in entries))
 
 if __name__ == "__main__":
     CLI().start()
@@ -0,0 +1,294 @@
+"""Go Text Protocol (version 2) front end for GoGame.
+
+One process serves any number of games back to back: a match manager or GUI
+sends commands on stdin and reads responses on stdout. Vertices are GTP style,
+column letter (A-T without I) then row number counted from the bottom, so D4 is
+(row size - 4, col 3) in GoGame coordinates.
+"""
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.go import GoGame
+from game.player import Player
+from game.exceptions import GameError
+
+_COLUMNS = 'ABCDEFGHJKLMNOPQRST'
+_COLORS = {'b': Player.BLACK, 'black': Player.BLACK, 'w': Player.WHITE, 'white': Player.WHITE}
+
+class GTPError(Exception):
+    pass
+
+class GTP:
+    name = "oop-big-homework"
+    version = "1.0"
+
+    def __init__(self, engine='mcts:1', size=19, komi=7.5, ko_rule='simple'):
+        self.engine_spec = engine
+        self.engine = None # made on the first genmove
+        self.ko_rule = ko_rule
+        self.running = True
+        self.game = GoGame(size, ko_rule, komi=komi)
+        # Move numbers of passes added so a side could move twice; see _hand_turn
+        self._added_passes = set()
+        self._set_size(size)
+        self.commands = {
+            'protocol_version': self.cmd_protocol_version, 'name': self.cmd_name,
+            'version': self.cmd_version, 'known_command': self.cmd_known_command,
+            'list_commands': self.cmd_list_commands, 'quit': self.cmd_quit,
+            'boardsize': self.cmd_boardsize, 'clear_board': self.cmd_clear_board,
+            'komi': self.cmd_komi, 'play': self.cmd_play, 'genmove': self.cmd_genmove,
+            'reg_genmove': self.cmd_reg_genmove, 'undo': self.cmd_undo,
+            'final_score': self.cmd_final_score, 'showboard': self.cmd_showboard,
+            'loadsgf': self.cmd_loadsgf, 'printsgf': self.cmd_printsgf,
+            'time_settings': self.cmd_ignore, 'time_left': self.cmd_ignore,
+        }
+
+    def _set_size(self, size):
+        # Vertex <-> point lookup tables, so parsing a move is one dict access
+        self.size = size
+        self._points = {'PASS': None}
+        self._vertices = {None: 'pass'}
+        for r in range(size):
+            for c in range(size):
+                vertex = f"{_COLUMNS[c]}{size - r}"
+                self._points[vertex] = (r, c)
+                self._vertices[(r, c)] = vertex
+
+    def run(self, infile=None, outfile=None):
+        """Answers commands from infile until quit or end of input."""
+        infile = infile or sys.stdin
+        outfile = outfile or sys.stdout
+        for line in infile:
+            response = self.handle(line)
+            if response is not None:
+                outfile.write(response)
+                outfile.flush()
+            if not self.running:
+                break
+        if self.engine is not None:
+            self.engine.close()
+
+    def handle(self, line):
+        """Full response text for one input line, or None for blank and comment lines."""
+        line = line.split('#', 1)[0].replace('\t', ' ').strip()
+        if not line:
+            return None
+        parts = line.split()
+        cmd_id = ''
+        if parts[0].isdigit():
+            cmd_id = parts.pop(0)
+            if not parts:
+                return f"?{cmd_id} missing command\n\n"
+        handler = self.commands.get(parts[0].lower())
+        if handler is None:
+            return f"?{cmd_id} unknown command\n\n"
+        try:
+            result = handler(parts[1:])
+        except GTPError as e:
+            return f"?{cmd_id} {e}\n\n"
+        except Exception:
+            # A bug must not end the session the controller is running
+            return f"?{cmd_id} internal error\n\n"
+        return f"={cmd_id} {result}\n\n" if result else f"={cmd_id}\n\n"
+
+    def _color(self, text):
+        player = _COLORS.get(text.lower())
+        if player is None:
+            raise GTPError("invalid color")
+        return player
+
+    def _point(self, text):
+        try:
+            return self._points[text.upper()]
+        except KeyError:
+            raise GTPError("invalid vertex")
+
+    def _hand_turn(self, player):
+        """Makes it player's turn. GTP lets a side move twice in a row (e.g. handicap
+        stones) but GoGame alternates, so the other side passes first; the pass is
+        a real move, so undo, superko and SGF colours stay right. Returns the pass's
+        token for _take_back() if the move that follows fails, else None."""
+        game = self.game
+        if game.is_game_over():
+            raise GTPError("game is over")
+        if player == game.current_player:
+            return None
+        last = game.last_move()
+        if last is not None and last.point is None:
+            # The added pass would be the second in a row and end the game
+            raise GTPError("cannot move twice in a row after a pass")
+        return game.play(None)
+
+    def _take_back(self, passed):
+        if passed is not None:
+            self.game.unplay(passed)
+
+    def _keep(self, passed):
+        # The pass stays, as the move before the one just played
+        if passed is not None:
+            self._added_passes.add(self.game.move_number() - 2)
+
+    def _new_game(self, game):
+        self.game = game
+        self._added_passes = set()
+
+    def cmd_protocol_version(self, args):
+        return "2"
+
+    def cmd_name(self, args):
+        return self.name
+
+    def cmd_version(self, args):
+        return self.version
+
+    def cmd_known_command(self, args):
+        return "true" if args and args[0].lower() in self.commands else "false"
+
+    def cmd_list_commands(self, args):
+        return "\n".join(self.commands)
+
+    def cmd_quit(self, args):
+        self.running = False
+        return ""
+
+    def cmd_boardsize(self, args):
+        try:
+            size = int(args[0])
+            game = GoGame(size, self.ko_rule, komi=self.game.komi)
+        except (IndexError, ValueError, GameError):
+            raise GTPError("unacceptable size")
+        self._new_game(game)
+        self._set_size(size)
+        return ""
+
+    def cmd_clear_board(self, args):
+        # An empty GoGame shares its size's lookup tables, so this is cheap
+        self._new_game(self.game.new_game())
+        return ""
+
+    def cmd_komi(self, args):
+        try:
+            komi = float(args[0])
+        except (IndexError, ValueError):
+            raise GTPError("syntax error")
+        self.game.komi = komi
+        return ""
+
+    def cmd_play(self, args):
+        if len(args) != 2:
+            raise GTPError("syntax error")
+        player = self._color(args[0])
+        point = self._point(args[1])
+        passed = self._hand_turn(player)
+        if self.game.play(point) is None:
+            self._take_back(passed)
+            raise GTPError("illegal move")
+        self._keep(passed)
+        return ""
+
+    def _search_color(self, args):
+        if len(args) != 1:
+            raise GTPError("syntax error")
+        return self._color(args[0])
+
+    def _search(self):
+        if self.engine is None:
+            from utils.tournament import make_engine
+            self.engine = make_engine(self.engine_spec)
+        if hasattr(self.engine, 'komi'):
+            self.engine.komi = self.game.komi
+        return self.engine.select_move(self.game)
+
+    def cmd_genmove(self, args):
+        player = self._search_color(args)
+        if self.game.is_game_over():
+            return "pass"
+        passed = self._hand_turn(player)
+        try:
+            move = self._search()
+        except Exception:
+            self._take_back(passed)
+            raise
+        if self.game.play(move) is None:
+            # Never lose on an engine bug; passing is always legal
+            move = None
+            self.game.play(None)
+        self._keep(passed)
+        return self._vertices[move]
+
+    def cmd_reg_genmove(self, args):
+        player = self._search_color(args)
+        if self.game.is_game_over():
+            return "pass"
+        passed = self._hand_turn(player)
+        try:
+            return self._vertices[self._search()]
+        finally:
+            self._take_back(passed)
+
+    def cmd_undo(self, args):
+        game = self.game
+        try:
+            game.undo()
+        except GameError:
+            raise GTPError("cannot undo")
+        # A pass added before the move goes with it
+        if game.move_number() - 1 in self._added_passes:
+            self._added_passes.discard(game.move_number() - 1)
+            game.undo()
+        return ""
+
+    def cmd_final_score(self, args):
+        black, white = self.game.score()
+        if black == white:
+            return "0"
+        winner = "B" if black > white else "W"
+        return f"{winner}+{abs(black - white):g}"
+
+    def cmd_showboard(self, args):
+        game = self.game
+        n = self.size
+        header = "   " + " ".join(_COLUMNS[:n])
+        rows = [header]
+        for r in range(n):
+            cells = []
+            for c in range(n):
+                p = game.board.get(r, c)
+                cells.append('.' if p is None else p.symbol())
+            rows.append(f"{n - r:>2} " + " ".join(cells))
+        rows.append(header)
+        return "\n" + "\n".join(rows)
+
+    def cmd_loadsgf(self, args):
+        if not args:
+            raise GTPError("syntax error")
+        from utils.sgf import load_sgf
+        try:
+            game = load_sgf(args[0], ko_rule=self.ko_rule)
+        except (OSError, ValueError):
+            raise GTPError("cannot load file")
+        if game.kind != 'go':
+            raise GTPError("cannot load file")
+        if len(args) > 1:
+            # Position before move number args[1]
+            try:
+                keep = max(0, int(args[1]) - 1)
+            except ValueError:
+                raise GTPError("syntax error")
+            while len(game.move_list()) > keep:
+                game.undo()
+        self._new_game(game)
+        self._set_size(game.board_size)
+        return ""
+
+    def cmd_printsgf(self, args):
+        from utils.sgf import game_to_sgf
+        return game_to_sgf(self.game).rstrip("\n")
+
+    def cmd_ignore(self, args):
+        return ""
+
+if __name__ == "__main__":
+    GTP().run()
@@ -6,11 +6,12 @@ import os
 # Ensure src is in path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from game.go import GoGame
-from game.gomoku import GomokuGame
 from game.player import Player
 from game.exceptions import GameError, InvalidMoveError
-from utils.storage import save_game, load_game
+from ai.background import BackgroundSearch
+
+# Game variants, engines, storage and the opening book are imported when first
+# used, so the main menu appears without loading them.
 
 class BoardGameGUI:
     def __init__(self, root):
@@ -21,6 +22,13 @@ class BoardGameGUI:
         self.margin = 40
         self.stone_radius = 15
         self.board_size = 15 # Default
+        self.ai_player = None # Player the computer plays, or None
+        self.ai_engine = None
+        self.search = None # BackgroundSearch running ai_engine off the Tk thread
+        self.ponder = True # Think on the human's time about the expected reply
+        self.poll_ms = 100
+        self._poll_id = None
+        self.book = None
         
         # UI Components
         self.main_frame = tk.Frame(self.root)
@@ -29,6 +37,7 @@ class BoardGameGUI:
         self.show_main_menu()
 
     def show_main_menu(self):
+        self.cancel_search()
         for widget in self.main_frame.winfo_children():
             widget.destroy()
             
@@ -40,25 +49,35 @@ class BoardGameGUI:
         
         tk.Button(btn_frame, text="New Go Game", command=lambda: self.start_game_setup('go'), width=20, height=2).pack(pady=10)
         tk.Button(btn_frame, text="New Gomoku Game", command=lambda: self.start_game_setup('gomoku'), width=20, height=2).pack(pady=10)
+        tk.Button(btn_frame, text="Go vs Computer", command=lambda: self.start_game_setup('go', ai_player=Player.WHITE), width=20, height=2).pack(pady=10)
+        tk.Button(btn_frame, text="Gomoku vs Computer", command=lambda: self.start_game_setup('gomoku', ai_player=Player.WHITE), width=20, height=2).pack(pady=10)
         tk.Button(btn_frame, text="Load Game", command=self.load_game_dialog, width=20, height=2).pack(pady=10)
         tk.Button(btn_frame, text="Exit", command=self.root.quit, width=20, height=2).pack(pady=10)
 
-    def start_game_setup(self, game_type):
+    def start_game_setup(self, game_type, ai_player=None):
         # Ask for board size
         size = simpledialog.askinteger("Board Size", "Enter board size (8-19):", minvalue=8, maxvalue=19, initialvalue=15 if game_type=='gomoku' else 19)
         if size:
-            self.start_game(game_type, size)
+            self.start_game(game_type, size, ai_player)
 
-    def start_game(self, game_type, size):
+    def start_game(self, game_type, size, ai_player=None):
         try:
             if game_type == 'go':
+                from game.go import GoGame
                 self.game = GoGame(size)
             else:
+                from game.gomoku import GomokuGame
                 self.game = GomokuGame(size)
             self.board_size = size
+            self.ai_player = ai_player
+            self.reset_engine()
+            if ai_player:
+                self.ai_engine = self.make_engine()
+                self.search = BackgroundSearch(self.ai_engine)
             self.setup_game_ui()
             self.draw_board()
             self.update_status()
+            self.schedule_ai_move()
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
@@ -73,11 +92,18 @@ class BoardGameGUI:
         tk.Button(control_frame, text="Main Menu", command=self.show_main_menu).pack(side=tk.LEFT, padx=5)
         tk.Button(control_frame, text="Undo", command=self.undo_move).pack(side=tk.LEFT, padx=5)
         
-        if isinstance(self.game, GoGame):
+        if self.game.kind == 'go':
             tk.Button(control_frame, text="Pass", command=self.pass_turn).pack(side=tk.LEFT, padx=5)
             
         tk.Button(control_frame, text="Save", command=self.save_game_dialog).pack(side=tk.LEFT, padx=5)
         tk.Button(control_frame, text="Restart", command=self.restart_game).pack(side=tk.LEFT, padx=5)
+        tk.Button(control_frame, text="Book", command=self.load_book_dialog).pack(side=tk.LEFT, padx=5)
+
+        # Review: first, previous, next and last move
+        tk.Button(control_frame, text=">|", command=lambda: self.review_to(self.game.review_length())).pack(side=tk.RIGHT)
+        tk.Button(control_frame, text=">", command=lambda: self.review_to(self.game.move_number() + 1)).pack(side=tk.RIGHT)
+        tk.Button(control_frame, text="<", command=lambda: self.review_to(self.game.move_number() - 1)).pack(side=tk.RIGHT)
+        tk.Button(control_frame, text="|<", command=lambda: self.review_to(0)).pack(side=tk.RIGHT)
 
         # Status Bar
         self.status_label = tk.Label(self.main_frame, text="Welcome", font=("Arial", 12), bd=1, relief=tk.SUNKEN, anchor=tk.W)
@@ -92,6 +118,11 @@ class BoardGameGUI:
         self.canvas.bind("<Button-1>", self.on_canvas_click)
 
     def draw_board(self):
+        """Draws the static grid once, with a hidden stone item on every intersection.
+
+        Afterwards refresh_board only reconfigures the items whose intersection
+        changed, so a move costs a few canvas calls whatever the board size.
+        """
         self.canvas.delete("all")
         
         # Draw grid
@@ -101,24 +132,31 @@ class BoardGameGUI:
         for i in range(self.board_size):
             # Vertical
             x = self.margin + i * self.cell_size
-            self.canvas.create_line(x, self.margin, x, self.margin + height)
+            self.canvas.create_line(x, self.margin, x, self.margin + height, tags="grid")
             # Horizontal
             y = self.margin + i * self.cell_size
-            self.canvas.create_line(self.margin, y, self.margin + width, y)
+            self.canvas.create_line(self.margin, y, self.margin + width, y, tags="grid")
             
         # Draw Hoshi (Stars) for standard sizes
         if self.board_size in [19, 13, 9]:
             self.draw_hoshi()
             
-        # Draw Stones
-        board = self.game.get_board()
+        # One stone item per intersection, shown and coloured as stones come and go
+        self.stone_items = {}
+        self.shown = {}
+        radius = self.stone_radius
         for r in range(self.board_size):
             for c in range(self.board_size):
-                stone = board.get(r, c)
-                if stone:
-                    self.draw_stone(r, c, stone)
-                    
-        # Highlight last move? (Optional, but good for UX)
+                x = self.margin + c * self.cell_size
+                y = self.margin + r * self.cell_size
+                self.stone_items[(r, c)] = self.canvas.create_oval(
+                    x - radius, y - radius, x + radius, y + radius,
+                    outline="black", state=tk.HIDDEN, tags=("stone", f"stone_{r}_{c}"))
+                self.shown[(r, c)] = None
+        # Last-move marker, moved around rather than recreated
+        self.last_marker = self.canvas.create_oval(0, 0, 0, 0, fill="red", outline="",
+                                                   state=tk.HIDDEN, tags="last")
+        self.refresh_board()
 
     def draw_hoshi(self):
         # Standard star points
@@ -134,19 +172,53 @@ class BoardGameGUI:
             x = self.margin + c * self.cell_size
             y = self.margin + r * self.cell_size
             r_dot = 3
-            self.canvas.create_oval(x-r_dot, y-r_dot, x+r_dot, y+r_dot, fill="black")
+            self.canvas.create_oval(x-r_dot, y-r_dot, x+r_dot, y+r_dot, fill="black", tags="hoshi")
+
+    def refresh_board(self, points=None):
+        """Brings the stone items in line with the game.
+
+        points lists the intersections that may have changed, e.g. from move_points;
+        by default every intersection is compared. Only items whose stone differs
+        from what is shown are touched.
+        """
+        board = self.game.get_board()
+        if points is None:
+            points = self.stone_items
+        for point in points:
+            stone = board.get(*point)
+            if self.shown[point] != stone:
+                self.draw_stone(point, stone)
+        self.draw_last_move()
+
+    def draw_stone(self, point, player):
+        """Shows the stone of player at point, or hides it for None."""
+        item = self.stone_items[point]
+        if player is None:
+            self.canvas.itemconfigure(item, state=tk.HIDDEN)
+        else:
+            # "Picture display" - simulated with high quality oval rendering
+            color = "black" if player == Player.BLACK else "white"
+            self.canvas.itemconfigure(item, fill=color, state=tk.NORMAL)
+        self.shown[point] = player
 
-    def draw_stone(self, r, c, player):
+    def draw_last_move(self):
+        record = self.game.last_move()
+        if record is None or record.point is None:
+            self.canvas.itemconfigure(self.last_marker, state=tk.HIDDEN)
+            return
+        r, c = record.point
         x = self.margin + c * self.cell_size
         y = self.margin + r * self.cell_size
-        
-        color = "black" if player == Player.BLACK else "white"
-        outline = "black" # White stone needs outline
-        
-        # "Picture display" - simulated with high quality oval rendering
-        self.canvas.create_oval(x - self.stone_radius, y - self.stone_radius,
-                                x + self.stone_radius, y + self.stone_radius,
-                                fill=color, outline=outline)
+        d = 4
+        self.canvas.coords(self.last_marker, x - d, y - d, x + d, y + d)
+        self.canvas.itemconfigure(self.last_marker, state=tk.NORMAL)
+
+    @staticmethod
+    def move_points(record):
+        """Intersections a move changed: the stone played and the stones it captured."""
+        if record is None or record.point is None:
+            return []
+        return [record.point, *record.captured]
 
     def on_canvas_click(self, event):
         if not self.game or self.game.is_game_over():
@@ -159,15 +231,19 @@ class BoardGameGUI:
         col = round((event.x - self.margin) / self.cell_size)
         row = round((event.y - self.margin) / self.cell_size)
         
+        if self.ai_player == self.game.get_current_player():
+            return # Computer's turn
+        
         if 0 <= row < self.board_size and 0 <= col < self.board_size:
             self.make_move(row, col)
 
     def make_move(self, row, col):
         try:
             self.game.place_stone(row, col)
-            self.draw_board()
+            self.refresh_board(self.move_points(self.game.last_move()))
             self.check_game_over()
             self.update_status()
+            self.schedule_ai_move()
         except InvalidMoveError as e:
             messagebox.showwarning("Invalid Move", str(e))
         except Exception as e:
@@ -175,37 +251,62 @@ class BoardGameGUI:
 
     def undo_move(self):
         if not self.game: return
+        self.cancel_search()
         try:
+            changed = self.move_points(self.game.last_move())
             self.game.undo()
-            self.draw_board()
+            # Against the computer, take back its reply as well as our move
+            if self.ai_player == self.game.get_current_player() and self.game.history:
+                changed += self.move_points(self.game.last_move())
+                self.game.undo()
+            self.refresh_board(changed)
             self.update_status()
         except GameError as e:
             messagebox.showinfo("Undo", str(e))
 
+    def review_to(self, move_number):
+        """Shows the position after move_number moves; clicking the board from there
+        plays a new line. The computer only moves again at the end of the game."""
+        if not self.game: return
+        self.cancel_search()
+        move_number = max(0, min(move_number, self.game.review_length()))
+        try:
+            self.game.goto(move_number)
+        except GameError as e:
+            messagebox.showinfo("Review", str(e))
+            return
+        self.refresh_board()
+        self.update_status()
+        if move_number == self.game.review_length():
+            self.schedule_ai_move()
+
     def pass_turn(self):
-        if not isinstance(self.game, GoGame): return
+        if self.game is None or self.game.kind != 'go': return
+        if self.ai_player == self.game.get_current_player():
+            return # Computer's turn
         try:
             self.game.pass_turn()
+            self.refresh_board([])
             self.update_status()
             self.check_game_over()
+            self.schedule_ai_move()
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
     def restart_game(self):
         if not self.game: return
         if messagebox.askyesno("Restart", "Are you sure you want to restart?"):
-            size = self.game.board_size
-            if isinstance(self.game, GoGame):
-                self.game = GoGame(size)
-            else:
-                self.game = GomokuGame(size)
-            self.draw_board()
+            self.cancel_search()
+            self.game = self.game.new_game()
+            self.refresh_board()
             self.update_status()
+            self.schedule_ai_move()
 
     def save_game_dialog(self):
         if not self.game: return
-        filename = filedialog.asksaveasfilename(defaultextension=".pkl", filetypes=[("Pickle Files", "*.pkl")])
+        filename = filedialog.asksaveasfilename(defaultextension=".sav", filetypes=[("Saved Games", "*.sav"), ("SGF Files", "*.sgf"), ("All Files", "*.*")])
         if filename:
+            from utils.storage import save_game
             success, msg = save_game(self.game, filename)
             if success:
                 messagebox.showinfo("Save", msg)
@@ -213,11 +314,14 @@ class BoardGameGUI:
                 messagebox.showerror("Save Error", msg)
 
     def load_game_dialog(self):
-        filename = filedialog.askopenfilename(filetypes=[("Pickle Files", "*.pkl")])
+        filename = filedialog.askopenfilename(filetypes=[("Saved Games", "*.sav"), ("SGF Files", "*.sgf"), ("All Files", "*.*")])
         if filename:
+            from utils.storage import load_game
             game, msg = load_game(filename)
             if game:
                 self.game = game
+                self.ai_player = None
+                self.reset_engine()
                 self.board_size = game.board_size
                 self.setup_game_ui()
                 self.draw_board()
@@ -226,15 +330,128 @@ class BoardGameGUI:
             else:
                 messagebox.showerror("Load Error", msg)
 
+    def load_book_dialog(self):
+        filename = filedialog.askopenfilename(filetypes=[("Opening Books", "*.book"), ("All Files", "*.*")])
+        if filename:
+            from utils.book import OpeningBook
+            try:
+                book = OpeningBook(filename)
+            except (OSError, ValueError) as e:
+                messagebox.showerror("Book Error", str(e))
+                return
+            if self.book is not None:
+                self.book.close()
+            self.book = book
+            if self.ai_engine is not None:
+                self.ai_engine.book = book
+            self.update_status()
+
+    def make_engine(self):
+        kind = self.game.kind if self.game else None
+        if kind == 'gomoku':
+            from ai.gomoku_ai import GomokuAI
+            engine = GomokuAI(time_limit=1.0)
+        elif kind == 'go':
+            from ai.go_mcts import GoMCTS
+            engine = GoMCTS(time_limit=2.0, komi=self.game.komi)
+        else:
+            return None
+        engine.book = self.book
+        return engine
+
+    def reset_engine(self):
+        self.cancel_search()
+        self.search = None
+        if self.ai_engine is not None:
+            self.ai_engine.close()
+            self.ai_engine = None
+
+    def cancel_search(self):
+        """Stops the computer's search or pondering, e.g. on undo or restart."""
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        if self.search is not None:
+            self.search.cancel()
+
+    def schedule_ai_move(self):
+        """Starts the computer's search in the background if it is its turn.
+
+        When the human played the move the computer was pondering on, the running
+        search is kept instead, so the reply arrives sooner.
+        """
+        if self.search is None:
+            return
+        if self.game.is_game_over():
+            self.cancel_search()
+            return
+        if self.ai_player != self.game.get_current_player():
+            return
+        if not self.search.adopt(self.game):
+            self.search.start(self.game)
+        self.status_label.config(text="Computer is thinking...")
+        self._poll_id = self.root.after(self.poll_ms, self.poll_search)
+
+    def poll_search(self):
+        """Runs on the Tk thread: shows search progress, plays the move once found."""
+        self._poll_id = None
+        search = self.search
+        if search is None or search.pondering:
+            return
+        if not search.done():
+            info = search.info
+            text = "Computer is thinking..."
+            if info is not None:
+                best = "pass" if info.best_move is None else f"({info.best_move[0] + 1},{info.best_move[1] + 1})"
+                text += f" best {best}, depth {info.depth}, {info.nps} nodes/s"
+            self.status_label.config(text=text)
+            self._poll_id = self.root.after(self.poll_ms, self.poll_search)
+            return
+        if search.error is not None:
+            messagebox.showerror("Error", f"Computer player failed: {search.error}")
+            return
+        if not search.is_for(self.game):
+            # The position changed under the search; its move belongs to another one
+            self.schedule_ai_move()
+            return
+        info = search.info
+        try:
+            if search.move is None:
+                self.game.pass_turn()
+            else:
+                self.game.place_stone(*search.move)
+        except GameError as e:
+            messagebox.showerror("Error", f"Computer played an invalid move: {e}")
+            return
+        self.refresh_board(self.move_points(self.game.last_move()))
+        self.update_status()
+        self.check_game_over()
+        # Guess the human's answer from the principal variation and think on it
+        if (self.ponder and not self.game.is_game_over()
+                and info is not None and info.pv and len(info.pv) > 1):
+            search.ponder(self.game, info.pv[1])
+
     def update_status(self):
         if not self.game: return
         player = self.game.get_current_player()
         text = f"Current Player: {player}"
         
-        if isinstance(self.game, GoGame):
+        if self.game.kind == 'go':
             # Show captures
             caps = self.game.captured_stones
             text += f" | Captures: B={caps[Player.BLACK]} W={caps[Player.WHITE]}"
+            black, white = self.game.score()
+            text += f" | Score: B={black:g} W={white:g}"
+
+        if self.game.move_number() < self.game.review_length():
+            text += f" | Review: move {self.game.move_number()} of {self.game.review_length()}"
+
+        if self.book is not None:
+            entries = self.book.moves(self.game)[:3]
+            if entries:
+                text += " | Book: " + ", ".join(
+                    ("pass" if e.move is None else f"({e.move[0] + 1},{e.move[1] + 1})")
+                    + f" {e.score:.0%}" for e in entries)
             
         if self.game.is_game_over():
              winner = self.game.check_winner()
@@ -0,0 +1,222 @@
+"""Opening book: next-move statistics for every position seen in a set of games.
+
+A book file is a header followed by fixed-size records sorted by (position hash,
+move). Each record holds how often the move was played from that position and the
+points it scored for the player who made it. OpeningBook opens the file with mmap
+and binary-searches it, so lookups cost a few microseconds however large the book
+is and nothing is read into memory up front. BookBuilder collects records in memory
+and spills sorted runs to temporary files once run_size entries accumulate; close()
+merges the runs into the final file, so building scales to millions of positions.
+"""
+import heapq
+import mmap
+import struct
+import tempfile
+from collections import namedtuple
+from utils.sgf import iter_game_texts, parse_main_line, game_from_nodes
+from utils.storage import load_game
+from game.exceptions import GameError
+
+# move is (row, col) or None for a pass; score is the mover's average, 1 win, 0.5 draw
+BookMove = namedtuple('BookMove', ['move', 'games', 'score'])
+
+MAGIC = b'OOPB'
+VERSION = 1
+_HEADER = struct.Struct('<4sBBBxQ')
+# position hash, move (row * size + col + 1, 0 for a pass), games, score in half points
+_RECORD = struct.Struct('<QHII')
+_HASH = struct.Struct('<Q')
+_GO, _GOMOKU = 0, 1
+
+def _game_kind(game):
+    return _GO if game.kind == 'go' else _GOMOKU
+
+def iter_positions(game, max_moves=None):
+    """Yields (position hash, encoded move, mover) along the game's moves."""
+    replay = game.new_game()
+    size = game.board_size
+    for i, move in enumerate(game.move_list()):
+        if max_moves is not None and i >= max_moves:
+            break
+        yield replay.position_hash(), 0 if move is None else move[0] * size + move[1] + 1, replay.current_player
+        if move is None:
+            replay.pass_turn()
+        else:
+            replay.place_stone(*move)
+
+class BookBuilder:
+    """Accumulates games into a book file; call close() (or use as a context manager)."""
+
+    def __init__(self, path, max_moves=None, run_size=1_000_000):
+        self.path = path
+        self.max_moves = max_moves
+        self.run_size = run_size
+        self.kind = None
+        self.size = None
+        self.games = 0
+        self.skipped = 0
+        self._stats = {}
+        self._runs = []
+
+    def add_game(self, game):
+        """Adds one game; games of another type or size than the first are skipped."""
+        if self.kind is None:
+            self.kind, self.size = _game_kind(game), game.board_size
+        elif (_game_kind(game), game.board_size) != (self.kind, self.size):
+            self.skipped += 1
+            return False
+        over = game.is_game_over()
+        winner = game.check_winner()
+        stats = self._stats
+        for h, move, mover in iter_positions(game, self.max_moves):
+            # Unfinished games and draws count half a point for both sides
+            points = 2 if over and winner == mover else 0 if over and winner is not None else 1
+            entry = stats.get((h, move))
+            if entry is None:
+                stats[(h, move)] = [1, points]
+            else:
+                entry[0] += 1
+                entry[1] += points
+        self.games += 1
+        if len(stats) >= self.run_size:
+            self._spill()
+        return True
+
+    def _spill(self):
+        f = tempfile.TemporaryFile()
+        pack = _RECORD.pack
+        f.write(b''.join(pack(h, m, g, s) for (h, m), (g, s) in sorted(self._stats.items())))
+        f.seek(0)
+        self._runs.append(f)
+        self._stats = {}
+
+    def _memory_run(self):
+        for (h, m), (g, s) in sorted(self._stats.items()):
+            yield h, m, g, s
+
+    @staticmethod
+    def _file_run(f, chunk_records=4096):
+        size = _RECORD.size
+        while True:
+            chunk = f.read(size * chunk_records)
+            if not chunk:
+                return
+            yield from _RECORD.iter_unpack(chunk)
+
+    def close(self):
+        """Merges everything collected into the book file; returns the record count."""
+        runs = [self._file_run(f) for f in self._runs] + [self._memory_run()]
+        count = 0
+        with open(self.path, 'wb') as out:
+            out.write(_HEADER.pack(MAGIC, VERSION, self.kind or 0, self.size or 0, 0))
+            pending = None
+            batch = []
+            for record in heapq.merge(*runs):
+                if pending is not None and record[:2] == pending[:2]:
+                    pending = (pending[0], pending[1], pending[2] + record[2], pending[3] + record[3])
+                    continue
+                if pending is not None:
+                    batch.append(_RECORD.pack(*pending))
+                    count += 1
+                    if len(batch) >= 4096:
+                        out.write(b''.join(batch))
+                        batch = []
+                pending = record
+            if pending is not None:
+                batch.append(_RECORD.pack(*pending))
+                count += 1
+            out.write(b''.join(batch))
+            out.seek(0)
+            out.write(_HEADER.pack(MAGIC, VERSION, self.kind or 0, self.size or 0, count))
+        for f in self._runs:
+            f.close()
+        self._runs = []
+        self._stats = {}
+        return count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class OpeningBook:
+    """Read-only, memory-mapped view of a book file."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            head = f.read(_HEADER.size)
+            if len(head) < _HEADER.size:
+                raise ValueError("Not an opening book.")
+            magic, version, self.kind, self.size, self.count = _HEADER.unpack(head)
+            if magic != MAGIC:
+                raise ValueError("Not an opening book.")
+            if version != VERSION:
+                raise ValueError(f"Unsupported book version {version}.")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.count else None
+
+    def __len__(self):
+        return self.count
+
+    def lookup(self, position_hash):
+        """All book moves from a position hash, most played first."""
+        mm = self._mm
+        if mm is None:
+            return []
+        base = _HEADER.size
+        step = _RECORD.size
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if _HASH.unpack_from(mm, base + mid * step)[0] < position_hash:
+                lo = mid + 1
+            else:
+                hi = mid
+        found = []
+        while lo < self.count:
+            h, move, games, points = _RECORD.unpack_from(mm, base + lo * step)
+            if h != position_hash:
+                break
+            found.append(BookMove(None if move == 0 else divmod(move - 1, self.size),
+                                  games, points / (2 * games)))
+            lo += 1
+        found.sort(key=lambda m: -m.games)
+        return found
+
+    def moves(self, game):
+        """Book moves for the game's current position ([] for another game type or size)."""
+        if (_game_kind(game), game.board_size) != (self.kind, self.size):
+            return []
+        return self.lookup(game.position_hash())
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+def ingest_file(builder, filename):
+    """Adds every game in a save or SGF file.
+
+    Returns (added, rejected); SGF records that cannot be replayed are rejected
+    one by one instead of stopping the whole file.
+    """
+    added = rejected = 0
+    if filename.lower().endswith('.sgf'):
+        with open(filename, encoding='utf-8', errors='replace') as f:
+            for text in iter_game_texts(f):
+                try:
+                    game = game_from_nodes(parse_main_line(text))
+                except (ValueError, GameError):
+                    rejected += 1
+                    continue
+                if builder.add_game(game):
+                    added += 1
+                else:
+                    rejected += 1
+    else:
+        game, msg = load_game(filename)
+        if game is not None and builder.add_game(game):
+            added += 1
+        else:
+            rejected += 1
+    return added, rejected
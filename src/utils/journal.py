@@ -0,0 +1,188 @@
+import os
+import sys
+import struct
+import time
+from utils.storage import encode_game, decode_game, SaveFormatError, JOURNAL_MAGIC
+from game.exceptions import GameError
+from game import profiling
+
+# Append-only move journal, all integers little-endian:
+#   header   magic, version, length of the settings blob, then the blob: an
+#            encode_game() save of the empty board the game started from
+#   records  4 bytes each: op, 16-bit argument, check byte
+# A MOVE argument is row * size + col, a GOTO argument the move number. The check
+# byte mixes in the record's index, so a torn or half-written last record, or the
+# zeros a crash can leave at the end of a file, are told apart from real records.
+MAGIC = JOURNAL_MAGIC
+VERSION = 1
+_HEADER = struct.Struct('<4sBH')
+_RECORD = struct.Struct('<BHB')
+MOVE, PASS, UNDO, RESIGN, GOTO = 1, 2, 3, 4, 5
+
+# fsync after this many records, or this many seconds after the last fsync
+SYNC_EVERY = 64
+SYNC_INTERVAL = 1.0
+
+def _check(op, arg, index):
+    return (op * 7 + arg * 13 + (arg >> 8) + index * 31 + 0x5A) & 0xFF
+
+def _fsync(fd):
+    # fdatasync skips the metadata a later read does not need; not on every system
+    getattr(os, 'fdatasync', os.fsync)(fd)
+
+class Journal:
+    """Autosave log of one game: every move, pass, undo, resignation and review
+    jump is appended to the file as a 4-byte record the moment it happens.
+
+    Records are written straight to the operating system, so they survive the
+    program being killed; fsync, which makes them survive a power cut too, runs
+    once per sync_every records or sync_interval seconds (group commit) and on
+    sync() and close(). load_journal() replays the file to recover the game.
+    """
+    def __init__(self, path, sync_every=SYNC_EVERY, sync_interval=SYNC_INTERVAL):
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.game = None
+        self.syncs = 0 # fsyncs done, for tests and stats
+        self._fd = None
+        self._size = 0
+        self._count = 0 # records in the file
+        self._unsynced = 0
+        self._last_sync = 0.0
+
+    def start(self, game):
+        """Starts the file over for game and follows it from now on.
+
+        The new file holds the game's settings and the moves played so far (plus a
+        resignation if that is how it ended). During review it holds every move of
+        the game under review and a jump back to the position shown. It is written
+        beside the old one and renamed over it, so a crash part way leaves one or
+        the other whole.
+        """
+        self.close()
+        self._size = game.board_size
+        self._count = 0
+        out = bytearray()
+        line = game.review_moves()
+        for move in line:
+            if move is None:
+                self._pack(out, PASS, 0)
+            else:
+                self._pack(out, MOVE, move[0] * self._size + move[1])
+        if game.move_number() != len(line):
+            self._pack(out, GOTO, game.move_number())
+        if game.game_over and not self._replay_ends(game):
+            self._pack(out, RESIGN, 0)
+        settings = encode_game(game.new_game())
+        tmp = self.path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, len(settings)) + settings + out)
+            f.flush()
+            _fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | getattr(os, 'O_BINARY', 0))
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self.game = game
+        game.journal = self
+
+    def _replay_ends(self, game):
+        """Whether replaying the moves of a finished game finishes it too."""
+        replay = game.new_game()
+        for move in game.move_list():
+            replay.play(move)
+        return replay.game_over
+
+    def _pack(self, out, op, arg):
+        out += _RECORD.pack(op, arg, _check(op, arg, self._count))
+        self._count += 1
+
+    def _append(self, op, arg):
+        os.write(self._fd, _RECORD.pack(op, arg, _check(op, arg, self._count)))
+        self._count += 1
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval:
+            self.sync()
+
+    def record_move(self, point):
+        if point is None:
+            self._append(PASS, 0)
+        else:
+            self._append(MOVE, point[0] * self._size + point[1])
+
+    def record_undo(self):
+        self._append(UNDO, 0)
+
+    def record_resign(self):
+        self._append(RESIGN, 0)
+
+    def record_goto(self, move_number):
+        self._append(GOTO, move_number)
+
+    def sync(self):
+        """Forces the records written so far onto the disk."""
+        if self._fd is not None and self._unsynced:
+            _fsync(self._fd)
+            self.syncs += 1
+            self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        """Syncs and stops following the game; the file stays for load_journal()."""
+        if self._fd is None:
+            return
+        self.sync()
+        os.close(self._fd)
+        self._fd = None
+        if self.game is not None and self.game.journal is self:
+            self.game.journal = None
+        self.game = None
+
+def decode_journal(data):
+    """Replays journal bytes; returns (game, records replayed, bytes ignored at the end).
+
+    Replay stops at the first record that is cut short, fails its check or cannot
+    be applied, which after a crash is the half-written tail of the file.
+    """
+    if len(data) < _HEADER.size:
+        raise SaveFormatError("File is too short.")
+    magic, version, length = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SaveFormatError("Not a move journal.")
+    if version != VERSION:
+        raise SaveFormatError(f"Unsupported journal version {version}.")
+    pos = _HEADER.size + length
+    game = decode_game(data[_HEADER.size:pos])
+    size = game.board_size
+    count = 0
+    end = len(data) - (len(data) - pos) % _RECORD.size
+    for op, arg, check in _RECORD.iter_unpack(data[pos:end]):
+        if check != _check(op, arg, count):
+            break
+        try:
+            if op == MOVE:
+                if game.play(divmod(arg, size)) is None:
+                    break
+            elif op == PASS:
+                if game.play(None) is None:
+                    break
+            elif op == UNDO:
+                game.undo()
+            elif op == RESIGN:
+                game.resign()
+            elif op == GOTO:
+                game.goto(arg)
+            else:
+                break
+        except GameError:
+            break
+        count += 1
+    return game, count, len(data) - pos - count * _RECORD.size
+
+def load_journal(filename):
+    """Recovers the game a journal file describes; see decode_journal()."""
+    with open(filename, 'rb') as f:
+        return decode_journal(f.read())
+
+profiling.instrument(sys.modules[__name__], ('decode_journal',), 'journal')
@@ -0,0 +1,451 @@
+"""Asyncio game server: many GoGame / GomokuGame sessions in one process.
+
+The wire protocol is one JSON object per line in each direction. Requests carry
+"cmd" plus arguments and an optional "id" that is echoed in the reply:
+
+    {"id": 1, "cmd": "start", "game": "go", "size": 9, "komi": 6.5}
+    {"id": 1, "ok": true, "game_id": 1, "state": {...}}
+    {"id": 2, "cmd": "place", "game_id": 1, "row": 2, "col": 3}
+    {"id": 2, "ok": true, "diff": {...}}
+    {"id": 3, "cmd": "place", "game_id": 1, "row": 2, "col": 3}
+    {"id": 3, "ok": false, "error": "Position already occupied."}
+
+Commands mirror the CLI: start, place, pass, undo, resign, save (returns SGF
+text), plus state, subscribe, unsubscribe, close and list. Coordinates are
+0-based. Whoever starts or subscribes to a game is sent every change other
+clients make to it as {"event": "diff", "game_id": ..., "diff": {...}}; a diff
+lists the stones added and removed, so clients never need the whole board again.
+
+One coroutine per connection and plain writes without waiting keep idle
+connections cheap; a client that stops reading its events is disconnected
+once MAX_BUFFERED bytes are queued for it.
+"""
+import asyncio
+import json
+import math
+import random
+import time
+from game.go import GoGame
+from game.gomoku import GomokuGame
+from game.exceptions import GameError
+from utils.sgf import game_to_sgf
+
+MAX_BUFFERED = 1 << 20
+MAX_GAMES = 100_000
+
+class ProtocolError(Exception):
+    pass
+
+def _name(player):
+    return None if player is None else str(player).lower()
+
+def _status(game):
+    over = game.is_game_over()
+    return {
+        'moves': len(game.move_list()),
+        'to_move': _name(game.current_player),
+        'over': over,
+        'winner': _name(game.check_winner()) if over else None,
+    }
+
+class Session:
+    """One game and the connections watching it."""
+
+    def __init__(self, game_id, game):
+        self.game_id = game_id
+        self.game = game
+        self.subscribers = set()
+
+    def state(self):
+        game = self.game
+        board = game.board
+        n = game.board_size
+        stones = {'black': [], 'white': []}
+        for r in range(n):
+            for c in range(n):
+                p = board.get(r, c)
+                if p is not None:
+                    stones[_name(p)].append([r, c])
+        state = {'game': 'go' if isinstance(game, GoGame) else 'gomoku', 'size': n, 'stones': stones}
+        state.update(_status(game))
+        if isinstance(game, GoGame):
+            black, white = game.score()
+            state['score'] = {'black': black, 'white': white, 'komi': game.komi}
+        return state
+
+    def diff(self, record, undone=False):
+        """Stones added and removed by a move (or by taking it back)."""
+        added, removed = [], []
+        if record.point is not None:
+            stone = [record.point[0], record.point[1], _name(record.player)]
+            (removed if undone else added).append(stone)
+            color = _name(record.player.other())
+            for r, c in record.captured:
+                (added if undone else removed).append([r, c, color])
+        diff = {'move': None if record.point is None else list(record.point),
+                'player': _name(record.player), 'undo': undone,
+                'added': added, 'removed': removed}
+        diff.update(_status(self.game))
+        return diff
+
+class GameServer:
+    """Holds the sessions and serves the JSON-lines protocol on asyncio streams."""
+
+    def __init__(self, max_games=MAX_GAMES):
+        self.sessions = {}
+        self.max_games = max_games
+        self.connections = 0
+        self.requests = 0
+        self.moves = 0
+        self._next_id = 1
+        self._server = None
+        self._writers = set()
+        self._watching = {} # writer -> sessions it subscribes to
+        self._handlers = {
+            'start': self.cmd_start, 'place': self.cmd_place, 'pass': self.cmd_pass,
+            'undo': self.cmd_undo, 'resign': self.cmd_resign, 'save': self.cmd_save,
+            'state': self.cmd_state, 'subscribe': self.cmd_subscribe,
+            'unsubscribe': self.cmd_unsubscribe, 'close': self.cmd_close, 'list': self.cmd_list,
+        }
+
+    async def start(self, host='127.0.0.1', port=0, backlog=4096):
+        """Starts listening; returns the bound port (useful with port 0)."""
+        self._server = await asyncio.start_server(self.handle, host, port, backlog=backlog)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        """Stops listening and drops every connection."""
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        self._writers.add(writer)
+        watching = set()
+        self._watching[writer] = watching
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, asyncio.LimitOverrunError, ValueError, asyncio.CancelledError):
+                    # Cancelled when the event loop shuts down with the connection open
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                reply = self.dispatch(line, writer, watching)
+                self._send(writer, reply)
+                if writer.is_closing():
+                    break
+        finally:
+            self.connections -= 1
+            self._writers.discard(writer)
+            self._watching.pop(writer, None)
+            for session in watching:
+                session.subscribers.discard(writer)
+            writer.close()
+
+    def dispatch(self, line, writer=None, watching=None):
+        """Runs one request line and returns the reply dict."""
+        self.requests += 1
+        request_id = None
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                raise ProtocolError("Request is not valid JSON.")
+            if not isinstance(request, dict):
+                raise ProtocolError("Request must be a JSON object.")
+            request_id = request.get('id')
+            cmd = request.get('cmd')
+            handler = self._handlers.get(cmd) if isinstance(cmd, str) else None
+            if handler is None:
+                raise ProtocolError(f"Unknown command '{cmd}'.")
+            reply = handler(request, writer, watching if watching is not None else set())
+            reply['ok'] = True
+        except (ProtocolError, GameError) as e:
+            reply = {'ok': False, 'error': str(e)}
+        except Exception:
+            # A bad request must cost one error reply, not the client's connection
+            reply = {'ok': False, 'error': "Internal error."}
+        if request_id is not None:
+            reply['id'] = request_id
+        return reply
+
+    def _session(self, request):
+        game_id = request.get('game_id')
+        # bool is an int too, and True would find game 1
+        if not isinstance(game_id, int) or isinstance(game_id, bool):
+            raise ProtocolError("game_id must be an integer.")
+        session = self.sessions.get(game_id)
+        if session is None:
+            raise ProtocolError(f"No game {game_id}.")
+        return session
+
+    def _send(self, writer, message):
+        if writer is None or writer.is_closing():
+            return
+        writer.write(json.dumps(message, separators=(',', ':')).encode() + b'\n')
+        if writer.transport.get_write_buffer_size() > MAX_BUFFERED:
+            # A subscriber that stopped reading must not exhaust memory
+            writer.close()
+
+    def _broadcast(self, session, sender, message):
+        data = json.dumps(message, separators=(',', ':')).encode() + b'\n'
+        for writer in list(session.subscribers):
+            if writer is sender:
+                continue
+            if writer.is_closing():
+                session.subscribers.discard(writer)
+                continue
+            writer.write(data)
+            if writer.transport.get_write_buffer_size() > MAX_BUFFERED:
+                session.subscribers.discard(writer)
+                writer.close()
+
+    def _changed(self, session, sender, diff):
+        self._broadcast(session, sender, {'event': 'diff', 'game_id': session.game_id, 'diff': diff})
+        return {'game_id': session.game_id, 'diff': diff}
+
+    def cmd_start(self, request, writer, watching):
+        if len(self.sessions) >= self.max_games:
+            raise ProtocolError("Too many games.")
+        kind = request.get('game')
+        try:
+            size = int(request.get('size', 19 if kind == 'go' else 15))
+            if kind == 'go':
+                komi = float(request.get('komi', 0))
+                if not math.isfinite(komi):
+                    raise ProtocolError("komi must be a finite number.")
+                game = GoGame(size, request.get('ko_rule', 'simple'), komi=komi)
+            elif kind == 'gomoku':
+                game = GomokuGame(size, bitboard=True)
+            else:
+                raise ProtocolError("game must be 'go' or 'gomoku'.")
+        except (TypeError, ValueError, OverflowError) as e:
+            raise ProtocolError(str(e))
+        session = Session(self._next_id, game)
+        self._next_id += 1
+        self.sessions[session.game_id] = session
+        if writer is not None:
+            session.subscribers.add(writer)
+            watching.add(session)
+        return {'game_id': session.game_id, 'state': session.state()}
+
+    def cmd_place(self, request, writer, watching):
+        session = self._session(request)
+        try:
+            row, col = int(request['row']), int(request['col'])
+        except (KeyError, TypeError, ValueError, OverflowError):
+            raise ProtocolError("place needs integer row and col.")
+        session.game.place_stone(row, col)
+        self.moves += 1
+        return self._changed(session, writer, session.diff(session.game.last_move()))
+
+    def cmd_pass(self, request, writer, watching):
+        session = self._session(request)
+        game = session.game
+        if not isinstance(game, GoGame):
+            raise ProtocolError("Pass is only available in Go.")
+        if game.is_game_over():
+            raise ProtocolError("Game is already over.")
+        game.pass_turn()
+        self.moves += 1
+        return self._changed(session, writer, session.diff(game.last_move()))
+
+    def cmd_undo(self, request, writer, watching):
+        session = self._session(request)
+        record = session.game.last_move()
+        session.game.undo()
+        return self._changed(session, writer, session.diff(record, undone=True))
+
+    def cmd_resign(self, request, writer, watching):
+        session = self._session(request)
+        game = session.game
+        if game.is_game_over():
+            raise ProtocolError("Game is already over.")
+        game.resign()
+        diff = {'move': None, 'player': _name(game.current_player), 'undo': False,
+                'resign': True, 'added': [], 'removed': []}
+        diff.update(_status(game))
+        return self._changed(session, writer, diff)
+
+    def cmd_save(self, request, writer, watching):
+        session = self._session(request)
+        return {'game_id': session.game_id, 'sgf': game_to_sgf(session.game)}
+
+    def cmd_state(self, request, writer, watching):
+        session = self._session(request)
+        return {'game_id': session.game_id, 'state': session.state()}
+
+    def cmd_subscribe(self, request, writer, watching):
+        session = self._session(request)
+        if writer is not None:
+            session.subscribers.add(writer)
+            watching.add(session)
+        return {'game_id': session.game_id, 'state': session.state()}
+
+    def cmd_unsubscribe(self, request, writer, watching):
+        session = self._session(request)
+        session.subscribers.discard(writer)
+        watching.discard(session)
+        return {'game_id': session.game_id}
+
+    def cmd_close(self, request, writer, watching):
+        session = self._session(request)
+        subscribers = list(session.subscribers)
+        self._broadcast(session, writer, {'event': 'closed', 'game_id': session.game_id})
+        del self.sessions[session.game_id]
+        watching.discard(session)
+        # Other connections stop watching it too, so they do not hold the dead game
+        for other in subscribers:
+            self._watching.get(other, set()).discard(session)
+        session.subscribers.clear()
+        return {'game_id': session.game_id}
+
+    def cmd_list(self, request, writer, watching):
+        return {'games': [{'game_id': s.game_id, 'subscribers': len(s.subscribers), **_status(s.game)}
+                          for s in self.sessions.values()],
+                'connections': self.connections}
+
+class Client:
+    """Minimal protocol client: request() waits for the matching reply; events pile up."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.events = 0
+        self._next_id = 1
+
+    @classmethod
+    async def connect(cls, host, port):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, cmd, **args):
+        request_id = self._next_id
+        self._next_id += 1
+        args.update(cmd=cmd, id=request_id)
+        self.writer.write(json.dumps(args).encode() + b'\n')
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                raise ConnectionError("Server closed the connection.")
+            message = json.loads(line)
+            if message.get('id') == request_id:
+                return message
+            self.events += 1
+
+    async def drain_events(self):
+        """Counts events until the connection closes."""
+        while await self.reader.readline():
+            self.events += 1
+
+    def close(self):
+        self.writer.close()
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+async def run_load(host, port, players=8, watchers=2, idle=0, game='go', size=9,
+                   duration=5.0, seed=0):
+    """Load generator: players play random games, each watched by `watchers`
+    extra connections, while `idle` more connections just sit open.
+
+    Returns a summary with requests and moves per second and reply latencies.
+    """
+    rng = random.Random(seed)
+    idle_clients = [await Client.connect(host, port) for _ in range(idle)]
+    latencies = []
+    counts = {'requests': 0, 'moves': 0, 'rejected': 0, 'games': 0, 'events': 0}
+    deadline = time.perf_counter() + duration
+
+    async def timed(client, cmd, **args):
+        start = time.perf_counter()
+        reply = await client.request(cmd, **args)
+        latencies.append(time.perf_counter() - start)
+        counts['requests'] += 1
+        return reply
+
+    async def player(index):
+        me = await Client.connect(host, port)
+        spectators = []
+        watch_tasks = []
+        try:
+            while time.perf_counter() < deadline:
+                reply = await timed(me, 'start', game=game, size=size)
+                game_id = reply['game_id']
+                counts['games'] += 1
+                for t in watch_tasks:
+                    t.cancel()
+                for s in spectators:
+                    counts['events'] += s.events
+                    s.close()
+                spectators = [await Client.connect(host, port) for _ in range(watchers)]
+                for s in spectators:
+                    await s.request('subscribe', game_id=game_id)
+                watch_tasks = [asyncio.ensure_future(s.drain_events()) for s in spectators]
+                occupied = set()
+                free = [(r, c) for r in range(size) for c in range(size)]
+                over = False
+                while not over and time.perf_counter() < deadline:
+                    if len(occupied) >= size * size * 0.8:
+                        cmd, args = ('pass', {}) if game == 'go' else ('resign', {})
+                    else:
+                        while True:
+                            point = free[rng.randrange(len(free))]
+                            if point not in occupied:
+                                break
+                        cmd, args = 'place', {'row': point[0], 'col': point[1]}
+                    reply = await timed(me, cmd, game_id=game_id, **args)
+                    if not reply['ok']:
+                        counts['rejected'] += 1
+                        if cmd != 'place':
+                            break
+                        continue
+                    counts['moves'] += 1
+                    diff = reply['diff']
+                    for r, c, _ in diff['added']:
+                        occupied.add((r, c))
+                    for r, c, _ in diff['removed']:
+                        occupied.discard((r, c))
+                    over = diff['over']
+                await timed(me, 'close', game_id=game_id)
+        finally:
+            for t in watch_tasks:
+                t.cancel()
+            for s in spectators:
+                counts['events'] += s.events
+                s.close()
+            me.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(player(i) for i in range(players)))
+    elapsed = time.perf_counter() - start
+    for c in idle_clients:
+        c.close()
+    return {
+        'seconds': round(elapsed, 3),
+        'requests': counts['requests'],
+        'moves': counts['moves'],
+        'rejected': counts['rejected'],
+        'games': counts['games'],
+        'events': counts['events'],
+        'requests_per_second': round(counts['requests'] / elapsed, 1),
+        'moves_per_second': round(counts['moves'] / elapsed, 1),
+        'latency_ms_p50': round(_percentile(latencies, 0.5) * 1000, 3),
+        'latency_ms_p99': round(_percentile(latencies, 0.99) * 1000, 3),
+        'connections': players * (1 + watchers) + idle,
+    }
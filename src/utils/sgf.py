@@ -0,0 +1,210 @@
+"""SGF (Smart Game Format) reading and writing for GoGame and GomokuGame.
+
+read_games() streams a file of any size: it reads it in chunks and yields one
+game at a time as soon as its closing parenthesis arrives, so only the game being
+replayed is ever held in memory. Only the main line is replayed (the first
+variation at every branch), and every move goes through place_stone / pass_turn.
+"""
+import re
+from game.player import Player
+from game.exceptions import GameError
+
+GM_GO = 1
+GM_GOMOKU = 4
+_LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+_SPECIAL = re.compile(r'[()\[\]\\]')
+_TOKEN = re.compile(r'\s*(?:([();])|([A-Za-z]+)\s*((?:\[(?:\\.|[^\]\\])*\]\s*)+))', re.S)
+_VALUE = re.compile(r'\[((?:\\.|[^\]\\])*)\]', re.S)
+_ESCAPE = re.compile(r'\\(.)', re.S)
+
+class SGFError(ValueError):
+    """Raised for malformed SGF or records this project cannot replay."""
+
+def iter_game_texts(f, chunk_size=1 << 16):
+    """Yields the text of each top-level game tree '(...)' in the open text file f."""
+    buf = []
+    depth = 0
+    in_value = False
+    escape = False
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        start = 0 if depth else None
+        skip = -1
+        for m in _SPECIAL.finditer(chunk):
+            i = m.start()
+            if escape:
+                escape = False
+                if i == 0:
+                    continue
+            if i == skip:
+                continue
+            ch = chunk[i]
+            if in_value:
+                if ch == '\\':
+                    if i + 1 < len(chunk):
+                        skip = i + 1
+                    else:
+                        escape = True
+                elif ch == ']':
+                    in_value = False
+            elif ch == '[':
+                in_value = True
+            elif ch == '(':
+                if depth == 0:
+                    start = i
+                depth += 1
+            elif ch == ')' and depth:
+                depth -= 1
+                if depth == 0:
+                    buf.append(chunk[start:i + 1])
+                    yield ''.join(buf)
+                    buf = []
+                    start = None
+        if depth and start is not None:
+            buf.append(chunk[start:])
+    if depth:
+        raise SGFError("Unexpected end of file inside a game.")
+
+def parse_main_line(text):
+    """Parses one game tree into its main line: a list of nodes, each {prop: [values]}."""
+    nodes = []
+    pos = 0
+    end = len(text)
+    while pos < end:
+        m = _TOKEN.match(text, pos)
+        if not m:
+            if text[pos:].strip():
+                raise SGFError(f"Unexpected text at offset {pos}.")
+            break
+        pos = m.end()
+        punct, ident, values = m.groups()
+        if punct == ')':
+            # The first variation is the main line, so the first close ends it
+            break
+        if punct == ';':
+            nodes.append({})
+        elif ident:
+            if not nodes:
+                raise SGFError("Property outside of a node.")
+            # FF[3] allowed long names such as AddBlack; the capitals are the id
+            ident = ''.join(ch for ch in ident if ch.isupper())
+            nodes[-1].setdefault(ident, []).extend(
+                _ESCAPE.sub(_unescape, v) for v in _VALUE.findall(values))
+    return nodes
+
+def _unescape(m):
+    # A backslash-newline is a soft line break; otherwise keep the escaped character
+    return '' if m.group(1) == '\n' else m.group(1)
+
+def _point(value, size):
+    if value == '' or (value == 'tt' and size <= 19):
+        return None
+    if len(value) != 2:
+        raise SGFError(f"Bad point '{value}'.")
+    col, row = _LETTERS.find(value[0]), _LETTERS.find(value[1])
+    if not (0 <= row < size and 0 <= col < size):
+        raise SGFError(f"Point '{value}' is off the board.")
+    return row, col
+
+def game_from_nodes(nodes, ko_rule='simple'):
+    """Replays a parsed main line through the rules engine and returns the game."""
+    if not nodes:
+        raise SGFError("Empty game.")
+    root = nodes[0]
+    gm = int(root.get('GM', [GM_GO])[0])
+    size_text = root.get('SZ', ['19'])[0]
+    if ':' in size_text:
+        cols, rows = size_text.split(':')
+        if cols != rows:
+            raise SGFError("Rectangular boards are not supported.")
+        size_text = cols
+    size = int(size_text)
+    try:
+        if gm == GM_GO:
+            try:
+                komi = float(root.get('KM', ['0'])[0] or 0)
+            except ValueError:
+                raise SGFError(f"Bad komi '{root['KM'][0]}'.")
+            from game.go import GoGame
+            game = GoGame(size, ko_rule, komi=komi)
+        elif gm == GM_GOMOKU:
+            from game.gomoku import GomokuGame
+            game = GomokuGame(size)
+        else:
+            raise SGFError(f"Unsupported game type GM[{gm}].")
+    except GameError as e:
+        # An unsupported board size, say; the record is bad, not the program
+        raise SGFError(str(e)) from e
+
+    for node in nodes:
+        if 'AB' in node or 'AW' in node or 'AE' in node:
+            raise SGFError("Setup stones (AB/AW/AE) are not supported.")
+        for color, player in (('B', Player.BLACK), ('W', Player.WHITE)):
+            if color not in node:
+                continue
+            if game.current_player != player:
+                raise SGFError(f"Move {len(game.move_list()) + 1} is played out of turn.")
+            point = _point(node[color][0], size)
+            try:
+                if point is None:
+                    if gm != GM_GO:
+                        raise SGFError("Gomoku has no passes.")
+                    game.pass_turn()
+                else:
+                    game.place_stone(*point)
+            except GameError as e:
+                raise SGFError(f"Move {len(game.move_list()) + 1}: {e}") from e
+
+    result = root.get('RE', [''])[0].strip().upper()
+    if not game.is_game_over():
+        # Resignations and scored results that the moves alone do not show
+        if result[:2] in ('B+', 'W+'):
+            game.game_over = True
+            game.winner = Player.BLACK if result[0] == 'B' else Player.WHITE
+        elif result in ('0', 'DRAW'):
+            game.game_over = True
+            game.winner = None
+    return game
+
+def read_games(f, ko_rule='simple'):
+    """Yields every game in the open text file f, replayed one at a time."""
+    for text in iter_game_texts(f):
+        yield game_from_nodes(parse_main_line(text), ko_rule)
+
+def game_to_sgf(game):
+    """SGF record of the game's moves and result."""
+    size = game.board_size
+    gm = GM_GO if game.kind == 'go' else GM_GOMOKU
+    parts = [f"(;GM[{gm}]FF[4]CA[UTF-8]AP[oop-big-homework]SZ[{size}]"]
+    if gm == GM_GO and game.komi:
+        parts.append(f"KM[{game.komi:g}]")
+    if game.is_game_over():
+        winner = game.check_winner()
+        parts.append("RE[0]" if winner is None else f"RE[{'B' if winner == Player.BLACK else 'W'}+]")
+    parts.append("\n")
+    for i, move in enumerate(game.move_list()):
+        coord = '' if move is None else _LETTERS[move[1]] + _LETTERS[move[0]]
+        parts.append(f";{'B' if i % 2 == 0 else 'W'}[{coord}]")
+        if i % 16 == 15:
+            parts.append("\n")
+    parts.append(")\n")
+    return ''.join(parts)
+
+def write_games(f, games):
+    """Writes games to the open text file f as one SGF collection."""
+    for game in games:
+        f.write(game_to_sgf(game))
+
+def load_sgf(filename, index=0, ko_rule='simple'):
+    """Game number index of an SGF file; reads only as far as that game."""
+    with open(filename, encoding='utf-8', errors='replace') as f:
+        for i, text in enumerate(iter_game_texts(f)):
+            if i == index:
+                return game_from_nodes(parse_main_line(text), ko_rule)
+    raise SGFError(f"No game {index + 1} in {filename}.")
+
+def save_sgf(game, filename):
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(game_to_sgf(game))
@@ -1,10 +1,228 @@
-import pickle
 import os
+import sys
+import struct
+from game.board import Board, FlatBoard
+from game.player import Player
+from game.exceptions import GameError
+from game import profiling
+
+# Binary save format, all integers little-endian:
+#   header   magic, version, game type, size, flags, ko rule, side to move, game over, winner
+#   state    varints: pass count, black captures, white captures, komi (version 2+)
+#            as zigzag-encoded half points
+#   position 2 bits per point (0 empty, 1 black, 2 white), row-major, 4 points per byte
+#   moves    varint count, then one varint per move: 0 for a pass, row * size + col + 1
+#   last     varint count of stones the final move captured, then their row * size + col
+MAGIC = b'OOPG'
+VERSION = 2
+_HEADER = struct.Struct('<4s8B')
+_GO, _GOMOKU = 0, 1
+JOURNAL_MAGIC = b'OOPJ' # utils.journal files, which load_game also reads
+_FLAT_BOARD, _BITBOARD = 1, 2
+
+class SaveFormatError(ValueError):
+    """Raised for files that are not a save this version can read."""
+
+def _write_varint(out, n):
+    while n > 0x7F:
+        out.append(n & 0x7F | 0x80)
+        n >>= 7
+    out.append(n)
+
+def _read_varint(data, pos):
+    n = shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+def encode_game(game):
+    """Serializes a GoGame or GomokuGame to bytes."""
+    size = game.board_size
+    is_go = game.kind == 'go'
+    flags = _FLAT_BOARD if isinstance(game.board, FlatBoard) else 0
+    if not is_go and game.bitboard is not None:
+        flags |= _BITBOARD
+    ko = 0
+    if is_go:
+        from game.go import KO_RULES
+        ko = KO_RULES.index(game.ko_rule)
+    winner = game.winner.value if game.winner else 0
+    out = bytearray(_HEADER.pack(MAGIC, VERSION, _GO if is_go else _GOMOKU, size, flags,
+                                 ko, game.current_player.value, int(game.game_over), winner))
+    if is_go:
+        _write_varint(out, game.pass_count)
+        _write_varint(out, game.captured_stones[Player.BLACK])
+        _write_varint(out, game.captured_stones[Player.WHITE])
+        half = round(game.komi * 2)
+        _write_varint(out, half * 2 if half >= 0 else -half * 2 - 1)
+    else:
+        out += b'\0\0\0\0'
+
+    packed = bytearray((size * size + 3) // 4)
+    i = 0
+    for r in range(size):
+        for c in range(size):
+            p = game.board.get(r, c)
+            if p is not None:
+                packed[i >> 2] |= p.value << ((i & 3) * 2)
+            i += 1
+    out += packed
+
+    moves = game.move_list()
+    _write_varint(out, len(moves))
+    for m in moves:
+        _write_varint(out, 0 if m is None else m[0] * size + m[1] + 1)
+    last = game.last_move()
+    captured = last.captured if last else ()
+    _write_varint(out, len(captured))
+    for r, c in captured:
+        _write_varint(out, r * size + c)
+    return bytes(out)
+
+def decode_game(data):
+    """Rebuilds a game from encode_game output; history is replayed only when needed."""
+    if len(data) < _HEADER.size:
+        raise SaveFormatError("File is too short.")
+    magic, version, kind, size, flags, ko, to_move, over, winner = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SaveFormatError("Not a saved game.")
+    if not 1 <= version <= VERSION:
+        raise SaveFormatError(f"Unsupported save version {version}.")
+    pos = _HEADER.size
+    pass_count, pos = _read_varint(data, pos)
+    black, pos = _read_varint(data, pos)
+    white, pos = _read_varint(data, pos)
+    komi = 0.0
+    if version >= 2:
+        z, pos = _read_varint(data, pos)
+        komi = (z >> 1 if not z & 1 else -(z >> 1) - 1) / 2
+
+    board_cls = FlatBoard if flags & _FLAT_BOARD else Board
+    # Only the variant being loaded is imported
+    if kind == _GO:
+        from game.go import GoGame, KO_RULES
+        game = GoGame(size, KO_RULES[ko], board_cls, komi)
+    elif kind == _GOMOKU:
+        from game.gomoku import GomokuGame
+        game = GomokuGame(size, board_cls, bool(flags & _BITBOARD))
+    else:
+        raise SaveFormatError(f"Unknown game type {kind}.")
+
+    stones = []
+    n = size * size
+    players = (None, Player.BLACK, Player.WHITE)
+    for j, byte in enumerate(data[pos:pos + (n + 3) // 4]):
+        if byte:
+            for k in range(4):
+                v = byte >> (k * 2) & 3
+                if v:
+                    i = j * 4 + k
+                    stones.append((i // size, i % size, players[v]))
+    pos += (n + 3) // 4
+
+    count, pos = _read_varint(data, pos)
+    moves = [None] * count
+    for k in range(count):
+        # Inline varint read: this loop dominates loading long games
+        m = data[pos]
+        pos += 1
+        shift = 7
+        while m & (1 << shift):
+            m ^= 1 << shift
+            m |= data[pos] << shift
+            pos += 1
+            shift += 7
+        if m:
+            moves[k] = divmod(m - 1, size)
+    count, pos = _read_varint(data, pos)
+    captured = []
+    for _ in range(count):
+        m, pos = _read_varint(data, pos)
+        captured.append(divmod(m, size))
+
+    game.current_player = players[to_move]
+    game.restore(stones, moves, captured)
+    game.game_over = bool(over)
+    game.winner = players[winner]
+    if kind == _GO:
+        game.pass_count = pass_count
+        game.captured_stones = {Player.BLACK: black, Player.WHITE: white}
+    return game
+
+def _read_legacy(data):
+    """Converts a save from the pickle-based first version to a game of today.
+
+    Those files hold the old objects: the board as a grid of rows, and history as
+    the board before every move. Only the few classes they use may be loaded, as
+    stand-ins carrying just their attributes; each move is read off the difference
+    between consecutive boards and replayed into a new game.
+    """
+    import io
+    import pickle
+
+    class Legacy:
+        pass
+
+    class Unpickler(pickle.Unpickler):
+        def find_class(self, module, name):
+            if (module, name) == ('game.player', 'Player'):
+                return Player
+            if (module, name) in (('game.go', 'GoGame'), ('game.gomoku', 'GomokuGame'), ('game.board', 'Board')):
+                return type(name, (Legacy,), {})
+            if (module, name) in (('copyreg', '_reconstructor'), ('builtins', 'object')):
+                return getattr(__import__(module), name)
+            raise SaveFormatError("Not a saved game.")
+
+    try:
+        old = Unpickler(io.BytesIO(data)).load()
+        kind = type(old).__name__
+        size = old.board_size
+        grids = [entry[0].grid for entry in old.history] + [old.board.grid]
+        movers = [entry[1] for entry in old.history]
+    except (pickle.UnpicklingError, AttributeError, IndexError, TypeError, EOFError):
+        raise SaveFormatError("Not a saved game.")
+    if kind == 'GoGame':
+        from game.go import GoGame
+        game = GoGame(size)
+    elif kind == 'GomokuGame':
+        from game.gomoku import GomokuGame
+        game = GomokuGame(size)
+    else:
+        raise SaveFormatError("Not a saved game.")
+    for before, after, player in zip(grids, grids[1:], movers):
+        placed = [(r, c) for r in range(size) for c in range(size)
+                  if before[r][c] is None and after[r][c] == player]
+        try:
+            if len(placed) == 1:
+                game.place_stone(*placed[0])
+            elif not placed and kind == 'GoGame':
+                game.pass_turn()
+            else:
+                raise SaveFormatError("Old save has a move that cannot be read.")
+        except GameError as e:
+            raise SaveFormatError(f"Old save has an illegal move: {e}")
+    if old.game_over and not game.game_over:
+        # A resignation, which the old format kept only as the result
+        game.game_over = True
+        game.winner = old.winner
+    return game
+
+def _is_sgf(filename):
+    return filename.lower().endswith('.sgf')
 
 def save_game(game_instance, filename):
     try:
+        if _is_sgf(filename):
+            from utils.sgf import save_sgf
+            save_sgf(game_instance, filename)
+            return True, "Game saved successfully."
+        data = encode_game(game_instance)
         with open(filename, 'wb') as f:
-            pickle.dump(game_instance, f)
+            f.write(data)
         return True, "Game saved successfully."
     except Exception as e:
         return False, f"Failed to save game: {str(e)}"
@@ -13,8 +231,25 @@ def load_game(filename):
     if not os.path.exists(filename):
         return None, "File not found."
     try:
+        if _is_sgf(filename):
+            from utils.sgf import load_sgf
+            return load_sgf(filename), "Game loaded successfully."
         with open(filename, 'rb') as f:
-            game = pickle.load(f)
+            data = f.read()
+        if data[:len(MAGIC)] == MAGIC:
+            game = decode_game(data)
+        elif data[:len(JOURNAL_MAGIC)] == JOURNAL_MAGIC:
+            from utils.journal import decode_journal
+            game, count, torn = decode_journal(data)
+            msg = f"Game recovered from journal ({count} records)."
+            if torn:
+                msg += f" Ignored {torn} bytes of unfinished records at the end."
+            return game, msg
+        else:
+            # Saves from before the binary format were pickled game objects
+            game = _read_legacy(data)
         return game, "Game loaded successfully."
     except Exception as e:
         return None, f"Failed to load game: {str(e)}"
+
+profiling.instrument(sys.modules[__name__], ('encode_game', 'decode_game', 'save_game', 'load_game'), 'storage')
@@ -0,0 +1,225 @@
+import math
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from game.go import GoGame
+from game.gomoku import GomokuGame
+from game.player import Player
+
+# Outcome of one game. score is from player A's point of view: 1 win, 0.5 draw, 0 loss.
+GameResult = namedtuple('GameResult', ['index', 'a_color', 'winner', 'moves', 'score', 'seconds'])
+
+# Engines that only know one game
+ENGINE_GAMES = {'alphabeta': 'gomoku', 'mcts': 'go'}
+
+def check_player(spec, game_type):
+    """Raises ValueError if the engine spec cannot play game_type."""
+    kind = spec.partition(':')[0].lower()
+    needs = ENGINE_GAMES.get(kind)
+    if needs is not None and needs != game_type:
+        raise ValueError(f"Player '{spec}' only plays {needs}, not {game_type}.")
+
+def make_engine(spec, seed=None, game_type=None):
+    """Builds an engine from a spec string.
+
+    random | alphabeta[:seconds|:<depth>d] | mcts[:seconds|:<playouts>p] | script:<file>
+
+    Time limits make results depend on machine speed and load; a fixed depth or
+    playout count plays the same moves for the same seed everywhere. With
+    game_type given, an engine for the other game raises ValueError.
+    """
+    if game_type is not None:
+        check_player(spec, game_type)
+    kind, _, arg = spec.partition(':')
+    kind = kind.lower()
+    budget = arg.lower() # the script path keeps its case
+    if kind == 'random':
+        from ai.random_engine import RandomEngine
+        return RandomEngine(seed)
+    if kind == 'alphabeta':
+        from ai.gomoku_ai import GomokuAI
+        if budget.endswith('d'):
+            return GomokuAI(time_limit=math.inf, max_depth=int(budget[:-1]))
+        return GomokuAI(time_limit=float(arg) if arg else 0.1)
+    if kind == 'mcts':
+        from ai.go_mcts import GoMCTS
+        # One process per game already keeps the cores busy
+        if budget.endswith('p'):
+            return GoMCTS(workers=1, seed=seed, playouts=int(budget[:-1]))
+        return GoMCTS(time_limit=float(arg) if arg else 0.1, workers=1, seed=seed)
+    if kind == 'script':
+        from ai.random_engine import ScriptedEngine
+        return ScriptedEngine.from_file(arg, seed)
+    raise ValueError(f"Unknown player '{spec}'.")
+
+def is_timed(spec):
+    """Whether the engine spec stops searching on the clock, so its games vary from
+    run to run even with the same seed."""
+    kind, _, arg = spec.partition(':')
+    kind = kind.lower()
+    if kind == 'alphabeta':
+        return not arg.lower().endswith('d')
+    if kind == 'mcts':
+        return not arg.lower().endswith('p')
+    return False
+
+def game_seed(seed, index):
+    """Per-game seed; the same (seed, index) always plays the same game."""
+    return (seed * 1_000_003 + index) & 0xFFFFFFFF
+
+def play_game(game_type, size, spec_a, spec_b, index, seed=0, max_moves=None):
+    """Plays game number index; A takes Black in even games and White in odd ones."""
+    start = time.perf_counter()
+    s = game_seed(seed, index)
+    engines = {}
+    a_color = Player.BLACK if index % 2 == 0 else Player.WHITE
+    engines[a_color] = make_engine(spec_a, s, game_type)
+    engines[a_color.other()] = make_engine(spec_b, s + 1, game_type)
+    game = GoGame(size) if game_type == 'go' else GomokuGame(size)
+    if max_moves is None:
+        max_moves = 3 * size * size
+    moves = 0
+    while not game.is_game_over() and moves < max_moves:
+        move = engines[game.current_player].select_move(game)
+        if move is None:
+            game.pass_turn()
+        else:
+            game.place_stone(*move)
+        moves += 1
+    for engine in engines.values():
+        engine.close()
+    winner = game.check_winner()
+    if not game.is_game_over() and isinstance(game, GoGame):
+        # Move cap reached: score the position as it stands
+        winner = game.calculate_winner()
+    score = 0.5 if winner is None else 1.0 if winner == a_color else 0.0
+    return GameResult(index, a_color, winner, moves, score, time.perf_counter() - start)
+
+def elo_from_score(p):
+    p = min(max(p, 1e-6), 1 - 1e-6)
+    return -400.0 * math.log10(1.0 / p - 1.0)
+
+def elo_estimate(scores):
+    """Elo difference of A over B with a 95% interval: (elo, low, high)."""
+    n = len(scores)
+    if n == 0:
+        return 0.0, -math.inf, math.inf
+    mean = sum(scores) / n
+    var = sum((x - mean) ** 2 for x in scores) / n
+    margin = 1.96 * math.sqrt(var / n)
+    return elo_from_score(mean), elo_from_score(mean - margin), elo_from_score(mean + margin)
+
+class SPRT:
+    """Sequential probability ratio test of H0: elo = elo0 against H1: elo = elo1.
+
+    Uses the normal approximation of the generalized SPRT on per-game scores, so
+    draws count naturally. Stops with 'H0' or 'H1' once the log-likelihood ratio
+    leaves (log(beta / (1 - alpha)), log((1 - beta) / alpha)).
+    """
+
+    def __init__(self, elo0=0.0, elo1=20.0, alpha=0.05, beta=0.05):
+        self.s0 = 1.0 / (1.0 + 10 ** (-elo0 / 400.0))
+        self.s1 = 1.0 / (1.0 + 10 ** (-elo1 / 400.0))
+        self.lower = math.log(beta / (1 - alpha))
+        self.upper = math.log((1 - beta) / alpha)
+        self.n = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def add(self, score):
+        self.n += 1
+        self.total += score
+        self.total_sq += score * score
+
+    def llr(self):
+        if self.n < 2:
+            return 0.0
+        mean = self.total / self.n
+        var = self.total_sq / self.n - mean * mean
+        if var <= 0:
+            # All results identical so far: assume the largest possible variance
+            var = 0.25
+        return self.n * (self.s1 - self.s0) * (2 * mean - self.s0 - self.s1) / (2 * var)
+
+    def decision(self):
+        """'H1', 'H0' or None while undecided."""
+        llr = self.llr()
+        if llr >= self.upper:
+            return 'H1'
+        if llr <= self.lower:
+            return 'H0'
+        return None
+
+def run_tournament(game_type, size, spec_a, spec_b, games, workers=1, seed=0, sprt=None,
+                   max_moves=None, on_result=None):
+    """Plays up to `games` games of A against B and returns a summary dict.
+
+    Games run on a ProcessPoolExecutor with `workers` processes (in-process when
+    workers <= 1). Results are consumed in game order, so the SPRT stopping point
+    and the summary depend only on the seed, not on which worker finishes first;
+    that holds as long as neither spec is_timed().
+    on_result(result, summary) is called for every game as it is consumed.
+    A player that cannot play game_type raises ValueError before any game starts.
+    """
+    check_player(spec_a, game_type)
+    check_player(spec_b, game_type)
+    start = time.perf_counter()
+    scores = []
+    results = []
+    decision = None
+
+    def consume(result):
+        nonlocal decision
+        results.append(result)
+        scores.append(result.score)
+        if sprt is not None:
+            sprt.add(result.score)
+            decision = sprt.decision()
+        if on_result:
+            on_result(result, _summary(results, scores, sprt, decision, start))
+
+    if workers <= 1:
+        for i in range(games):
+            consume(play_game(game_type, size, spec_a, spec_b, i, seed, max_moves))
+            if decision:
+                break
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            pending = {}
+            done = {}
+            next_submit = 0
+            next_consume = 0
+            # Keep a bounded number of games in flight so an early stop wastes little
+            while next_consume < games and not decision:
+                while next_submit < games and len(pending) < 2 * workers:
+                    f = pool.submit(play_game, game_type, size, spec_a, spec_b, next_submit, seed, max_moves)
+                    pending[f] = next_submit
+                    next_submit += 1
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for f in finished:
+                    done[pending.pop(f)] = f.result()
+                while next_consume in done and not decision:
+                    consume(done.pop(next_consume))
+                    next_consume += 1
+            # Drop queued games; the few already running finish on their own
+            pool.shutdown(cancel_futures=True)
+    return _summary(results, scores, sprt, decision, start)
+
+def _summary(results, scores, sprt, decision, start):
+    elapsed = time.perf_counter() - start
+    elo, low, high = elo_estimate(scores)
+    return {
+        'games': len(results),
+        'wins': sum(1 for s in scores if s == 1.0),
+        'draws': sum(1 for s in scores if s == 0.5),
+        'losses': sum(1 for s in scores if s == 0.0),
+        'score': sum(scores) / len(scores) if scores else 0.0,
+        'elo': elo,
+        'elo_low': low,
+        'elo_high': high,
+        'llr': sprt.llr() if sprt else None,
+        'sprt': decision,
+        'seconds': elapsed,
+        'games_per_second': len(results) / elapsed if elapsed > 0 else 0.0,
+    }
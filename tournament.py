@@ -0,0 +1,65 @@
+import sys
+import os
+import argparse
+import json
+
+# Add src to path
+src_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+sys.path.append(src_path)
+
+from utils.tournament import run_tournament, check_player, is_timed, SPRT
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play two players against each other, headless.")
+    parser.add_argument('-a', '--player-a', default='random',
+                        help="random | alphabeta[:sec|:<depth>d] | mcts[:sec|:<playouts>p] | script:<file> "
+                             "(default: random)")
+    parser.add_argument('-b', '--player-b', default='random', help="same choices as --player-a")
+    parser.add_argument('--game', choices=['go', 'gomoku'], default='gomoku')
+    parser.add_argument('--size', type=int, default=15)
+    parser.add_argument('-n', '--games', type=int, default=100)
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--seed', type=int, default=None,
+                        help="replay the same games; needs fixed-budget players, not time limits")
+    parser.add_argument('--max-moves', type=int, default=None)
+    parser.add_argument('--sprt', nargs=2, type=float, metavar=('ELO0', 'ELO1'),
+                        help="stop early once an SPRT of elo0 against elo1 decides")
+    parser.add_argument('--alpha', type=float, default=0.05)
+    parser.add_argument('--beta', type=float, default=0.05)
+    parser.add_argument('--json', action='store_true', help="print the final summary as JSON")
+    args = parser.parse_args(argv)
+    for spec in (args.player_a, args.player_b):
+        try:
+            check_player(spec, args.game)
+        except ValueError as e:
+            parser.error(str(e))
+    timed = [spec for spec in (args.player_a, args.player_b) if is_timed(spec)]
+    if args.seed is not None and timed:
+        parser.error(f"--seed cannot make '{timed[0]}' reproducible: it searches on a time limit. "
+                     "Use alphabeta:<depth>d or mcts:<playouts>p instead.")
+    seed = args.seed if args.seed is not None else 0
+
+    sprt = SPRT(args.sprt[0], args.sprt[1], args.alpha, args.beta) if args.sprt else None
+
+    def on_result(result, summary):
+        winner = result.winner if result.winner else "Draw"
+        line = (f"game {result.index + 1:>4}: A as {result.a_color}, winner {winner}, {result.moves} moves | "
+                f"+{summary['wins']} ={summary['draws']} -{summary['losses']} "
+                f"Elo {summary['elo']:+.1f} [{summary['elo_low']:+.1f}, {summary['elo_high']:+.1f}]")
+        if summary['llr'] is not None:
+            line += f" LLR {summary['llr']:+.2f}"
+        print(line, flush=True)
+
+    summary = run_tournament(args.game, args.size, args.player_a, args.player_b, args.games,
+                             workers=args.workers, seed=seed, sprt=sprt,
+                             max_moves=args.max_moves, on_result=None if args.json else on_result)
+    if args.json:
+        print(json.dumps(summary))
+    else:
+        if summary['sprt']:
+            print(f"SPRT accepted {summary['sprt']} after {summary['games']} games.")
+        print(f"{summary['games']} games in {summary['seconds']:.1f}s ({summary['games_per_second']:.2f} games/s). "
+              f"Elo A-B: {summary['elo']:+.1f} [{summary['elo_low']:+.1f}, {summary['elo_high']:+.1f}]")
+
+if __name__ == "__main__":
+    main()